@@ -0,0 +1,60 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions from the session table in small batches, "
+        "so no single DELETE holds locks on a large part of the table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer")
+
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, "get_model_class"):
+            # Cookie and cache sessions expire on their own
+            self.stdout.write(
+                f"{settings.SESSION_ENGINE} keeps no session table; nothing to purge"
+            )
+            return
+
+        sessions = store.get_model_class().objects
+        # Sessions expiring while the purge runs are left for the next one
+        now = timezone.now()
+        deleted = batches = 0
+        while True:
+            keys = list(
+                sessions.filter(expire_date__lt=now).values_list(
+                    "session_key", flat=True
+                )[:batch_size]
+            )
+            if not keys:
+                break
+            deleted += sessions.filter(session_key__in=keys).delete()[0]
+            batches += 1
+            if len(keys) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} expired sessions in {batches} batches"
+            )
+        )
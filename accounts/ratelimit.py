@@ -0,0 +1,116 @@
+"""
+Token-bucket rate limiting of sign-in attempts.
+
+Each client IP and each username gets a bucket of ``capacity`` attempts that
+refills at one attempt every ``refill_seconds``. signin_view takes a token
+from both buckets before authenticate() runs the password hasher, so a burst
+of guesses is turned away without costing a worker any hashing time.
+
+Bucket state lives in the ``settings.LOGIN_RATE_LIMIT_CACHE_ALIAS`` cache.
+Updates are serialized within a process only; with a cache shared between
+workers, two workers racing on the same bucket can each let one extra
+attempt through, which is harmless for a limit of this kind.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+DEFAULT_LIMITS = {
+    "ip": {"capacity": 10, "refill_seconds": 6},
+    "username": {"capacity": 5, "refill_seconds": 30},
+}
+
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_rejections = {scope: 0 for scope in DEFAULT_LIMITS}
+
+
+def get_cache():
+    return caches[getattr(settings, "LOGIN_RATE_LIMIT_CACHE_ALIAS", "default")]
+
+
+def get_limits():
+    return getattr(settings, "LOGIN_RATE_LIMITS", DEFAULT_LIMITS)
+
+
+def bucket_key(scope, identifier):
+    digest = hashlib.md5(identifier.encode(), usedforsecurity=False).hexdigest()
+    return f"accounts:signin:{scope}:{digest}"
+
+
+def take_token(scope, identifier, now=None):
+    """
+    Take one token from the ``scope`` bucket of ``identifier``.
+
+    Returns 0 when the attempt is allowed, otherwise the number of seconds
+    until the bucket holds a token again.
+    """
+    limit = get_limits()[scope]
+    capacity, refill_seconds = limit["capacity"], limit["refill_seconds"]
+    now = time.time() if now is None else now
+    cache = get_cache()
+    key = bucket_key(scope, identifier)
+    with _lock:
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) / refill_seconds)
+        if tokens < 1:
+            return (1 - tokens) * refill_seconds
+        # A bucket left alone this long is full again, like a missing one
+        cache.set(key, (tokens - 1, now), math.ceil(capacity * refill_seconds))
+    return 0
+
+
+def client_ip(request):
+    """
+    Address of the client, taken from X-Forwarded-For when the app runs
+    behind ``settings.LOGIN_RATE_LIMIT_PROXY_COUNT`` trusted proxies.
+
+    Behind proxies, a request whose header lacks the client's entry returns
+    None: REMOTE_ADDR would be the proxy, whose bucket every client shares.
+    """
+    proxies = getattr(settings, "LOGIN_RATE_LIMIT_PROXY_COUNT", 0)
+    if not proxies:
+        return request.META.get("REMOTE_ADDR", "")
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    addresses = [address.strip() for address in forwarded.split(",")]
+    if len(addresses) >= proxies and addresses[-proxies]:
+        return addresses[-proxies]
+    return None
+
+
+def check_signin_rate(request, username):
+    """
+    Take a sign-in attempt from the IP and username buckets.
+
+    Returns 0 if the attempt may go ahead, otherwise the whole number of
+    seconds the client should wait, for the Retry-After header.
+    """
+    address = client_ip(request)
+    # Without a client address only the username bucket applies
+    checks = [("ip", address)] if address is not None else []
+    if isinstance(username, str) and username.strip():
+        checks.append(("username", username.strip().lower()))
+    for scope, identifier in checks:
+        wait = take_token(scope, identifier)
+        if wait:
+            with _stats_lock:
+                _rejections[scope] = _rejections.get(scope, 0) + 1
+            return max(1, math.ceil(wait))
+    return 0
+
+
+def rate_limit_stats():
+    """Rejected sign-in attempts of this worker process, per bucket scope"""
+    with _stats_lock:
+        return dict(_rejections)
+
+
+def reset_rate_limit_stats():
+    with _stats_lock:
+        for scope in _rejections:
+            _rejections[scope] = 0
@@ -0,0 +1,47 @@
+from functools import partial
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import PlacementStaff, StaffRank
+from .staff import invalidate_staff_context
+
+
+def invalidate_on_commit(user_ids):
+    if user_ids:
+        transaction.on_commit(partial(invalidate_staff_context, *user_ids))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Signing in saves last_login, which the staff context does not hold
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    invalidate_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=PlacementStaff)
+@receiver(post_delete, sender=PlacementStaff)
+def staff_changed(sender, instance, **kwargs):
+    invalidate_on_commit([instance.user_id])
+
+
+@receiver(post_save, sender=StaffRank)
+@receiver(pre_delete, sender=StaffRank)
+def rank_changed(sender, instance, **kwargs):
+    """
+    Runs before a deletion as well, while the staff holding the rank can
+    still be found; deleting the rank sets their rank to null.
+    """
+    if kwargs.get("created"):
+        return
+    invalidate_on_commit(
+        list(
+            PlacementStaff.objects.filter(rank=instance).values_list(
+                "user_id", flat=True
+            )
+        )
+    )
@@ -0,0 +1,83 @@
+"""
+Cached staff context of authenticated users.
+
+The rank and department of the signed-in user are needed on every staff
+request. They are loaded with a single select_related query, kept on the
+user object for the rest of the request and in the
+``settings.STAFF_CONTEXT_CACHE_ALIAS`` cache across requests. The receivers
+in accounts.signals delete a user's entry once a change to their User,
+PlacementStaff or StaffRank row commits.
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import PlacementStaff
+
+StaffContext = namedtuple(
+    "StaffContext", ["user_id", "rank_name", "rank_level", "department", "is_active"]
+)
+
+# Cached for users without a PlacementStaff row, so they are not looked up
+# again on every request either
+NOT_STAFF = False
+
+
+def get_cache():
+    return caches[getattr(settings, "STAFF_CONTEXT_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    return getattr(settings, "STAFF_CONTEXT_TIMEOUT", 60)
+
+
+def cache_key(user_id):
+    return f"accounts:staff:{user_id}"
+
+
+def load_staff_context(user_id):
+    """Read the staff context of ``user_id`` from the database"""
+    staff = (
+        PlacementStaff.objects.select_related("rank").filter(user_id=user_id).first()
+    )
+    if staff is None:
+        return None
+    return StaffContext(
+        user_id=user_id,
+        rank_name=staff.rank.name if staff.rank else None,
+        rank_level=staff.rank.level if staff.rank else None,
+        department=staff.department,
+        is_active=staff.is_active,
+    )
+
+
+def get_staff_context(user):
+    """StaffContext of ``user``, or None if they are not placement staff"""
+    if not user.is_authenticated:
+        return None
+    try:
+        return user._staff_context
+    except AttributeError:
+        pass
+
+    cache = get_cache()
+    key = cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is None:
+        context = load_staff_context(user.pk)
+        cache.set(key, NOT_STAFF if context is None else tuple(context), get_timeout())
+    else:
+        context = StaffContext(*cached) if cached is not NOT_STAFF else None
+    user._staff_context = context
+    return context
+
+
+def invalidate_staff_context(*user_ids):
+    get_cache().delete_many([cache_key(user_id) for user_id in user_ids])
+
+
+def is_staff(user):
+    """Check if the user is authenticated and associated with a PlacementStaff profile"""
+    return get_staff_context(user) is not None
@@ -1,3 +1,300 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import stat
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import PlacementStaff, StaffRank
+from .ratelimit import rate_limit_stats, reset_rate_limit_stats, take_token
+
+SESSION_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-sessions",
+    },
+}
+
+
+class StaffTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            "staff@example.com", "staff@example.com", "secret-password"
+        )
+        rank = StaffRank.objects.create(name="Coordinator", level=1)
+        PlacementStaff.objects.create(
+            user=cls.user, rank=rank, department="CSE", contact_number="123"
+        )
+
+    def setUp(self):
+        # Rate limiter buckets and staff contexts live in the default cache
+        caches["default"].clear()
+
+    def sign_in(self, password="secret-password", **extra):
+        return self.client.post(
+            "/api/signin/",
+            json.dumps({"email": "staff@example.com", "password": password}),
+            content_type="application/json",
+            **extra,
+        )
+
+
+class StaffContextCacheTests(StaffTestCase):
+    def auth_status(self):
+        """Status code, staff rank and the staff queries of an auth-status call"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/auth-status/")
+        staff_queries = [
+            query
+            for query in ctx.captured_queries
+            if PlacementStaff._meta.db_table in query["sql"]
+        ]
+        rank = None
+        if response.status_code == 200:
+            rank = response.json()["user"]["staff_rank"]
+        return response.status_code, rank, len(staff_queries)
+
+    def test_context_is_cached_across_requests(self):
+        self.client.force_login(self.user)
+        rank = {"name": "Coordinator", "level": 1}
+        self.assertEqual(self.auth_status(), (200, rank, 1))
+        self.assertEqual(self.auth_status(), (200, rank, 0))
+
+    def test_created_staff_row_invalidates(self):
+        user = User.objects.create_user("new@example.com", password="secret")
+        self.client.force_login(user)
+        # Not staff, which is cached too
+        self.assertEqual(self.auth_status(), (302, None, 1))
+        self.assertEqual(self.auth_status(), (302, None, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PlacementStaff.objects.create(
+                user=user, department="ECE", contact_number="456"
+            )
+        rank = {"name": None, "level": None}
+        self.assertEqual(self.auth_status(), (200, rank, 1))
+
+    def test_deleted_staff_row_invalidates(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.auth_status()[0], 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            PlacementStaff.objects.filter(user=self.user).delete()
+        self.assertEqual(self.auth_status(), (302, None, 1))
+
+    def test_rank_change_invalidates(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.auth_status()[0], 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            staff_rank = StaffRank.objects.get(name="Coordinator")
+            staff_rank.level = 2
+            staff_rank.save()
+        rank = {"name": "Coordinator", "level": 2}
+        self.assertEqual(self.auth_status(), (200, rank, 1))
+
+    def test_rolled_back_change_keeps_the_entry(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.auth_status()[0], 200)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                PlacementStaff.objects.filter(user=self.user).delete()
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.auth_status()[2], 0)
+
+
+@override_settings(CACHES=SESSION_CACHES)
+class SessionModeTests(StaffTestCase):
+    def assertSignInAndOut(self):
+        self.assertEqual(self.sign_in().status_code, 200)
+        self.assertEqual(self.client.get("/api/auth-status/").status_code, 200)
+        self.assertEqual(self.client.post("/api/signout/").status_code, 200)
+        # login_required redirects requests without a session
+        self.assertEqual(self.client.get("/api/auth-status/").status_code, 302)
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+    def test_db_sessions(self):
+        self.assertSignInAndOut()
+        self.assertFalse(Session.objects.exists())
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_cached_db_sessions(self):
+        self.sign_in()
+        session_key = self.client.session.session_key
+        self.assertTrue(Session.objects.filter(session_key=session_key).exists())
+        # Served from the cache once the row is gone
+        Session.objects.all().delete()
+        self.assertEqual(self.client.get("/api/auth-status/").status_code, 200)
+        self.assertEqual(self.client.post("/api/signout/").status_code, 200)
+        self.assertEqual(self.client.get("/api/auth-status/").status_code, 302)
+
+    @override_settings(
+        SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies"
+    )
+    def test_signed_cookie_sessions(self):
+        self.assertSignInAndOut()
+        self.assertFalse(Session.objects.exists())
+
+    def test_purge_sessions_deletes_expired_rows(self):
+        now = timezone.now()
+        for i in range(5):
+            Session.objects.create(
+                session_key=f"expired{i}",
+                session_data="",
+                expire_date=now - timedelta(days=1),
+            )
+        Session.objects.create(
+            session_key="current", session_data="", expire_date=now + timedelta(days=1)
+        )
+        out = io.StringIO()
+        call_command("purge_sessions", "--batch-size", "2", stdout=out)
+        self.assertIn("Deleted 5 expired sessions in 3 batches", out.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)), ["current"]
+        )
+
+
+@override_settings(
+    LOGIN_RATE_LIMITS={
+        "ip": {"capacity": 3, "refill_seconds": 60},
+        "username": {"capacity": 2, "refill_seconds": 60},
+    }
+)
+class SigninRateLimitTests(StaffTestCase):
+    def setUp(self):
+        super().setUp()
+        reset_rate_limit_stats()
+
+    def assertRateLimited(self, response):
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        self.assertLessEqual(int(response["Retry-After"]), 60)
+
+    def test_username_bucket(self):
+        for _ in range(2):
+            self.assertEqual(self.sign_in("wrong").status_code, 401)
+        # Rejected before the password is checked, so the right one fails too
+        self.assertRateLimited(self.sign_in(REMOTE_ADDR="10.0.0.2"))
+        self.assertEqual(rate_limit_stats()["username"], 1)
+
+    def attempt(self, username, **extra):
+        return self.client.post(
+            "/api/signin/",
+            json.dumps({"email": username, "password": "wrong"}),
+            content_type="application/json",
+            **extra,
+        )
+
+    @override_settings(LOGIN_RATE_LIMIT_PROXY_COUNT=0)
+    def test_ip_bucket(self):
+        for username in ("a@example.com", "b@example.com", "c@example.com"):
+            self.assertEqual(self.attempt(username).status_code, 401)
+        self.assertRateLimited(self.sign_in())
+        self.assertEqual(rate_limit_stats()["ip"], 1)
+        # Another client is not affected
+        self.assertEqual(self.sign_in(REMOTE_ADDR="10.0.0.2").status_code, 200)
+
+    def test_client_ip_from_forwarded_for(self):
+        # The deployed default: one proxy, which appends the client address
+        self.assertEqual(settings.LOGIN_RATE_LIMIT_PROXY_COUNT, 1)
+        for username, spoofed in (
+            ("a@example.com", "1.1.1.1"),
+            ("b@example.com", "2.2.2.2"),
+            ("c@example.com", "3.3.3.3"),
+        ):
+            self.attempt(username, HTTP_X_FORWARDED_FOR=f"{spoofed}, 10.0.0.3")
+        self.assertRateLimited(self.sign_in(HTTP_X_FORWARDED_FOR="10.0.0.3"))
+        self.assertEqual(rate_limit_stats()["ip"], 1)
+        # Same proxy address, different client
+        self.assertEqual(
+            self.sign_in(HTTP_X_FORWARDED_FOR="10.0.0.4").status_code, 200
+        )
+
+    @override_settings(LOGIN_RATE_LIMIT_PROXY_COUNT=2)
+    def test_unresolved_client_does_not_take_the_proxy_bucket(self):
+        # One entry behind two proxies: the client's address is missing
+        for username in ("a@example.com", "b@example.com", "c@example.com"):
+            self.assertEqual(
+                self.attempt(username, HTTP_X_FORWARDED_FOR="10.0.0.5").status_code,
+                401,
+            )
+        self.assertEqual(self.sign_in().status_code, 200)
+        self.assertEqual(rate_limit_stats()["ip"], 0)
+        # The username bucket still applies
+        self.attempt("a@example.com")
+        self.assertRateLimited(self.attempt("a@example.com"))
+
+    def test_bucket_refills(self):
+        self.assertEqual(take_token("username", "x", now=0), 0)
+        self.assertEqual(take_token("username", "x", now=0), 0)
+        self.assertEqual(take_token("username", "x", now=30), 30)
+        self.assertEqual(take_token("username", "x", now=60), 0)
+
+
+class ProfilingTests(StaffTestCase):
+    def setUp(self):
+        super().setUp()
+        parent = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, parent)
+        self.directory = os.path.join(parent, "profiles")
+        settings = override_settings(PROFILING_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    @override_settings(PROFILING_SLOW_REQUEST_MS=1)
+    def test_sign_in_is_never_captured(self):
+        response = self.sign_in()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertFalse(os.path.exists(self.directory))
+
+    @override_settings(PROFILING_SLOW_REQUEST_MS=1)
+    def test_capture_is_private_and_redacted(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            "/api/drives/",
+            json.dumps(
+                {
+                    "company_name": "Acme",
+                    "point_of_contact": "Contact",
+                    "year_of_passing": 2024,
+                    "job_received_date": "2024-01-01",
+                    "job_posted_date": "2024-01-02",
+                    "job_posted_by": "Placement Cell",
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        path = os.path.join(self.directory, f"{response['X-Profile-Id']}.json")
+        self.assertEqual(stat.S_IMODE(os.stat(self.directory).st_mode), 0o700)
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+        with open(path) as f:
+            statements = {
+                statement["sql"]: statement["params"]
+                for statement in json.load(f)["statements"]
+            }
+        # The session and user lookups of request.user, and the INSERT
+        redacted = [
+            sql
+            for sql in statements
+            if "django_session" in sql
+            or "auth_user" in sql
+            or sql.startswith("INSERT")
+        ]
+        self.assertGreaterEqual(len(redacted), 3)
+        for sql in redacted:
+            self.assertIsNone(statements[sql], sql)
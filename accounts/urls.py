@@ -3,6 +3,11 @@ from . import views
 
 urlpatterns = [
     path("signin/", views.signin_view, name="signin"),
+    path(
+        "signin/rate-limit-stats/",
+        views.signin_rate_limit_stats,
+        name="signin_rate_limit_stats",
+    ),
     path("signout/", views.signout_view, name="signout"),
     path("auth-status/", views.check_auth_status, name="auth_status"),
 ]
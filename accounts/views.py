@@ -4,57 +4,59 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required, user_passes_test
 import json
-from django.conf import settings
-from importlib import import_module
+from .ratelimit import check_signin_rate, rate_limit_stats
+from .staff import get_staff_context, is_staff
+
+
+def user_details(user, staff):
+    """User details returned on sign-in and by the auth status check"""
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "staff_rank": {
+            "name": staff.rank_name,
+            "level": staff.rank_level,
+        },
+        "department": staff.department,
+    }
 
-def is_staff(user):
-    """Check if the user is authenticated and associated with a PlacementStaff profile"""
-    return user.is_authenticated and hasattr(user, "placementstaff")
 
 @csrf_exempt
 def signin_view(request):
     """API endpoint for user login"""
     if request.method == "POST":
-        # Manually load the session
-        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
-        if session_key:
-            try:
-                engine = import_module(settings.SESSION_ENGINE)
-                request.session = engine.SessionStore(session_key)
-            except Exception as e:
-                return JsonResponse(
-                    {"status": "error", "message": f"Session loading failed: {str(e)}"},
-                    status=400,
-                )
-
         try:
             data = json.loads(request.body)
             username = data.get("email")
             password = data.get("password")
-            print(f"Attempting login for user: {username}")  # Debugging lin
+
+            # Turn away bursts before the password hasher runs
+            retry_after = check_signin_rate(request, username)
+            if retry_after:
+                response = JsonResponse(
+                    {
+                        "status": "error",
+                        "message": "Too many sign-in attempts, try again later",
+                    },
+                    status=429,
+                )
+                response["Retry-After"] = str(retry_after)
+                return response
 
             user = authenticate(request, username=username, password=password)
 
-            if user is not None and hasattr(user, "placementstaff"):
+            staff = get_staff_context(user) if user is not None else None
+            if staff is not None:
                 login(request, user)
                 # Return user details including staff rank
-                staff = user.placementstaff
                 return JsonResponse(
                     {
                         "status": "success",
                         "message": "Login successful",
-                        "user": {
-                            "id": user.id,
-                            "username": user.username,
-                            "email": user.email,
-                            "first_name": user.first_name,
-                            "last_name": user.last_name,
-                            "staff_rank": {
-                                "name": staff.rank.name if staff.rank else None,
-                                "level": staff.rank.level if staff.rank else None,
-                            },
-                            "department": staff.department,
-                        },
+                        "user": user_details(user, staff),
                     }
                 )
             else:
@@ -92,23 +94,23 @@ def signout_view(request):
 def check_auth_status(request):
     """API endpoint to check if user is authenticated and get user details"""
     user = request.user
-    staff = user.placementstaff
+    # Already loaded by the is_staff check above
+    staff = get_staff_context(user)
 
     return JsonResponse(
         {
             "status": "success",
             "authenticated": True,
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "staff_rank": {
-                    "name": staff.rank.name if staff.rank else None,
-                    "level": staff.rank.level if staff.rank else None,
-                },
-                "department": staff.department,
-            },
+            "user": user_details(user, staff),
         }
     )
+
+
+def signin_rate_limit_stats(request):
+    """API endpoint reporting sign-in attempts rejected by the rate limiter"""
+    if request.method == "GET":
+        return JsonResponse({"status": "success", "rejections": rate_limit_stats()})
+
+    return JsonResponse(
+        {"status": "error", "message": "Only GET method is allowed"}, status=405
+    )
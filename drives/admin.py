@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import CompanyDrive
+from .models import CompanyDrive, DriveStatusCounts
+from .search import search_drives
 
 
 class CompanyDriveAdmin(admin.ModelAdmin):
@@ -54,6 +55,12 @@ class CompanyDriveAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search through the text index instead of icontains scans"""
+        if not search_term:
+            return queryset, False
+        return search_drives(queryset, search_term), False
+
     def save_model(self, request, obj, form, change):
         if not change:  # If creating a new object
             obj.created_by = request.user
@@ -63,3 +70,23 @@ class CompanyDriveAdmin(admin.ModelAdmin):
 
 # Register the model with its admin
 admin.site.register(CompanyDrive, CompanyDriveAdmin)
+
+
+class DriveStatusCountsAdmin(admin.ModelAdmin):
+    list_display = (
+        "year_of_passing",
+        "pending",
+        "in_progress",
+        "completed",
+        "no_of_selects",
+    )
+
+    # Maintained by the drive write paths; rebuild with rebuild_drive_stats
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(DriveStatusCounts, DriveStatusCountsAdmin)
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class DrivesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'drives'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from .search import ensure_text_index
+
+        post_migrate.connect(ensure_text_index, sender=self)
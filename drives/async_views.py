@@ -0,0 +1,53 @@
+"""
+Async variants of the drive read endpoints for the ASGI entry point.
+
+Django 3.2 has no async ORM, so each view runs its synchronous counterpart
+from drives.views, queries, caching and conditional GET handling included,
+through sync_to_async on a dedicated pool of DRIVES_ASYNC_DB_THREADS
+threads. The event loop stays free while a query waits on MySQL, and the
+pool size bounds how many database connections one worker process opens.
+
+Pool threads keep their own connections, so they are closed around every
+call the same way Django does around a request, honouring CONN_MAX_AGE.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import views
+
+executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "DRIVES_ASYNC_DB_THREADS", 10),
+    thread_name_prefix="drives-db",
+)
+
+
+def on_db_pool(view):
+    """Async view running the sync ``view`` on the bounded database pool"""
+
+    def call(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            close_old_connections()
+
+    run = sync_to_async(call, thread_sensitive=False, executor=executor)
+
+    # wraps() also copies attributes such as csrf_exempt
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await run(request, *args, **kwargs)
+
+    return wrapper
+
+
+drive_list = on_db_pool(views.drive_list)
+drive_detail = on_db_pool(views.drive_detail)
+drives_in_progress = on_db_pool(views.drives_in_progress)
+pending_drives = on_db_pool(views.pending_drives)
+completed_drives = on_db_pool(views.completed_drives)
@@ -0,0 +1,182 @@
+"""
+Helpers shared by the drive benchmark management commands.
+
+Benchmarks never touch the configured database: ``isolated_database`` creates
+the test database (an in-memory one on SQLite) for the duration of the run,
+exactly like ``manage.py test`` does. Reads stay on the default database for
+the run: a replica without a TEST MIRROR gets its own, empty test database,
+where the seeded drives would be missing.
+"""
+
+import asyncio
+import statistics
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import RequestFactory
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from .models import CompanyDrive
+
+
+@contextmanager
+def isolated_database(verbosity=0):
+    """Run the enclosed block against a freshly created test database"""
+    setup_test_environment()
+    old_config = setup_databases(verbosity, interactive=False)
+    try:
+        with override_settings(DRIVES_REPLICA_ALIAS=None):
+            yield
+    finally:
+        teardown_databases(old_config, verbosity)
+        teardown_test_environment()
+
+
+def build_drives(rows, users, start_year=2015, cohorts=10):
+    """Unsaved CompanyDrive instances with a mix of all three statuses"""
+    base = date(start_year - 1, 6, 1)
+    drives = []
+    for i in range(rows):
+        received = base + timedelta(days=i % 3650)
+        drive = CompanyDrive(
+            company_name=f"Company {i}",
+            point_of_contact=f"Contact {i % 97}",
+            year_of_passing=start_year + i % cohorts,
+            job_received_date=received,
+            job_posted_date=received + timedelta(days=2),
+            job_posted_by=f"Coordinator {i % 13}",
+            created_by=users[i % len(users)],
+            updated_by=users[(i + 1) % len(users)],
+        )
+        stage = i % 3
+        if stage >= 1:
+            drive.student_data_shared_date = received + timedelta(days=7)
+            drive.interview_date = received + timedelta(days=14)
+            drive.interview_posted_date = received + timedelta(days=10)
+            drive.status = "IN_PROGRESS"
+        if stage == 2:
+            drive.results_declaration_status = "DECLARED"
+            drive.results_declaration_date = received + timedelta(days=21)
+            drive.no_of_selects = i % 25
+            drive.status = "COMPLETED"
+        drives.append(drive)
+    return drives
+
+
+def seed_drives(rows, batch_size=2000, cohorts=10):
+    """Insert ``rows`` drives created by a handful of users"""
+    User.objects.bulk_create(
+        [User(username=f"bench{i}", password="!") for i in range(5)]
+    )
+    # MySQL, like SQLite before Django 4.0, returns no ids from bulk_create
+    users = list(User.objects.filter(username__startswith="bench").order_by("pk"))
+    CompanyDrive.objects.bulk_create(
+        build_drives(rows, users, cohorts=cohorts), batch_size=batch_size
+    )
+    return users
+
+
+class QueryCounter:
+    """Execute wrapper counting queries without retaining their SQL"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """Count the queries of the enclosed block on every database"""
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield counter
+
+
+def measure(func, repeat=5):
+    """
+    Call ``func`` ``repeat`` times and return the median wall time in
+    milliseconds together with the number of queries per call.
+    """
+    timings = []
+    for _ in range(repeat):
+        with count_queries() as counter:
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": statistics.median(timings), "queries": counter.count}
+
+
+def percentiles(timings):
+    """p50, p95 and p99 of ``timings`` in seconds, as milliseconds"""
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+    }
+
+
+def wsgi_get(application, url):
+    """Serve a GET of ``url`` through a WSGI application, returning its status"""
+    environ = RequestFactory().get(url).environ
+    statuses = []
+    response = application(environ, lambda status, headers: statuses.append(status))
+    try:
+        b"".join(response)
+    finally:
+        # Sends request_finished, which closes the request's connections
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+async def asgi_get(application, url):
+    """Serve a GET of ``url`` through an ASGI application, returning its status"""
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    body_read = False
+    finished = asyncio.Event()
+    statuses = []
+
+    async def receive():
+        nonlocal body_read
+        if not body_read:
+            body_read = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Nothing more arrives until the response is complete
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await application(scope, receive, send)
+    finished.set()
+    return statuses[0]
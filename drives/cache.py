@@ -0,0 +1,121 @@
+"""
+Versioned response cache for the drive read endpoints.
+
+Every cached body is keyed by a global drive-data generation number as well
+as the endpoint and its query string. Any committed change to a CompanyDrive
+bumps the generation (see drives.signals), which orphans every cached list at
+once instead of deleting keys one by one.
+
+The cache alias is ``settings.DRIVES_CACHE_ALIAS``. The generation has to be
+seen by every worker process, so the alias must name a backend they all
+share, such as the file-based cache on a common directory. Without an alias
+(None) responses are not cached at all.
+"""
+
+import hashlib
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+GENERATION_KEY = "drives:generation"
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_cache():
+    """The shared response cache, or None when caching is off"""
+    alias = getattr(settings, "DRIVES_CACHE_ALIAS", None)
+    return caches[alias] if alias is not None else None
+
+
+def get_timeout():
+    return getattr(settings, "DRIVES_CACHE_TIMEOUT", 300)
+
+
+def current_generation():
+    """Return the drive-data generation, seeding it if the cache lost it"""
+    cache = get_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so an evicted counter can never fall back to a
+        # generation whose entries are still cached.
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    """Invalidate every cached drive response in O(1)"""
+    cache = get_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        return cache.incr(GENERATION_KEY)
+
+
+def response_key(request, view_name, generation):
+    params = "&".join(
+        f"{key}={value}"
+        for key, values in sorted(request.GET.lists())
+        for value in values
+    )
+    digest = hashlib.md5(params.encode(), usedforsecurity=False).hexdigest()
+    return f"drives:response:{generation}:{view_name}:{digest}"
+
+
+def record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    """Hit and miss counters of this worker process"""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def cached_drive_response(view_name):
+    """
+    Cache successful GET responses of a drive read view.
+
+    The generation is read before the view runs, so a body rendered from data
+    that changes mid-request is stored under the old generation and is never
+    served once the change is committed.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            cache = get_cache()
+            if request.method != "GET" or cache is None:
+                return view_func(request, *args, **kwargs)
+
+            key = response_key(request, view_name, current_generation())
+            cached = cache.get(key)
+            if cached is not None:
+                record("hits")
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+                response["X-Cache"] = "HIT"
+                return response
+
+            record("misses")
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(
+                    key, (response.content, response["Content-Type"]), get_timeout()
+                )
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
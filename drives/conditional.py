@@ -0,0 +1,125 @@
+"""
+Conditional GET support for the drive read endpoints.
+
+With the shared response cache configured (see drives.cache), list ETags come
+from the drive-data generation number, which moves on every committed change
+and costs a cache read instead of a query, so a poll answered from the cache
+or with a 304 never reaches the database. Without it, validators come from a
+single aggregate over the rows a view would serialize: ``max(updated_at)``
+moves on every create or edit and the row count moves on deletes, so an
+unchanged poll is answered with a 304 before the view builds its body.
+
+Cursor pages get no aggregate, which would scan the whole table for a page
+read with one index range scan; without the generation their ETag is a hash
+of the page the view returned. A single drive uses its version number, so
+the ETag a client received can be sent back in the If-Match of a PATCH.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.views.decorators.http import condition
+
+from .cache import current_generation, get_cache
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def digest(*parts):
+    token = "|".join(parts)
+    return hashlib.md5(token.encode(), usedforsecurity=False).hexdigest()
+
+
+def drive_validators(request, queryset):
+    """
+    Return ``(etag, last_modified)`` for ``queryset``, memoized per request.
+
+    ``queryset`` is None for responses validated by their body, which get no
+    validators here unless the generation provides the ETag.
+    """
+    cached = getattr(request, "_drive_validators", None)
+    if cached is not None:
+        return cached
+
+    if get_cache() is not None:
+        etag = digest(request.get_full_path(), str(current_generation()))
+        last_modified = None
+    elif queryset is None:
+        etag = last_modified = None
+    else:
+        state = queryset.order_by().aggregate(
+            last_modified=Max("updated_at"), count=Count("id")
+        )
+        last_modified = state["last_modified"]
+        etag = digest(
+            request.get_full_path(),
+            last_modified.isoformat() if last_modified else "",
+            str(state["count"]),
+        )
+    request._drive_validators = (etag, last_modified)
+    return request._drive_validators
+
+
+def version_etag(version):
+    return f'W/"{version}"'
+
+
+def version_validators(request, queryset):
+    """
+    ``(etag, last_modified)`` of the single drive in ``queryset``, the ETag
+    being its version. Weak, as ?fields= selects different representations
+    of the same version.
+    """
+    cached = getattr(request, "_drive_validators", None)
+    if cached is not None:
+        return cached
+
+    row = queryset.values_list("version", "updated_at").first()
+    request._drive_validators = (
+        (version_etag(row[0]), row[1]) if row is not None else (None, None)
+    )
+    return request._drive_validators
+
+
+def conditional_drive_view(get_queryset, validators=drive_validators):
+    """
+    Add ETag/Last-Modified handling to a drive read view.
+
+    ``get_queryset(request, *args, **kwargs)`` returns the rows the view
+    serializes for this request, or None to validate the response body, and
+    ``validators`` computes the ETag and Last-Modified of those rows. A
+    successful response still without an ETag gets one hashed from its body.
+    Only GET and HEAD are conditional; other methods reach the view untouched.
+    """
+
+    def decorator(view_func):
+        def etag_func(request, *args, **kwargs):
+            queryset = get_queryset(request, *args, **kwargs)
+            return validators(request, queryset)[0]
+
+        def last_modified_func(request, *args, **kwargs):
+            queryset = get_queryset(request, *args, **kwargs)
+            return validators(request, queryset)[1]
+
+        conditional_view = condition(etag_func, last_modified_func)(view_func)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                return view_func(request, *args, **kwargs)
+            response = conditional_view(request, *args, **kwargs)
+            if response.status_code != 200 or response.has_header("ETag"):
+                return response
+            # Skips streaming and empty bodies
+            set_response_etag(response)
+            if not response.has_header("ETag"):
+                return response
+            return get_conditional_response(
+                request, etag=response["ETag"], response=response
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,30 @@
+"""
+WebSocket stream of drive change events (see drives.live).
+
+Dashboards can replace polling with one fetch plus this stream: open the
+socket to /ws/drives/ first, fetch the lists over HTTP, then apply every
+event received, including those that arrived during the fetch. Events carry
+the drive id and new status, so a client moves the drive between its
+status lists and refetches /api/drives/<id>/ only when it needs the changed
+fields. On "reload", or after reconnecting, fetch the lists again.
+"""
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .live import DRIVE_CHANGES_GROUP
+
+
+class DriveChangesConsumer(AsyncJsonWebsocketConsumer):
+    async def connect(self):
+        await self.channel_layer.group_add(DRIVE_CHANGES_GROUP, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(DRIVE_CHANGES_GROUP, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        # The stream is one-way; client messages are ignored
+        pass
+
+    async def drive_changes(self, event):
+        await self.send_json({"changes": event["changes"]})
@@ -0,0 +1,100 @@
+"""
+Streaming CSV / NDJSON export of drives.
+
+Rows are read in primary-key keyset batches over a values_list projection
+and encoded one at a time, so neither the queryset nor the response body is
+ever held in memory as a whole. Keyset batches are used instead of
+``.iterator(chunk_size=...)`` because the MySQL driver buffers the complete
+result set client-side even for iterator(), which would defeat the point.
+"""
+
+import csv
+
+from .models import CompanyDrive
+from .serializers import DETAIL_FIELDS, compile_fields, iter_ndjson, lookups
+
+EXPORT_FIELDS = DETAIL_FIELDS
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+STATUSES = frozenset(value for value, _ in CompanyDrive.STATUS_CHOICES)
+
+
+class InvalidExportRequest(ValueError):
+    """Raised when the export format or filters are malformed"""
+
+
+def filtered_drives(params):
+    """Apply the list-endpoint filters (status, year_of_passing) to all drives"""
+    queryset = CompanyDrive.objects.all()
+    status = params.get("status")
+    if status:
+        if status not in STATUSES:
+            raise InvalidExportRequest(
+                f"status must be one of: {', '.join(sorted(STATUSES))}"
+            )
+        queryset = queryset.filter(status=status)
+    year = params.get("year_of_passing")
+    if year:
+        try:
+            queryset = queryset.filter(year_of_passing=int(year))
+        except ValueError:
+            raise InvalidExportRequest("year_of_passing must be an integer")
+    return queryset
+
+
+def iter_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield export tuples in id order, ``chunk_size`` rows per query"""
+    columns = lookups(EXPORT_FIELDS)
+    id_index = columns.index("id")
+    convert = compile_fields(EXPORT_FIELDS).convert
+    last_id = 0
+    while True:
+        chunk = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list(*columns)[:chunk_size]
+        )
+        for row in chunk:
+            yield convert(row)
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1][id_index]
+
+
+class Echo:
+    """File-like object whose write() just returns the value, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow([key for key, _ in EXPORT_FIELDS])
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(rows):
+    return iter_ndjson(rows, compile_fields(EXPORT_FIELDS).keys)
+
+
+STREAMERS = {"csv": stream_csv, "ndjson": stream_ndjson}
+
+
+def export_stream(params, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return ``(chunks, content_type, extension)`` for an export request"""
+    export_format = params.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        raise InvalidExportRequest(
+            f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    queryset = filtered_drives(params)
+    # The body streams after the view has returned, so bind the database the
+    # request was routed to now (see drives/routers.py)
+    rows = iter_rows(queryset.using(queryset.db), chunk_size)
+    return STREAMERS[export_format](rows), EXPORT_FORMATS[export_format], export_format
@@ -0,0 +1,97 @@
+"""
+Change events pushed to dashboards over the drive WebSocket.
+
+Every committed create, update or delete of a CompanyDrive is broadcast to
+the DRIVE_CHANGES_GROUP channel-layer group as a compact event; the consumer
+in drives.consumers forwards it to every connected client. An event is one
+of::
+
+    {"event": "created", "id": 12, "status": "PENDING"}
+    {"event": "updated", "id": 12, "status": "IN_PROGRESS",
+     "fields": ["interview_date", "status"]}
+    {"event": "deleted", "id": 12}
+    {"event": "reload"}
+
+"fields" is null when the changed fields are unknown (import upserts).
+"reload" stands in for bulk inserts whose ids the database did not return;
+clients refetch their lists when they see it.
+
+The events of one write are sent as a single ``{"changes": [...]}`` message
+after the transaction commits. Only sockets reachable through the configured
+channel layer receive them: with the in-memory layer, those held by the
+process that made the write. Without channels installed, writes publish
+nothing.
+"""
+
+import logging
+
+from asgiref.sync import async_to_sync
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DRIVE_CHANGES_GROUP = "drives.changes"
+
+# Bookkeeping columns that change on every save
+IGNORED_FIELDS = frozenset({"updated_at", "version"})
+
+
+def get_channel_layer():
+    try:
+        from channels.layers import get_channel_layer
+    except ImportError:  # WebSockets are only served through channels
+        return None
+    return get_channel_layer()
+
+
+def created_event(drive):
+    if drive.pk is None:
+        return {"event": "reload"}
+    return {"event": "created", "id": drive.pk, "status": drive.status}
+
+
+def updated_event(drive, fields=None):
+    """Event for ``drive``; ``fields`` defaults to drive.changed_fields()"""
+    if fields is None:
+        fields = drive.changed_fields()
+    if fields is not None:
+        fields = sorted(set(fields) - IGNORED_FIELDS)
+    return {
+        "event": "updated",
+        "id": drive.pk,
+        "status": drive.status,
+        "fields": fields,
+    }
+
+
+def deleted_event(pk):
+    return {"event": "deleted", "id": pk}
+
+
+def send_changes(changes):
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    try:
+        async_to_sync(layer.group_send)(
+            DRIVE_CHANGES_GROUP, {"type": "drive.changes", "changes": changes}
+        )
+    except Exception as e:
+        # A lost push must never fail the write that caused it
+        logger.error(f"Error publishing drive changes: {str(e)}")
+
+
+def publish_changes(changes, using="default"):
+    """Broadcast ``changes`` once the current transaction commits"""
+    # A bulk insert without ids needs a single reload, not one per row, and
+    # saves that changed nothing need no event at all
+    reload = any(change["event"] == "reload" for change in changes)
+    changes = [
+        change
+        for change in changes
+        if change["event"] != "reload" and change.get("fields") != []
+    ]
+    if reload:
+        changes.append({"event": "reload"})
+    if changes:
+        transaction.on_commit(lambda: send_changes(changes), using=using)
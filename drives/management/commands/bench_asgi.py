@@ -0,0 +1,202 @@
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.urls import path
+
+from drives import async_views
+from drives.benchmarking import asgi_get, isolated_database, seed_drives, wsgi_get
+from drives.models import CompanyDrive
+
+PATHS = [
+    "/api/drives/?limit=50",
+    "/api/drives/in-progress/",
+    "/api/drives/pending/",
+    "/api/drives/completed/",
+]
+
+# URLconf of the ASGI side, routing the read paths to the async views the way
+# drives/urls.py does under jobMonitoringApp.asgi. The WSGI side uses
+# ROOT_URLCONF, so both are served from one process.
+urlpatterns = [
+    path("api/drives/", async_views.drive_list, name="drive-list"),
+    path(
+        "api/drives/in-progress/",
+        async_views.drives_in_progress,
+        name="drives_in_progress",
+    ),
+    path("api/drives/pending/", async_views.pending_drives, name="pending_drives"),
+    path(
+        "api/drives/completed/",
+        async_views.completed_drives,
+        name="completed_drives",
+    ),
+]
+
+
+class SimulatedLatency:
+    """Execute wrapper adding a fixed round-trip delay to every query"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.seconds)
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+def summarize(latencies, elapsed):
+    ordered = sorted(latencies)
+    return {
+        "throughput": len(ordered) / elapsed,
+        "p50": statistics.median(ordered) * 1000,
+        "p95": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the drive read endpoints under simulated database latency "
+        "through the WSGI and ASGI handlers and the full middleware stack, "
+        "comparing a threaded sync worker with an ASGI worker using the async "
+        "views"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--concurrency",
+            default="1,4,16,64",
+            help="Comma-separated numbers of concurrent clients",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=20.0,
+            help="Delay added to every query, as a remote MySQL round trip",
+        )
+        parser.add_argument(
+            "--wsgi-workers",
+            type=int,
+            default=1,
+            help="Sync workers on the WSGI side",
+        )
+        parser.add_argument(
+            "--wsgi-threads",
+            type=int,
+            # The threads of a gthread worker in jobMonitoringApp/gunicorn_config.py
+            default=int(os.getenv("GUNICORN_THREADS", 4)),
+            help="Threads per sync worker, GUNICORN_THREADS by default",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",")]
+        except ValueError:
+            raise CommandError("--concurrency must be comma-separated integers")
+        if settings.DRIVES_ASYNC_VIEWS:
+            raise CommandError(
+                "Run without DRIVES_ASYNC_VIEWS, so the WSGI side serves the sync "
+                "views"
+            )
+        self.total = options["requests"]
+        self.paths = list(islice(cycle(PATHS), self.total))
+        latency = SimulatedLatency(options["latency_ms"] / 1000)
+
+        # Every response must reach the database, not the response cache
+        caches = {
+            **settings.CACHES,
+            "drives": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        }
+        with isolated_database(), override_settings(CACHES=caches):
+            seed_drives(options["rows"])
+            connection_created.connect(latency.install)
+            for connection in connections.all():
+                latency.install(connection=connection)
+            try:
+                self.run_levels(
+                    levels, options["wsgi_workers"] * options["wsgi_threads"]
+                )
+            finally:
+                connection_created.disconnect(latency.install)
+                for connection in connections.all():
+                    connection.execute_wrappers.remove(latency)
+
+    def run_levels(self, levels, wsgi_threads):
+        self.stdout.write(
+            f"{CompanyDrive.objects.count()} drives, {self.total} requests per "
+            f"run; WSGI: {wsgi_threads} request thread(s), ASGI: 1 worker with "
+            f"{settings.DRIVES_ASYNC_DB_THREADS} database threads"
+        )
+        self.stdout.write(
+            f"\n{'clients':>7} | {'WSGI req/s':>10} {'p50 ms':>8} {'p95 ms':>8} | "
+            f"{'ASGI req/s':>10} {'p50 ms':>8} {'p95 ms':>8}"
+        )
+        for clients in levels:
+            wsgi = self.run_wsgi(clients, wsgi_threads)
+            asgi = self.run_asgi(clients)
+            self.stdout.write(
+                f"{clients:>7} | {wsgi['throughput']:>10.1f} {wsgi['p50']:>8.1f} "
+                f"{wsgi['p95']:>8.1f} | {asgi['throughput']:>10.1f} "
+                f"{asgi['p50']:>8.1f} {asgi['p95']:>8.1f}"
+            )
+
+    def check_status(self, url, status):
+        if status != 200:
+            raise CommandError(f"{url} answered {status}")
+
+    def run_wsgi(self, clients, threads):
+        """Clients queue on a fixed number of threads serving one request each"""
+        application = WSGIHandler()
+        latencies = []
+
+        def client(batch):
+            for url in batch:
+                start = time.perf_counter()
+                status = pool.submit(wsgi_get, application, url).result()
+                latencies.append(time.perf_counter() - start)
+                self.check_status(url, status)
+
+        batches = [self.paths[i::clients] for i in range(clients)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            with ThreadPoolExecutor(clients) as client_pool:
+                list(client_pool.map(client, batches))
+        return summarize(latencies, time.perf_counter() - start)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def run_asgi(self, clients):
+        """Clients share one event loop, as on a single uvicorn worker"""
+        application = ASGIHandler()
+        latencies = []
+
+        async def client(batch):
+            for url in batch:
+                start = time.perf_counter()
+                status = await asgi_get(application, url)
+                latencies.append(time.perf_counter() - start)
+                self.check_status(url, status)
+
+        async def run():
+            await asyncio.gather(
+                *(client(self.paths[i::clients]) for i in range(clients))
+            )
+
+        start = time.perf_counter()
+        asyncio.run(run())
+        return summarize(latencies, time.perf_counter() - start)
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from drives.benchmarking import isolated_database, measure, seed_drives
+from drives.models import CompanyDrive
+from drives.serializers import DETAIL_FIELDS, serialize_drive, serialize_queryset
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the drive read endpoints and serializer paths against a "
+        "throwaway test database seeded with synthetic drives"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        with isolated_database():
+            seed_drives(rows)
+            self.stdout.write(f"Seeded {rows} drives\n")
+            self.report("Endpoint", self.endpoint_cases(), repeat)
+            self.report("Detailed serialization", self.serializer_cases(), repeat)
+
+    def endpoint_cases(self):
+        client = Client()
+        drive_id = CompanyDrive.objects.values_list("id", flat=True).first()
+        urls = [
+            "/api/drives/",
+            "/api/drives/?limit=50",
+            "/api/drives/in-progress/",
+            "/api/drives/pending/",
+            "/api/drives/completed/",
+            f"/api/drives/{drive_id}/",
+        ]
+        return [(url, lambda url=url: client.get(url)) for url in urls]
+
+    def serializer_cases(self):
+        return [
+            (
+                "instances",
+                lambda: [serialize_drive(d) for d in CompanyDrive.objects.all()],
+            ),
+            (
+                "instances + select_related",
+                lambda: [
+                    serialize_drive(d)
+                    for d in CompanyDrive.objects.select_related(
+                        "created_by", "updated_by"
+                    )
+                ],
+            ),
+            (
+                "values_list() projection",
+                lambda: serialize_queryset(CompanyDrive.objects.all(), DETAIL_FIELDS),
+            ),
+        ]
+
+    def report(self, title, cases, repeat):
+        self.stdout.write(f"\n{title:<32} {'queries':>8} {'median ms':>10}")
+        for name, func in cases:
+            result = measure(func, repeat)
+            self.stdout.write(
+                f"{name:<32} {result['queries']:>8} {result['median_ms']:>10.1f}"
+            )
@@ -0,0 +1,219 @@
+import json
+import platform
+import time
+import tracemalloc
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from accounts.models import PlacementStaff, StaffRank
+from drives.benchmarking import (
+    count_queries,
+    isolated_database,
+    percentiles,
+    seed_drives,
+)
+from drives.models import CompanyDrive
+
+PASSWORD = "bench-password"
+# p95 changes smaller than this are timer noise on the fast endpoints
+MIN_REGRESSION_MS = 1.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the drive and account endpoints through the test client at "
+        "several dataset sizes, reporting p50/p95/p99 latency, queries per "
+        "request and peak memory, optionally against a stored JSON baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Comma-separated numbers of drives to seed, one run each",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=30, help="Timed requests per endpoint"
+        )
+        parser.add_argument(
+            "--cohorts",
+            type=int,
+            default=25,
+            help="Number of year_of_passing cohorts the drives are spread over",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file")
+        parser.add_argument(
+            "--baseline",
+            help=(
+                "Compare against results written by --output, such as "
+                "drives/benchmarks/endpoints-sqlite.json"
+            ),
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed p95 slowdown against the baseline, as a fraction",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers")
+        if options["requests"] < 2:
+            raise CommandError("--requests must be at least 2")
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+
+        results = {
+            "vendor": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "requests": options["requests"],
+            "cohorts": options["cohorts"],
+            "sizes": {},
+        }
+        # Measure the queries behind each response rather than the response
+        # cache, and let the sign-in loop past the rate limiter
+        caches = {
+            **settings.CACHES,
+            "drives": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        }
+        unlimited = {
+            scope: {"capacity": 10**9, "refill_seconds": 1}
+            for scope in settings.LOGIN_RATE_LIMITS
+        }
+        with override_settings(CACHES=caches, LOGIN_RATE_LIMITS=unlimited):
+            for size in sizes:
+                with isolated_database():
+                    seed_drives(size, cohorts=options["cohorts"])
+                    results["sizes"][str(size)] = self.run_endpoints(
+                        options["requests"]
+                    )
+                self.report(size, results["sizes"][str(size)], baseline)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"\nResults written to {options['output']}")
+        if baseline is not None:
+            self.check_regressions(results, baseline, options["tolerance"])
+
+    def endpoint_cases(self):
+        rank = StaffRank.objects.create(name="Coordinator", level=1)
+        user = User.objects.create_user("bench-staff", password=PASSWORD)
+        PlacementStaff.objects.create(
+            user=user, rank=rank, department="Placements", contact_number="0"
+        )
+        anonymous, signed_in = Client(), Client()
+        signed_in.force_login(user)
+        drive_id = CompanyDrive.objects.values_list("id", flat=True).first()
+        credentials = json.dumps({"email": user.username, "password": PASSWORD})
+
+        def get(client, url):
+            return lambda: client.get(url)
+
+        return [
+            ("drive_list", get(anonymous, "/api/drives/")),
+            ("drives_in_progress", get(anonymous, "/api/drives/in-progress/")),
+            ("pending_drives", get(anonymous, "/api/drives/pending/")),
+            ("completed_drives", get(anonymous, "/api/drives/completed/")),
+            ("drive_detail", get(anonymous, f"/api/drives/{drive_id}/")),
+            (
+                "signin_view",
+                lambda: Client().post(
+                    "/api/signin/", credentials, content_type="application/json"
+                ),
+            ),
+            ("check_auth_status", get(signed_in, "/api/auth-status/")),
+        ]
+
+    def run_endpoints(self, requests):
+        return {
+            name: self.measure(name, request, requests)
+            for name, request in self.endpoint_cases()
+        }
+
+    def measure(self, name, request, requests):
+        response = request()  # warm-up
+        if response.status_code != 200:
+            raise CommandError(f"{name} answered {response.status_code}")
+
+        timings = []
+        for _ in range(requests):
+            with count_queries() as counter:
+                start = time.perf_counter()
+                request()
+                timings.append(time.perf_counter() - start)
+
+        # Traced separately, as tracemalloc slows down every allocation
+        tracemalloc.start()
+        try:
+            request()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            **percentiles(timings),
+            "queries": counter.count,
+            "peak_kib": peak / 1024,
+        }
+
+    def report(self, size, endpoints, baseline):
+        previous = (baseline or {}).get("sizes", {}).get(str(size), {})
+        self.stdout.write(
+            f"\n{size} drives\n{'endpoint':<20} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'queries':>8} {'peak KiB':>9}"
+            + (f" {'base p95':>9} {'change':>7}" if previous else "")
+        )
+        for name, result in endpoints.items():
+            line = (
+                f"{name:<20} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['queries']:>8} "
+                f"{result['peak_kib']:>9.0f}"
+            )
+            if name in previous:
+                base = previous[name]["p95_ms"]
+                line += f" {base:>9.1f} {result['p95_ms'] / base - 1:>+7.0%}"
+            self.stdout.write(line)
+
+    def check_regressions(self, results, baseline, tolerance):
+        if baseline.get("vendor") != results["vendor"]:
+            self.stderr.write(
+                f"Baseline ran on {baseline.get('vendor')}, this run on "
+                f"{results['vendor']}: latencies are not comparable"
+            )
+        regressions = []
+        for size, endpoints in results["sizes"].items():
+            previous = baseline.get("sizes", {}).get(size, {})
+            for name, result in endpoints.items():
+                if name not in previous:
+                    continue
+                before = previous[name]
+                slowdown = result["p95_ms"] - before["p95_ms"]
+                if (
+                    slowdown > before["p95_ms"] * tolerance
+                    and slowdown > MIN_REGRESSION_MS
+                ):
+                    regressions.append(
+                        f"{name} at {size} drives: p95 {before['p95_ms']:.1f} ms "
+                        f"-> {result['p95_ms']:.1f} ms"
+                    )
+                if result["queries"] > before["queries"]:
+                    regressions.append(
+                        f"{name} at {size} drives: {before['queries']} -> "
+                        f"{result['queries']} queries per request"
+                    )
+        if regressions:
+            raise CommandError(
+                "Slower than the baseline:\n  " + "\n  ".join(regressions)
+            )
+        self.stdout.write("No regressions against the baseline")
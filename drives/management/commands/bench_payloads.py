@@ -0,0 +1,108 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from drives.benchmarking import build_drives, measure
+from drives.models import CompanyDrive
+from drives.payloads import PAYLOAD_FIELDS, build_drive
+
+OPTIONAL_DATES = (
+    "student_data_shared_date",
+    "interview_date",
+    "interview_posted_date",
+    "results_declaration_date",
+)
+
+
+def legacy_parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def legacy_build_drive(data):
+    """The hand-written strptime validator, for comparison"""
+    for field, required in PAYLOAD_FIELDS:
+        if required and not data.get(field):
+            raise ValueError(f"{field} is required")
+    drive = CompanyDrive(
+        company_name=data.get("company_name"),
+        point_of_contact=data.get("point_of_contact"),
+        year_of_passing=int(data.get("year_of_passing")),
+        job_received_date=legacy_parse_date(data.get("job_received_date")),
+        job_posted_date=legacy_parse_date(data.get("job_posted_date")),
+        job_posted_by=data.get("job_posted_by"),
+    )
+    for field in OPTIONAL_DATES:
+        if data.get(field):
+            setattr(drive, field, legacy_parse_date(data.get(field)))
+    if data.get("results_declaration_status"):
+        drive.results_declaration_status = data.get("results_declaration_status")
+    if data.get("no_of_selects") is not None:
+        drive.no_of_selects = int(data.get("no_of_selects"))
+    return drive
+
+
+def build_payloads(rows):
+    """Create payloads as a client would send them, a tenth of them invalid"""
+    payloads = []
+    for i, drive in enumerate(build_drives(rows, [None])):
+        payload = {}
+        for name, _ in PAYLOAD_FIELDS:
+            value = getattr(drive, name)
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            payload[name] = value
+        if i % 10 == 9:
+            payload["job_posted_date"] = "2024-02-30"
+            payload["year_of_passing"] = "20x4"
+        payloads.append(payload)
+    return payloads
+
+
+def validate_all(builder, payloads):
+    for payload in payloads:
+        try:
+            builder(payload)
+        except ValueError:
+            pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark drive payload validation on large batches, the compiled "
+        "schema against the hand-written strptime validator"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Comma-separated batch sizes",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers")
+
+        payloads = build_payloads(sizes[-1])
+        cases = [
+            ("strptime, first error", legacy_build_drive),
+            ("schema, all errors", build_drive),
+        ]
+        self.stdout.write(
+            f"{'validator':<24}"
+            + "".join(f"{size:>12}" for size in sizes)
+            + "   (median ms)"
+        )
+        for name, builder in cases:
+            timings = [
+                measure(
+                    lambda: validate_all(builder, payloads[:size]), options["repeat"]
+                )["median_ms"]
+                for size in sizes
+            ]
+            self.stdout.write(
+                f"{name:<24}" + "".join(f"{timing:>12.1f}" for timing in timings)
+            )
@@ -0,0 +1,98 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from drives.benchmarking import isolated_database, measure, seed_drives
+from drives.models import CompanyDrive
+from drives.serializers import (
+    DATE_FIELDS,
+    DETAIL_FIELDS,
+    JSON_BACKENDS,
+    LIST_FIELDS,
+    lookups,
+    serialize_rows,
+)
+
+
+def legacy_serialize_rows(rows, fields):
+    """The per-field branching serializer over values() dicts, for comparison"""
+    result = []
+    for row in rows:
+        item = {}
+        for key, lookup in fields:
+            value = row[lookup]
+            if lookup in DATE_FIELDS:
+                value = value.isoformat() if value else None
+            item[key] = value
+        result.append(item)
+    return result
+
+
+def legacy_encode(data):
+    # What JsonResponse does with its payload
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark row serialization and JSON encoding of drive list "
+        "payloads, compiled field specs against the per-field serializer"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="1000,10000,100000",
+            help="Comma-separated row counts to serialize",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers")
+        repeat = options["repeat"]
+
+        with isolated_database():
+            seed_drives(sizes[-1])
+            self.stdout.write(f"Seeded {sizes[-1]} drives")
+            for title, fields in (("list", LIST_FIELDS), ("detail", DETAIL_FIELDS)):
+                columns = lookups(fields)
+                dict_rows = list(CompanyDrive.objects.values(*columns))
+                tuple_rows = list(CompanyDrive.objects.values_list(*columns))
+                self.stdout.write(
+                    f"\n{title + ' fields':<24}"
+                    + "".join(f"{size:>12}" for size in sizes)
+                    + "   (median ms)"
+                )
+                for name, func in self.cases(fields, dict_rows, tuple_rows):
+                    timings = [
+                        measure(lambda: func(size), repeat)["median_ms"]
+                        for size in sizes
+                    ]
+                    self.stdout.write(
+                        f"{name:<24}"
+                        + "".join(f"{timing:>12.1f}" for timing in timings)
+                    )
+
+    def cases(self, fields, dict_rows, tuple_rows):
+        cases = [
+            (
+                "per-field + json",
+                lambda size: legacy_encode(
+                    {"drives": legacy_serialize_rows(dict_rows[:size], fields)}
+                ),
+            )
+        ]
+        for backend, dumps in JSON_BACKENDS.items():
+            cases.append(
+                (
+                    f"compiled + {backend}",
+                    lambda size, dumps=dumps: dumps(
+                        {"drives": serialize_rows(tuple_rows[:size], fields)}
+                    ),
+                )
+            )
+        return cases
@@ -0,0 +1,138 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# (name, gunicorn arguments) of the compared server setups
+SETUPS = [
+    # The Dockerfile command before jobMonitoringApp/gunicorn_config.py
+    ("defaults", ["jobMonitoringApp.wsgi:application"]),
+    ("configured", ["-c", "python:jobMonitoringApp.gunicorn_config"]),
+]
+POLL_INTERVAL = 0.005
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get(port, path, timeout):
+    """Status of GET ``path``, or None while nothing listens on ``port``"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except ConnectionRefusedError:
+        return None
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn with its defaults and with jobMonitoringApp.gunicorn_config "
+        "and measure the time from launch to the first response, the latency "
+        "of that first request and of the one after it. The servers read the "
+        "configured database, which should be migrated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Workers of both setups, so they fork the same number",
+        )
+        parser.add_argument("--path", default="/api/drives/?limit=50")
+        parser.add_argument(
+            "--timeout", type=float, default=60.0, help="Seconds to wait per start"
+        )
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be positive")
+        self.stdout.write(
+            f"{options['runs']} starts per setup, {options['workers']} workers, "
+            f"GET {options['path']}"
+        )
+        self.stdout.write(
+            f"\n{'setup':<12} {'ready ms':>9} {'first ms':>9} {'second ms':>10}"
+        )
+        for name, arguments in SETUPS:
+            runs = [
+                self.start(arguments, options["workers"], options)
+                for _ in range(options["runs"])
+            ]
+            ready, first, second = (statistics.median(column) for column in zip(*runs))
+            self.stdout.write(f"{name:<12} {ready:>9.0f} {first:>9.1f} {second:>10.1f}")
+        self.stdout.write(
+            "\nready: launch to first response; first, second: latency of the "
+            "first two requests (medians)"
+        )
+
+    def start(self, arguments, workers, options):
+        port = free_port()
+        command = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            *arguments,
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(workers),
+        ]
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        with tempfile.TemporaryFile() as log:
+            launched = time.perf_counter()
+            server = subprocess.Popen(
+                command,
+                cwd=settings.BASE_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=log,
+            )
+            try:
+                return self.first_responses(server, port, launched, log, options)
+            finally:
+                server.terminate()
+                server.wait(timeout=options["timeout"])
+
+    def first_responses(self, server, port, launched, log, options):
+        deadline = launched + options["timeout"]
+        while True:
+            if server.poll() is not None:
+                log.seek(0)
+                raise CommandError(
+                    "gunicorn exited:\n" + log.read().decode(errors="replace")
+                )
+            if time.perf_counter() > deadline:
+                raise CommandError("gunicorn did not answer in time")
+            start = time.perf_counter()
+            status = get(port, options["path"], options["timeout"])
+            if status is not None:
+                break
+            time.sleep(POLL_INTERVAL)
+        ready = time.perf_counter()
+        if status != 200:
+            raise CommandError(f"{options['path']} answered {status}")
+
+        second_start = time.perf_counter()
+        get(port, options["path"], options["timeout"])
+        return (
+            (ready - launched) * 1000,
+            (ready - start) * 1000,
+            (time.perf_counter() - second_start) * 1000,
+        )
@@ -0,0 +1,183 @@
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from drives.models import CompanyDrive
+from drives.payloads import PAYLOAD_FIELDS, DriveValidationError, build_drive
+from drives.signals import drives_bulk_changed
+
+UPSERT_KEY = ("company_name", "year_of_passing", "job_received_date")
+
+IMPORT_FIELDS = [name for name, _ in PAYLOAD_FIELDS]
+
+
+def read_csv(stream):
+    # Spreadsheet exports leave empty cells for missing values
+    for row in csv.DictReader(stream):
+        yield {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def read_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import drives from a CSV or JSONL file (or stdin) in chunked "
+        "bulk inserts, optionally upserting on "
+        "(company_name, year_of_passing, job_received_date)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin")
+        parser.add_argument("--format", choices=sorted(READERS))
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help="Update drives that already exist instead of inserting duplicates",
+        )
+        parser.add_argument("--user", help="Username recorded as created_by")
+        parser.add_argument(
+            "--show-rejects",
+            type=int,
+            default=20,
+            help="Number of rejected rows to print",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be a positive integer")
+        self.upsert = options["upsert"]
+        self.user = None
+        if options["user"]:
+            try:
+                self.user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        path = options["path"]
+        import_format = options["format"]
+        if import_format is None:
+            import_format = EXTENSIONS.get(Path(path).suffix.lower())
+            if import_format is None:
+                raise CommandError("Pass --format when it can't be told from the path")
+
+        self.rejected = []
+        self.inserted = self.updated = self.merged = self.read = 0
+        start = time.perf_counter()
+        if path == "-":
+            self.import_stream(sys.stdin, import_format, options["chunk_size"])
+        else:
+            try:
+                with open(path, newline="", encoding="utf-8") as stream:
+                    self.import_stream(stream, import_format, options["chunk_size"])
+            except OSError as e:
+                raise CommandError(f"Can't read {path}: {e}")
+        elapsed = time.perf_counter() - start
+
+        for line, message in self.rejected[: options["show_rejects"]]:
+            self.stderr.write(f"Row {line}: {message}")
+        written = self.inserted + self.updated
+        self.stdout.write(
+            f"Read {self.read} rows in {elapsed:.2f}s "
+            f"({self.read / elapsed if elapsed else 0:.0f} rows/s): "
+            f"{self.inserted} inserted, {self.updated} updated, "
+            f"{self.merged} merged duplicates, {len(self.rejected)} rejected"
+        )
+        if written:
+            self.stdout.write(self.style.SUCCESS(f"Imported {written} drives"))
+
+    def import_stream(self, stream, import_format, chunk_size):
+        chunk = []
+        try:
+            for line, row in enumerate(READERS[import_format](stream), start=1):
+                self.read += 1
+                drive = self.parse_row(line, row)
+                if drive is not None:
+                    chunk.append(drive)
+                if len(chunk) >= chunk_size:
+                    self.write_chunk(chunk)
+                    chunk = []
+        except (csv.Error, json.JSONDecodeError) as e:
+            raise CommandError(f"Malformed input after row {self.read}: {e}")
+        if chunk:
+            self.write_chunk(chunk)
+
+    def parse_row(self, line, row):
+        try:
+            drive = build_drive(row)
+        except DriveValidationError as e:
+            self.rejected.append((line, str(e)))
+            return None
+        drive.created_by = self.user
+        drive.status = drive.derive_status()
+        return drive
+
+    def write_chunk(self, drives):
+        """Insert (or upsert) one chunk of validated drives in its own transaction"""
+        with transaction.atomic():
+            created, updated = drives, []
+            if self.upsert:
+                created, updated = self.match_existing(drives)
+            CompanyDrive.objects.bulk_create(created)
+            if updated:
+                # bulk_create(update_conflicts=...) would upsert in a single
+                # statement but needs Django 4.1; requirements.txt pins 3.2
+                CompanyDrive.objects.bulk_update(
+                    updated, IMPORT_FIELDS + ["status", "updated_at", "version"]
+                )
+            drives_bulk_changed.send(
+                sender=CompanyDrive, created=created, updated=updated
+            )
+        self.inserted += len(created)
+        self.updated += len(updated)
+
+    def match_existing(self, drives):
+        """
+        Split a chunk into new drives and stored drives to overwrite.
+
+        Rows repeating a key within the chunk collapse onto the last one.
+        """
+        by_key = {}
+        for drive in drives:
+            by_key[tuple(getattr(drive, field) for field in UPSERT_KEY)] = drive
+        self.merged += len(drives) - len(by_key)
+
+        # Locked until the chunk commits, so the counted states read here are
+        # still the stored ones when the counters are adjusted
+        existing = CompanyDrive.objects.select_for_update().filter(
+            company_name__in={key[0] for key in by_key},
+            year_of_passing__in={key[1] for key in by_key},
+            job_received_date__in={key[2] for key in by_key},
+        ).values_list(*UPSERT_KEY, "id", "status", "no_of_selects")
+        existing_rows = {tuple(row[:3]): row[3:] for row in existing}
+
+        now = timezone.now()
+        created, updated = [], []
+        for key, drive in by_key.items():
+            if key in existing_rows:
+                drive.id, status, selects = existing_rows[key]
+                # Snapshot of the overwritten row for the dashboard counters
+                drive._counted_state = (status, key[1], selects or 0)
+                # bulk_update neither runs save() nor auto_now
+                drive.updated_at = now
+                drive.version = F("version") + 1
+                updated.append(drive)
+            else:
+                created.append(drive)
+        return created, updated
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from drives.models import DriveStatusCounts
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard status counters from the drives table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        rows = DriveStatusCounts.rebuild(using=options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} counter rows"))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drives', '0002_alter_companydrive_created_by_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companydrive',
+            index=models.Index(fields=['status', 'created_at'], name='drive_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companydrive',
+            index=models.Index(fields=['created_at', 'id'], name='drive_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companydrive',
+            index=models.Index(fields=['year_of_passing', 'status'], name='drive_year_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companydrive',
+            index=models.Index(fields=['interview_date'], name='drive_interview_date_idx'),
+        ),
+    ]
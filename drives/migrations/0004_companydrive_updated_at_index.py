@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drives', '0003_companydrive_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companydrive',
+            index=models.Index(fields=['updated_at'], name='drive_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:38
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+def install_text_index(apps, schema_editor):
+    from drives.search import install_text_index
+
+    install_text_index(schema_editor.connection)
+
+
+def remove_text_index(apps, schema_editor):
+    from drives.search import remove_text_index
+
+    remove_text_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drives', '0004_companydrive_updated_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companydrive',
+            index=models.Index(django.db.models.functions.text.Lower('company_name'), name='drive_company_lower_idx'),
+        ),
+        # MySQL FULLTEXT index or SQLite FTS5 table, see drives/search.py
+        migrations.RunPython(install_text_index, remove_text_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drives', '0005_companydrive_text_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companydrive',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:42
+
+from django.db import migrations, models
+
+
+def populate_counts(apps, schema_editor):
+    CompanyDrive = apps.get_model("drives", "CompanyDrive")
+    DriveStatusCounts = apps.get_model("drives", "DriveStatusCounts")
+    db_alias = schema_editor.connection.alias
+    columns = {
+        "PENDING": "pending",
+        "IN_PROGRESS": "in_progress",
+        "COMPLETED": "completed",
+    }
+    counts = {0: DriveStatusCounts(year_of_passing=0)}
+    groups = (
+        CompanyDrive.objects.using(db_alias)
+        .order_by()
+        .values("year_of_passing", "status")
+        .annotate(count=models.Count("id"), selects=models.Sum("no_of_selects"))
+    )
+    for group in groups:
+        year = group["year_of_passing"]
+        counts.setdefault(year, DriveStatusCounts(year_of_passing=year))
+        for row in (counts[0], counts[year]):
+            column = columns[group["status"]]
+            setattr(row, column, getattr(row, column) + group["count"])
+            row.no_of_selects += group["selects"] or 0
+    DriveStatusCounts.objects.using(db_alias).bulk_create(counts.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drives', '0006_companydrive_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriveStatusCounts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year_of_passing', models.IntegerField(unique=True)),
+                ('pending', models.IntegerField(default=0)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('no_of_selects', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Drive Status Counts',
+                'verbose_name_plural': 'Drive Status Counts',
+            },
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
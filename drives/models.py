@@ -1,4 +1,8 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import DatabaseError, models, router, transaction
+from django.db.models import F
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
 
 
@@ -16,6 +20,9 @@ class CompanyDrive(models.Model):
         ("DECLARED", "Declared"),
     ]
 
+    # Columns DriveStatusCounts aggregates, see counted_state()
+    COUNTED_FIELDS = ["status", "year_of_passing", "no_of_selects"]
+
     company_name = models.CharField(max_length=100)
     point_of_contact = models.CharField(max_length=100)
     year_of_passing = models.IntegerField()
@@ -42,22 +49,278 @@ class CompanyDrive(models.Model):
         User, on_delete=models.SET_NULL, null=True, related_name="updated_drives",
     blank=True
     )
+    # Incremented on every save; PATCH uses it for optimistic concurrency and
+    # drive_detail sends it as the ETag
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            # Status list endpoints: filter(status=...).order_by("-created_at")
+            models.Index(
+                fields=["status", "created_at"], name="drive_status_created_idx"
+            ),
+            # drive_list ordering and its keyset pagination on (-created_at, -id)
+            models.Index(fields=["created_at", "id"], name="drive_created_id_idx"),
+            models.Index(
+                fields=["year_of_passing", "status"], name="drive_year_status_idx"
+            ),
+            models.Index(fields=["interview_date"], name="drive_interview_date_idx"),
+            # max(updated_at) validator for conditional GETs
+            models.Index(fields=["updated_at"], name="drive_updated_at_idx"),
+            # Case-insensitive company name autocomplete as an index range scan
+            models.Index(Lower("company_name"), name="drive_company_lower_idx"),
+        ]
 
     def __str__(self):
         return (
             f"{self.company_name} - {self.interview_date or 'No interview scheduled'}"
         )
 
-    def save(self, *args, **kwargs):
-        # Automatically determine the status based on the current state
+    def derive_status(self):
+        """Status implied by the current state of the drive"""
         if (
             self.results_declaration_status == "DECLARED"
             and self.no_of_selects is not None
         ):
-            self.status = "COMPLETED"
+            return "COMPLETED"
         elif self.interview_date and self.student_data_shared_date:
-            self.status = "IN_PROGRESS"
-        else:
-            self.status = "PENDING"
+            return "IN_PROGRESS"
+        return "PENDING"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._counted_state = instance.counted_state()
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def changed_fields(self):
+        """
+        Names of the fields modified since the drive was loaded or last
+        saved, or None for drives not loaded from the database.
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        if loaded is None:
+            return None
+        return [
+            field.name
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (
+                field.attname not in loaded
+                or loaded[field.attname] != getattr(self, field.attname)
+            )
+        ]
+
+    def snapshot_values(self):
+        """Record the current field values as the saved state"""
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def counted_state(self):
+        """
+        The (status, year_of_passing, no_of_selects) triple DriveStatusCounts
+        aggregates, or None if part of it was deferred when loading.
+        """
+        loaded = self.__dict__
+        if not all(name in loaded for name in self.COUNTED_FIELDS):
+            return None
+        return (self.status, self.year_of_passing, self.no_of_selects or 0)
+
+    def stored_counted_state(self, using, refresh=False, lock=False):
+        """
+        The counted state as last written, from the load snapshot or, when
+        that is missing or ``refresh`` is set, from the row itself. ``lock``
+        reads the row with SELECT ... FOR UPDATE, holding it until the
+        transaction ends.
+        """
+        state = None if refresh or lock else getattr(self, "_counted_state", None)
+        if state is None and self.pk is not None:
+            queryset = CompanyDrive.objects.using(using).filter(pk=self.pk)
+            if lock:
+                queryset = queryset.select_for_update()
+            row = queryset.values_list(*self.COUNTED_FIELDS).first()
+            if row is not None:
+                state = (row[0], row[1], row[2] or 0)
+        return state
+
+    def save(self, *args, **kwargs):
+        # Automatically determine the status based on the current state
+        self.status = self.derive_status()
+
+        adding = self._state.adding
+        if not adding:
+            # Incremented by the UPDATE itself, so two concurrent saves never
+            # store the same version for different contents
+            loaded_version = self.version
+            self.version = F("version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+
+        # Keep the dashboard counters in the same transaction as the row
+        using = kwargs.get("using") or router.db_for_write(
+            CompanyDrive, instance=self
+        )
+        try:
+            with transaction.atomic(using=using):
+                # The row as it stands now, not as it was loaded: a concurrent
+                # save may have changed it since, and the lock makes the next
+                # one wait until this delta is applied
+                old_state = (
+                    None if adding else self.stored_counted_state(using, lock=True)
+                )
+                super().save(*args, **kwargs)
+                if not adding:
+                    # The incremented version and, after a partial save, the
+                    # counted columns it left as another writer stored them
+                    fields = ["version"]
+                    if kwargs.get("update_fields") is not None:
+                        fields += self.COUNTED_FIELDS
+                    self.refresh_from_db(using=using, fields=fields)
+                new_state = self.counted_state()
+                if new_state is None:
+                    # Saved with deferred fields: the row holds the full state
+                    new_state = self.stored_counted_state(using, refresh=True)
+                DriveStatusCounts.apply_changes([(old_state, new_state)], using)
+        except Exception:
+            if not adding:
+                self.version = loaded_version
+            raise
+        self._counted_state = new_state
+        self.snapshot_values()
+
+    def save_if_version(self, expected_version, update_fields):
+        """
+        save(update_fields=...) that only applies if the stored row is still
+        at ``expected_version``.
+
+        The version check is part of the UPDATE's WHERE clause, so no row lock
+        is held between reading the drive and writing it. Returns False, and
+        writes nothing, when someone else saved the drive in the meantime.
+        """
+        self.version = expected_version
+        self._expected_version = expected_version
+        self._version_conflict = False
+        try:
+            self.save(update_fields=update_fields)
+        except DatabaseError:
+            if not self._version_conflict:
+                raise
+            return False
+        finally:
+            del self._expected_version
+        return True
+
+    def _do_update(self, base_qs, *args, **kwargs):
+        expected_version = getattr(self, "_expected_version", None)
+        if expected_version is None:
+            return super()._do_update(base_qs, *args, **kwargs)
+        updated = super()._do_update(
+            base_qs.filter(version=expected_version), *args, **kwargs
+        )
+        self._version_conflict = not updated
+        return updated
+
+
+class DriveStatusCounts(models.Model):
+    """
+    Dashboard counters per year_of_passing, maintained incrementally.
+
+    The row with year_of_passing ALL_YEARS holds the totals over every
+    cohort. CompanyDrive.save(), deletions and the bulk write paths adjust the
+    counters inside the transaction that changes the drives; ``rebuild``
+    recomputes them from scratch.
+    """
+
+    ALL_YEARS = 0
+    STATUS_COLUMNS = {
+        "PENDING": "pending",
+        "IN_PROGRESS": "in_progress",
+        "COMPLETED": "completed",
+    }
+
+    year_of_passing = models.IntegerField(unique=True)
+    pending = models.IntegerField(default=0)
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    no_of_selects = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Drive Status Counts"
+        verbose_name_plural = "Drive Status Counts"
+
+    def __str__(self):
+        if self.year_of_passing == self.ALL_YEARS:
+            return f"All years: {self.total} drives"
+        return f"{self.year_of_passing}: {self.total} drives"
+
+    @property
+    def total(self):
+        return self.pending + self.in_progress + self.completed
+
+    @classmethod
+    def apply_changes(cls, changes, using="default"):
+        """
+        Apply ``(old_state, new_state)`` pairs of CompanyDrive.counted_state()
+        values; None stands for a drive that did not exist before / after.
+        """
+        deltas = defaultdict(Counter)
+        for old, new in changes:
+            if old == new:
+                continue
+            for state, sign in ((old, -1), (new, 1)):
+                if state is None:
+                    continue
+                status, year, selects = state
+                for key in (cls.ALL_YEARS, year):
+                    deltas[key][cls.STATUS_COLUMNS[status]] += sign
+                    deltas[key]["no_of_selects"] += sign * selects
+
+        if not deltas:
+            return
+        manager = cls.objects.using(using)
+        manager.bulk_create(
+            [cls(year_of_passing=year) for year in deltas], ignore_conflicts=True
+        )
+        # A fixed update order keeps concurrent writers from deadlocking
+        for year in sorted(deltas):
+            updates = {
+                column: F(column) + amount
+                for column, amount in deltas[year].items()
+                if amount
+            }
+            if updates:
+                manager.filter(year_of_passing=year).update(**updates)
+
+    @classmethod
+    def rebuild(cls, using="default"):
+        """
+        Recompute every counter from the drives table.
 
-        super().save(*args, **kwargs)
+        Writes that commit while the rebuild runs may be missed, so run it
+        when the drives are not being edited.
+        """
+        totals = cls(year_of_passing=cls.ALL_YEARS)
+        by_year = {}
+        with transaction.atomic(using=using):
+            groups = (
+                CompanyDrive.objects.using(using)
+                .order_by()
+                .values("year_of_passing", "status")
+                .annotate(
+                    count=models.Count("id"), selects=models.Sum("no_of_selects")
+                )
+            )
+            for group in groups:
+                year = group["year_of_passing"]
+                column = cls.STATUS_COLUMNS[group["status"]]
+                year_counts = by_year.setdefault(year, cls(year_of_passing=year))
+                for counts in (totals, year_counts):
+                    setattr(counts, column, getattr(counts, column) + group["count"])
+                    counts.no_of_selects += group["selects"] or 0
+            cls.objects.using(using).all().delete()
+            cls.objects.using(using).bulk_create([totals, *by_year.values()])
+        return 1 + len(by_year)
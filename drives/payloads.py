@@ -0,0 +1,187 @@
+"""
+Validation of CompanyDrive create and update payloads.
+
+Shared by the single-row endpoints in drives.views, the bulk endpoint and
+the import_drives command so every write path applies the same rules. The
+rules are declared once in PAYLOAD_FIELDS and compiled against the model
+fields at import time: every field gets a cleaner that checks its type,
+length or choice set and converts it. A payload is checked in full before
+anything is reported, so clients see every field error at once.
+"""
+
+from datetime import date
+
+from .models import CompanyDrive
+
+# Payload fields and whether a create must supply them
+PAYLOAD_FIELDS = (
+    ("company_name", True),
+    ("point_of_contact", True),
+    ("year_of_passing", True),
+    ("job_received_date", True),
+    ("job_posted_date", True),
+    ("job_posted_by", True),
+    ("student_data_shared_date", False),
+    ("interview_date", False),
+    ("interview_posted_date", False),
+    ("results_declaration_status", False),
+    ("results_declaration_date", False),
+    ("no_of_selects", False),
+)
+
+# Lower bounds for integer fields beyond what the column type enforces
+MINIMUM_VALUES = {"no_of_selects": 0}
+
+DATE_MESSAGE = "must be a date in YYYY-MM-DD format"
+
+
+class DriveValidationError(ValueError):
+    """Raised with every field error of a drive payload, keyed by field name"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(
+            "; ".join(f"{field} {message}" for field, message in errors.items())
+        )
+
+
+def clean_date(value):
+    # date.fromisoformat also takes forms like 20240131 or 2024-W05-3, so the
+    # YYYY-MM-DD shape is checked first
+    if (
+        not isinstance(value, str)
+        or len(value) != 10
+        or value[4] != "-"
+        or value[7] != "-"
+    ):
+        raise ValueError(DATE_MESSAGE)
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(DATE_MESSAGE)
+
+
+def text_cleaner(max_length):
+    def clean(value):
+        if not isinstance(value, str):
+            raise ValueError("must be a string")
+        if len(value) > max_length:
+            raise ValueError(f"must be at most {max_length} characters")
+        return value
+
+    return clean
+
+
+def choice_cleaner(choices):
+    allowed = frozenset(value for value, _ in choices)
+    message = f"must be one of: {', '.join(value for value, _ in choices)}"
+
+    def clean(value):
+        if not isinstance(value, str) or value not in allowed:
+            raise ValueError(message)
+        return value
+
+    return clean
+
+
+def integer_cleaner(minimum=None):
+    def clean(value):
+        if isinstance(value, bool):
+            raise ValueError("must be an integer")
+        if not isinstance(value, int):
+            if not isinstance(value, str):
+                raise ValueError("must be an integer")
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError("must be an integer")
+        if minimum is not None and value < minimum:
+            raise ValueError(f"must be at least {minimum}")
+        return value
+
+    return clean
+
+
+def compile_cleaner(field):
+    """Cleaner for a CompanyDrive model field"""
+    field_type = field.get_internal_type()
+    if field_type == "DateField":
+        return clean_date
+    if field_type == "IntegerField":
+        return integer_cleaner(MINIMUM_VALUES.get(field.name))
+    if field.choices:
+        return choice_cleaner(field.choices)
+    return text_cleaner(field.max_length)
+
+
+class DriveSchema:
+    """
+    Precompiled validator for CompanyDrive payloads.
+
+    Empty values (None or "") leave optional fields unset on create and
+    clear nullable fields on update. Fields that are not nullable are never
+    cleared; an update sending them empty leaves them unchanged.
+    """
+
+    def __init__(self, fields):
+        self.rules = tuple(
+            (
+                name,
+                compile_cleaner(CompanyDrive._meta.get_field(name)),
+                required,
+                CompanyDrive._meta.get_field(name).null,
+            )
+            for name, required in fields
+        )
+
+    def validate(self, data, partial=False):
+        """
+        Return the cleaned values of ``data``, or raise DriveValidationError
+        listing every invalid field. ``partial`` validates an update, where
+        every field is optional.
+        """
+        if not isinstance(data, dict):
+            raise DriveValidationError({"payload": "must be an object"})
+        cleaned = {}
+        errors = {}
+        for name, clean, required, nullable in self.rules:
+            if name not in data:
+                if required and not partial:
+                    errors[name] = "is required"
+                continue
+            value = data[name]
+            if value is None or value == "":
+                if partial:
+                    if nullable:
+                        cleaned[name] = None
+                elif required:
+                    errors[name] = "is required"
+                continue
+            try:
+                cleaned[name] = clean(value)
+            except ValueError as e:
+                errors[name] = str(e)
+        if errors:
+            raise DriveValidationError(errors)
+        return cleaned
+
+
+DRIVE_SCHEMA = DriveSchema(PAYLOAD_FIELDS)
+
+
+def build_drive(data):
+    """Build an unsaved CompanyDrive from a create payload"""
+    return CompanyDrive(**DRIVE_SCHEMA.validate(data))
+
+
+def apply_drive_changes(drive, data):
+    """
+    Apply a partial update payload to ``drive`` in place.
+
+    Nothing is modified if any field is invalid. Returns the names of the
+    fields the payload touched.
+    """
+    cleaned = DRIVE_SCHEMA.validate(data, partial=True)
+    for name, value in cleaned.items():
+        setattr(drive, name, value)
+    return set(cleaned)
@@ -0,0 +1,84 @@
+"""
+Read-replica routing for the drive read endpoints.
+
+Views decorated with ``read_from_replica`` run their GET and HEAD requests
+against the ``settings.DRIVES_REPLICA_ALIAS`` database; everything else,
+writes and the queries of middleware included, stays on "default".
+ReplicaRouter (listed in DATABASE_ROUTERS) does the routing from a context
+variable, so it follows the views onto the async database threads.
+
+A replica lags behind the primary, and a read served from it right after a
+write would also be cached under the new drive generation. Every committed
+drive change therefore pins reads to the primary for
+DRIVES_REPLICA_PIN_SECONDS. The pin lives in the shared drives cache when
+one is configured; otherwise it is kept in the process's default cache and
+only covers the worker that made the change.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .cache import get_cache
+
+PIN_KEY = "drives:replica-pin"
+
+_read_alias = ContextVar("drives_read_alias", default=None)
+
+
+def replica_alias():
+    """The configured replica alias, or None without one"""
+    alias = getattr(settings, "DRIVES_REPLICA_ALIAS", "replica")
+    return alias if alias in settings.DATABASES else None
+
+
+def pin_cache():
+    cache = get_cache()
+    return cache if cache is not None else caches["default"]
+
+
+def pin_reads_to_primary():
+    if replica_alias() is not None:
+        pin_cache().set(
+            PIN_KEY, True, getattr(settings, "DRIVES_REPLICA_PIN_SECONDS", 5)
+        )
+
+
+def reads_pinned():
+    return pin_cache().get(PIN_KEY) is not None
+
+
+def read_from_replica(view_func):
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None or request.method not in ("GET", "HEAD") or reads_pinned():
+            return view_func(request, *args, **kwargs)
+        token = _read_alias.set(alias)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Sessions and users are read lazily inside the views too, and a
+        # lagging replica could miss a session that was just created
+        if model._meta.app_label == "drives":
+            return _read_alias.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        aliases = {"default", replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,205 @@
+"""
+Indexed text search and company-name autocomplete over drives.
+
+Production MySQL uses a FULLTEXT index over the searchable columns. Local
+SQLite databases get an FTS5 table kept in sync with drives_companydrive by
+triggers. Any other backend, or a SQLite build without FTS5, falls back to
+``icontains`` scans. Autocomplete is a range scan on a LOWER(company_name)
+index everywhere.
+"""
+
+import re
+
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.expressions import RawSQL
+from django.db.utils import OperationalError
+
+from .models import CompanyDrive
+
+SEARCH_COLUMNS = ("company_name", "point_of_contact", "job_posted_by")
+TABLE = CompanyDrive._meta.db_table
+FTS_TABLE = f"{TABLE}_fts"
+FULLTEXT_INDEX = "drive_search_ft"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TOKENS = 8
+
+_columns = ", ".join(SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{column}" for column in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{column}" for column in SEARCH_COLUMNS)
+
+SQLITE_FTS_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_columns}, content='{TABLE}', content_rowid='id', prefix='2 3')"
+)
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} "
+        f"BEGIN INSERT INTO {FTS_TABLE}(rowid, {_columns}) "
+        f"VALUES (new.id, {_new_values}); END"
+    ),
+    f"{FTS_TABLE}_ad": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} "
+        f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) "
+        f"VALUES ('delete', old.id, {_old_values}); END"
+    ),
+    f"{FTS_TABLE}_au": (
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+        f"AFTER UPDATE OF {_columns} ON {TABLE} "
+        f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) "
+        f"VALUES ('delete', old.id, {_old_values}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) "
+        f"VALUES (new.id, {_new_values}); END"
+    ),
+}
+
+# Backend chosen per database alias, resolved on first use
+_backends = {}
+
+
+def install_text_index(connection):
+    """
+    Create the text index for ``connection`` if it is missing.
+
+    Safe to run repeatedly. On SQLite, Django rebuilds a table from scratch
+    to alter it, which silently drops its triggers, so this also runs after
+    every migrate and re-indexes if a trigger had to be recreated.
+    """
+    _backends.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(
+                "SELECT 1 FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s "
+                "AND INDEX_NAME = %s",
+                [TABLE, FULLTEXT_INDEX],
+            )
+            if cursor.fetchone() is None:
+                cursor.execute(
+                    f"ALTER TABLE {TABLE} ADD FULLTEXT INDEX {FULLTEXT_INDEX} "
+                    f"({_columns})"
+                )
+        elif connection.vendor == "sqlite":
+            try:
+                cursor.execute(SQLITE_FTS_TABLE)
+            except OperationalError:
+                # SQLite compiled without FTS5: search uses the fallback
+                return
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = %s",
+                [TABLE],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(SQLITE_TRIGGERS[name])
+            if missing:
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+                )
+
+
+def remove_text_index(connection):
+    _backends.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        if connection.vendor == "mysql":
+            cursor.execute(f"ALTER TABLE {TABLE} DROP INDEX {FULLTEXT_INDEX}")
+        elif connection.vendor == "sqlite":
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def ensure_text_index(sender, using, **kwargs):
+    """post_migrate receiver reinstating the index after table rebuilds"""
+    connection = connections[using]
+    if TABLE in connection.introspection.table_names():
+        install_text_index(connection)
+
+
+def search_backend(using="default"):
+    """Return 'mysql', 'fts5' or 'fallback' for the given database alias"""
+    if using not in _backends:
+        connection = connections[using]
+        backend = "fallback"
+        if connection.vendor == "mysql":
+            backend = "mysql"
+        elif (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        ):
+            backend = "fts5"
+        _backends[using] = backend
+    return _backends[using]
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query)[:MAX_TOKENS]
+
+
+def search_drives(queryset, query):
+    """Filter ``queryset`` to drives whose text columns match every term"""
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset.none()
+
+    backend = search_backend(queryset.db)
+    if backend == "mysql":
+        match = " ".join(f"+{token}*" for token in tokens)
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT id FROM {TABLE} WHERE MATCH({_columns}) "
+                "AGAINST (%s IN BOOLEAN MODE)",
+                [match],
+            )
+        )
+    if backend == "fts5":
+        match = " ".join(f'"{token}"*' for token in tokens)
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        )
+
+    condition = Q()
+    for token in tokens:
+        condition &= (
+            Q(company_name__icontains=token)
+            | Q(point_of_contact__icontains=token)
+            | Q(job_posted_by__icontains=token)
+        )
+    return queryset.filter(condition)
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every string starting with ``prefix``"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def autocomplete_company_names(prefix, limit=10, using=None):
+    """
+    Distinct company names starting with ``prefix``, case-insensitively.
+
+    The prefix becomes a range on LOWER(company_name), which both MySQL and
+    SQLite answer from the functional index in name order, so the query
+    stops after ``limit`` names however many drives share the prefix.
+    Without ``using``, the names are read from the database the router
+    picks, the replica inside a replica-routed view.
+    """
+    prefix = prefix.strip().lower()
+    if not prefix:
+        return []
+
+    if using is None:
+        using = router.db_for_read(CompanyDrive)
+    return list(
+        CompanyDrive.objects.using(using)
+        .annotate(name_lower=Lower("company_name"))
+        .filter(name_lower__gte=prefix, name_lower__lt=prefix_upper_bound(prefix))
+        .order_by("name_lower")
+        .values_list("company_name", flat=True)
+        .distinct()[:limit]
+    )
@@ -0,0 +1,272 @@
+"""
+Serialization of CompanyDrive rows for the drive API.
+
+List endpoints read ``values_list()`` tuples straight from the database and
+never build model instances; each view declares the (output key, ORM lookup)
+pairs it returns. Each field spec is compiled once into the tuple index and
+date converter of every field, so a row is serialized without looking any of
+them up again.
+``serialize_drive`` remains for the write paths, which already hold an
+instance.
+
+Responses are encoded with orjson when it is installed and with the standard
+library encoder otherwise.
+"""
+
+import json
+from functools import lru_cache
+from operator import attrgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+from jobMonitoringApp.metrics import timed
+
+from .models import CompanyDrive
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+DATE_FIELDS = frozenset(
+    field.name
+    for field in CompanyDrive._meta.get_fields()
+    if field.get_internal_type() in ("DateField", "DateTimeField")
+)
+
+# Basic details for list views
+LIST_FIELDS = (
+    ("id", "id"),
+    ("company_name", "company_name"),
+    ("point_of_contact", "point_of_contact"),
+    ("year_of_passing", "year_of_passing"),
+    ("interview_date", "interview_date"),
+    ("job_posted_by", "job_posted_by"),
+    ("job_received_date", "job_received_date"),
+    ("results_declaration_status", "results_declaration_status"),
+    ("status", "status"),
+)
+
+# Full details for single drive view; the usernames are joined in the same query
+DETAIL_FIELDS = (
+    ("id", "id"),
+    ("company_name", "company_name"),
+    ("point_of_contact", "point_of_contact"),
+    ("year_of_passing", "year_of_passing"),
+    ("job_received_date", "job_received_date"),
+    ("job_posted_date", "job_posted_date"),
+    ("job_posted_by", "job_posted_by"),
+    ("student_data_shared_date", "student_data_shared_date"),
+    ("interview_date", "interview_date"),
+    ("interview_posted_date", "interview_posted_date"),
+    ("results_declaration_status", "results_declaration_status"),
+    ("results_declaration_date", "results_declaration_date"),
+    ("no_of_selects", "no_of_selects"),
+    ("status", "status"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+    ("version", "version"),
+    ("created_by", "created_by__username"),
+    ("updated_by", "updated_by__username"),
+)
+
+IN_PROGRESS_FIELDS = (
+    ("id", "id"),
+    ("company_name", "company_name"),
+    ("point_of_contact", "point_of_contact"),
+    ("interview_date", "interview_date"),
+    ("job_posted_by", "job_posted_by"),
+    ("results_declaration_status", "results_declaration_status"),
+)
+
+PENDING_FIELDS = (
+    ("id", "id"),
+    ("company_name", "company_name"),
+    ("point_of_contact", "point_of_contact"),
+    ("year_of_passing", "year_of_passing"),
+    ("job_received_date", "job_received_date"),
+    ("job_posted_by", "job_posted_by"),
+    ("results_declaration_status", "results_declaration_status"),
+)
+
+COMPLETED_FIELDS = (
+    ("id", "id"),
+    ("company_name", "company_name"),
+    ("point_of_contact", "point_of_contact"),
+    ("interview_date", "interview_date"),
+    ("results_declaration_date", "results_declaration_date"),
+    ("no_of_selects", "no_of_selects"),
+)
+
+
+# Every field a client may request through ?fields=
+FIELD_WHITELIST = dict(DETAIL_FIELDS)
+
+
+class InvalidFieldsRequest(ValueError):
+    """Raised when ?fields= names a field outside FIELD_WHITELIST"""
+
+
+def requested_fields(params, default):
+    """
+    Field spec for the ``fields`` query parameter, or ``default`` without it.
+
+    Only the requested columns are projected by values(), so a dropdown
+    asking for ``fields=id,company_name,status`` reads just those three.
+    """
+    value = params.get("fields")
+    if value is None:
+        return default
+    names = [name.strip() for name in value.split(",")]
+    names = list(dict.fromkeys(name for name in names if name))
+    if not names:
+        raise InvalidFieldsRequest("fields must name at least one field")
+    unknown = [name for name in names if name not in FIELD_WHITELIST]
+    if unknown:
+        raise InvalidFieldsRequest(
+            f"Unknown field(s): {', '.join(unknown)}. "
+            f"Allowed fields: {', '.join(FIELD_WHITELIST)}"
+        )
+    return tuple((name, FIELD_WHITELIST[name]) for name in names)
+
+
+def lookups(fields, *extra):
+    """
+    ORM lookups to pass to values_list() for a field spec, plus ``extra`` ones.
+
+    The spec's own lookups come first, so serialize_rows can ignore trailing
+    extra columns.
+    """
+    return list(dict.fromkeys([lookup for _, lookup in fields] + list(extra)))
+
+
+def related_username(name):
+    def get(drive):
+        user = getattr(drive, name)
+        return user.username if user else None
+
+    return get
+
+
+def format_date(value):
+    return value.isoformat() if value else None
+
+
+class CompiledFields:
+    """
+    A field spec reduced to what serializing one row needs.
+
+    ``columns`` holds one ``(key, index, converter)`` triple per field, where
+    ``index`` is the field's position in the values_list() tuple and
+    ``converter`` formats dates and is None for every other field, so the
+    per-row work is a single comprehension over precomputed triples.
+    """
+
+    __slots__ = ("keys", "columns", "getters")
+
+    def __init__(self, fields):
+        self.keys = tuple(key for key, _ in fields)
+        self.columns = tuple(
+            (key, index, format_date if lookup in DATE_FIELDS else None)
+            for index, (key, lookup) in enumerate(fields)
+        )
+        # Attribute access for model instances, where "created_by__username"
+        # becomes a null-safe read of drive.created_by.username
+        self.getters = tuple(
+            related_username(key) if lookup.endswith("__username")
+            else attrgetter(lookup)
+            for key, lookup in fields
+        )
+
+    def to_dict(self, row):
+        """Serialize one values_list() tuple as an API dict"""
+        return {
+            key: row[index] if converter is None else converter(row[index])
+            for key, index, converter in self.columns
+        }
+
+    def convert(self, row):
+        """Format one values_list() tuple's columns, keeping it a tuple"""
+        return tuple(
+            row[index] if converter is None else converter(row[index])
+            for _, index, converter in self.columns
+        )
+
+
+@lru_cache(maxsize=256)
+def compile_fields(fields):
+    """
+    Compiled form of a field spec, memoized per spec.
+
+    The specs declared in this module are compiled at import time; specs
+    built from ?fields= are compiled on first use.
+    """
+    return CompiledFields(fields)
+
+
+for _fields in (
+    LIST_FIELDS,
+    DETAIL_FIELDS,
+    IN_PROGRESS_FIELDS,
+    PENDING_FIELDS,
+    COMPLETED_FIELDS,
+):
+    compile_fields(_fields)
+
+
+def serialize_row(row, fields):
+    """Convert one values_list() row into the API representation"""
+    with timed("serialize"):
+        return compile_fields(fields).to_dict(row)
+
+
+def serialize_rows(rows, fields):
+    """Convert an iterable of values_list() rows into a list of API dicts"""
+    with timed("serialize"):
+        return list(map(compile_fields(fields).to_dict, rows))
+
+
+def serialize_queryset(queryset, fields):
+    """Project ``queryset`` onto ``fields`` and serialize without model instances"""
+    return serialize_rows(queryset.values_list(*lookups(fields)), fields)
+
+
+def serialize_drive(drive, detailed=True):
+    """
+    Convert drive model instance to dictionary.
+
+    Callers serializing with ``detailed=True`` should load the drive with
+    ``select_related("created_by", "updated_by")`` to avoid two extra queries.
+    """
+    compiled = compile_fields(DETAIL_FIELDS if detailed else LIST_FIELDS)
+    return compiled.to_dict(tuple(get(drive) for get in compiled.getters))
+
+
+def dumps_stdlib(data):
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+JSON_BACKENDS = {"json": dumps_stdlib}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = orjson.dumps
+
+# Serialized payloads only hold JSON-native values, so both backends produce
+# equivalent documents
+dumps = JSON_BACKENDS["orjson" if orjson is not None else "json"]
+
+
+class DriveJsonResponse(HttpResponse):
+    """JsonResponse counterpart encoding with the fastest available backend"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        with timed("encode"):
+            content = dumps(data)
+        super().__init__(content=content, **kwargs)
+
+
+def iter_ndjson(rows, keys):
+    """Encode already converted row tuples as newline-delimited JSON objects"""
+    for row in rows:
+        yield dumps(dict(zip(keys, row))) + b"\n"
@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from .cache import bump_generation
+from .live import created_event, deleted_event, publish_changes, updated_event
+from .models import CompanyDrive, DriveStatusCounts
+from .routers import pin_reads_to_primary
+
+# bulk_create/bulk_update bypass post_save, so the bulk write paths send this
+# once per batch with the ``created`` and ``updated`` drive lists.
+drives_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=CompanyDrive)
+@receiver(post_delete, sender=CompanyDrive)
+@receiver(drives_bulk_changed, sender=CompanyDrive)
+def invalidate_drive_responses(sender, **kwargs):
+    """Drop cached drive responses once the change is visible to readers"""
+    # Pin first, so no response rebuilt under the new generation comes from a
+    # replica that has not seen the change yet
+    transaction.on_commit(pin_reads_to_primary)
+    transaction.on_commit(bump_generation)
+
+
+@receiver(pre_delete, sender=CompanyDrive)
+def count_deleted_drive(sender, instance, using, **kwargs):
+    """
+    Runs inside the deletion transaction, for queryset deletes as well. Like
+    save(), it counts the row as stored and locks it until the delete
+    commits: the instance may be stale or loaded with deferred fields.
+    """
+    old_state = instance.stored_counted_state(using, lock=True)
+    DriveStatusCounts.apply_changes([(old_state, None)], using)
+
+
+@receiver(drives_bulk_changed, sender=CompanyDrive)
+def count_bulk_changes(sender, created=(), updated=(), using="default", **kwargs):
+    """
+    Updated drives must carry the ``_counted_state`` snapshot of the row they
+    overwrite, as instances loaded from the database do.
+    """
+    changes = [(None, drive.counted_state()) for drive in created]
+    changes += [
+        (getattr(drive, "_counted_state", None), drive.counted_state())
+        for drive in updated
+    ]
+    DriveStatusCounts.apply_changes(changes, using)
+    for drive in [*created, *updated]:
+        drive._counted_state = drive.counted_state()
+
+
+@receiver(post_save, sender=CompanyDrive)
+def push_saved_drive(sender, instance, created, update_fields, using, **kwargs):
+    if created:
+        event = created_event(instance)
+    else:
+        fields = instance.changed_fields()
+        if fields is None and update_fields is not None:
+            fields = list(update_fields)
+        event = updated_event(instance, fields)
+    publish_changes([event], using)
+
+
+@receiver(post_delete, sender=CompanyDrive)
+def push_deleted_drive(sender, instance, using, **kwargs):
+    publish_changes([deleted_event(instance.pk)], using)
+
+
+@receiver(drives_bulk_changed, sender=CompanyDrive)
+def push_bulk_changes(sender, created=(), updated=(), using="default", **kwargs):
+    changes = [created_event(drive) for drive in created]
+    for drive in updated:
+        changes.append(updated_event(drive))
+        drive.snapshot_values()
+    publish_changes(changes, using)
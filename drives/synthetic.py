@@ -0,0 +1,280 @@
+"""
+Deterministic synthetic drives for benchmarks and local development.
+
+``generate_drive_rows`` yields the column values of drives whose dates follow
+the drive lifecycle (job received -> posted -> student data shared ->
+interview posted -> interview -> results) and whose status is the one
+CompanyDrive.derive_status() implies. Older cohorts are mostly completed and
+the latest one is still largely pending, as in a real placement season.
+Every value comes from a ``random.Random`` seeded by the caller, timestamps
+included, so the same seed always produces the same rows.
+
+``insert_drive_rows`` writes them with plain multi-row INSERTs. bulk_create()
+would run each field's pre_save(), which replaces the generated created_at
+and updated_at with the current time.
+"""
+
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from itertools import accumulate, islice
+from operator import itemgetter
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections
+
+from accounts.models import PlacementStaff, StaffRank
+
+from .models import CompanyDrive
+
+# fmt: off
+COMPANY_PREFIXES = [
+    "Apex", "Bright", "Cloud", "Delta", "Ever", "Fusion", "Global", "Horizon",
+    "Infinite", "Job", "Kite", "Lumen", "Meridian", "Nova", "Orbit", "Pioneer",
+    "Quantum", "River", "Summit", "Terra", "Unity", "Vertex", "Wave", "Zenith",
+]
+COMPANY_SUFFIXES = [
+    "Analytics", "Bank", "Consulting", "Dynamics", "Electronics", "Finance",
+    "Health", "Infotech", "Labs", "Logistics", "Motors", "Networks", "Pharma",
+    "Retail", "Robotics", "Software", "Solutions", "Systems", "Technologies",
+]
+FIRST_NAMES = [
+    "Aarav", "Ananya", "Arjun", "Divya", "Ishaan", "Kavya", "Meera", "Nikhil",
+    "Priya", "Rahul", "Rohan", "Sneha", "Tanvi", "Varun", "Vikram", "Zoya",
+]
+LAST_NAMES = [
+    "Iyer", "Kapoor", "Khan", "Menon", "Nair", "Patel", "Rao", "Reddy",
+    "Sharma", "Singh", "Varma",
+]
+# fmt: on
+
+# (level, name) of the seeded staff ranks
+STAFF_RANKS = [
+    (1, "Placement Officer"),
+    (2, "Placement Coordinator"),
+    (3, "Student Coordinator"),
+]
+DEPARTMENTS = ["CSE", "ECE", "EEE", "MECH", "CIVIL", "IT"]
+
+# Relative weights of (PENDING, IN_PROGRESS, COMPLETED) by how many years a
+# cohort is before the latest one
+STAGE_WEIGHTS = {0: (35, 40, 25), 1: (10, 30, 60)}
+PAST_STAGE_WEIGHTS = (3, 7, 90)
+STAGES = ("PENDING", "IN_PROGRESS", "COMPLETED")
+UNDECLARED_RESULTS = ("NOT_STARTED", "IN_PROCESS", "PENDING")
+
+# Inserted columns, in the order of the generated rows
+COLUMNS = [
+    field for field in CompanyDrive._meta.concrete_fields if not field.primary_key
+]
+DEFAULTS = {field.attname: field.get_default() for field in COLUMNS}
+
+
+def person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def create_staff(count, seed, password=None):
+    """
+    Create (or reuse) ``count`` placement staff users named staff1..staffN
+    across the STAFF_RANKS, returning the users.
+    """
+    rng = random.Random(seed)
+    ranks = [
+        StaffRank.objects.get_or_create(level=level, defaults={"name": name})[0]
+        for level, name in STAFF_RANKS
+    ]
+    # Hashing is deliberately slow, so every user shares one hash
+    encoded = make_password(password)
+    usernames = [f"staff{i}" for i in range(1, count + 1)]
+    users = []
+    for username in usernames:
+        first_name, last_name = person_name(rng).split()
+        users.append(
+            User(
+                username=username,
+                first_name=first_name,
+                last_name=last_name,
+                email=f"{username}@example.com",
+                password=encoded,
+            )
+        )
+    User.objects.bulk_create(users, ignore_conflicts=True)
+    users = list(User.objects.filter(username__in=usernames).order_by("id"))
+    PlacementStaff.objects.bulk_create(
+        [
+            PlacementStaff(
+                user=user,
+                rank=ranks[min(i, len(ranks) - 1)],
+                department=rng.choice(DEPARTMENTS),
+                contact_number=f"9{rng.randrange(10**9):09d}",
+            )
+            for i, user in enumerate(users)
+        ],
+        ignore_conflicts=True,
+    )
+    return users
+
+
+def generate_drive_rows(rows, seed, users, last_year=2026, cohorts=10):
+    """
+    Yield ``rows`` tuples of COLUMNS values, for drives spread over
+    ``cohorts`` years of passing
+    """
+    rng = random.Random(seed)
+    rand = rng.random
+
+    def pick(options):
+        return options[int(rand() * len(options))]
+
+    def between(low, high):
+        return int(rand() * (high - low + 1)) + low
+
+    companies = [
+        f"{prefix} {suffix}"
+        for prefix in COMPANY_PREFIXES
+        for suffix in COMPANY_SUFFIXES
+    ]
+    contacts = [person_name(rng) for _ in range(200)]
+    posters = [user.get_full_name() or user.username for user in users]
+    posters = posters or ["Placement Cell"]
+    user_ids = [user.pk for user in users] or [None]
+    # Recruiting for a cohort runs from July to April of its final year
+    season_starts = {
+        year: date(year - 1, 7, 1).toordinal()
+        for year in range(last_year - cohorts + 1, last_year + 1)
+    }
+    # Cumulative weights, which choices() would otherwise recompute per row
+    stage_weights = {
+        year: list(accumulate(STAGE_WEIGHTS.get(last_year - year, PAST_STAGE_WEIGHTS)))
+        for year in season_starts
+    }
+    midnights = {}
+
+    def timestamp(ordinal):
+        """A time during office hours on the day ``ordinal``, in UTC"""
+        if ordinal not in midnights:
+            midnights[ordinal] = datetime.combine(
+                date.fromordinal(ordinal), time(), tzinfo=timezone.utc
+            )
+        seconds = between(9 * 3600, 18 * 3600 - 1)
+        return midnights[ordinal] + timedelta(seconds=seconds)
+
+    values = itemgetter(*(field.attname for field in COLUMNS))
+    for _ in range(rows):
+        year = last_year - int(rand() * cohorts)
+        stage = rng.choices(STAGES, cum_weights=stage_weights[year])[0]
+        received = season_starts[year] + between(0, 300)
+        posted = received + between(0, 5)
+        creator = pick(user_ids)
+        row = {
+            **DEFAULTS,
+            "company_name": pick(companies),
+            "point_of_contact": pick(contacts),
+            "year_of_passing": year,
+            "job_received_date": date.fromordinal(received),
+            "job_posted_date": date.fromordinal(posted),
+            "job_posted_by": pick(posters),
+            "created_by_id": creator,
+            "updated_by_id": creator,
+            # The fields set below for each stage are exactly the ones
+            # derive_status() looks at, so the stage is the derived status
+            "status": stage,
+        }
+        last_change = posted
+        if stage != "PENDING" or rand() < 0.25:
+            last_change += between(2, 10)
+            row["student_data_shared_date"] = date.fromordinal(last_change)
+        if stage != "PENDING":
+            last_change += between(1, 7)
+            interview = last_change + between(3, 14)
+            row["interview_posted_date"] = date.fromordinal(last_change)
+            row["interview_date"] = date.fromordinal(interview)
+            row["results_declaration_status"] = pick(UNDECLARED_RESULTS)
+        if stage == "COMPLETED":
+            last_change = interview + between(1, 21)
+            row["results_declaration_status"] = "DECLARED"
+            row["results_declaration_date"] = date.fromordinal(last_change)
+            row["no_of_selects"] = min(int(rng.expovariate(1 / 6)), 60)
+            row["updated_by_id"] = pick(user_ids)
+        row["created_at"] = timestamp(received)
+        # Both can fall on the same day
+        row["updated_at"] = max(row["created_at"], timestamp(last_change))
+        yield values(row)
+
+
+def insert_drive_rows(rows, batch_size=5000, using="default"):
+    """
+    INSERT the COLUMNS tuples of ``rows`` in batches of ``batch_size``.
+
+    Returns the number of rows inserted. The drive counters and change
+    signals are skipped, as with bulk_create().
+    """
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote_name(CompanyDrive._meta.db_table),
+        ", ".join(quote_name(field.column) for field in COLUMNS),
+        ", ".join(["%s"] * len(COLUMNS)),
+    )
+    # Only dates need converting to what the backend stores. The drives of
+    # a few years share a few thousand distinct days, so those conversions
+    # are memoized.
+    adapt_date = lru_cache(maxsize=None)(connection.ops.adapt_datefield_value)
+    adapters = {
+        "DateField": adapt_date,
+        "DateTimeField": connection.ops.adapt_datetimefield_value,
+    }
+    converted = [
+        (index, adapters[field.get_internal_type()])
+        for index, field in enumerate(COLUMNS)
+        if field.get_internal_type() in adapters
+    ]
+    rows = iter(rows)
+    inserted = 0
+    with connection.cursor() as cursor:
+        while True:
+            batch = [list(row) for row in islice(rows, batch_size)]
+            if not batch:
+                break
+            for row in batch:
+                for index, convert in converted:
+                    row[index] = convert(row[index])
+            cursor.executemany(sql, batch)
+            inserted += len(batch)
+    return inserted
+
+
+@contextmanager
+def deferred_indexes(using="default"):
+    """
+    On SQLite, drop the drive indexes and the search index for the enclosed
+    bulk load and build them once at the end, which is several times faster
+    than updating them row by row. Other backends keep their indexes. Run it
+    inside a transaction, so a failed load also rolls back the dropped
+    indexes.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        yield
+        return
+    from .search import install_text_index, remove_text_index
+
+    with connection.cursor() as cursor:
+        # Automatic indexes backing constraints have no SQL and stay
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = %s AND sql IS NOT NULL",
+            [CompanyDrive._meta.db_table],
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+    remove_text_index(connection)
+    yield
+    with connection.cursor() as cursor:
+        for _, sql in indexes:
+            cursor.execute(sql)
+    install_text_index(connection)
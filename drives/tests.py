@@ -1,3 +1,1079 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, datetime, timezone
+from functools import partial
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, connections, router, transaction
+from django.http import StreamingHttpResponse
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .cache import cache_stats, current_generation, get_cache
+from .export import EXPORT_FIELDS, export_stream
+from .live import DRIVE_CHANGES_GROUP, created_event, publish_changes
+from .models import CompanyDrive, DriveStatusCounts
+from .routers import PIN_KEY, ReplicaRouter, pin_cache, replica_alias
+from .views import MAX_BULK_ROWS
+
+
+def clear_drive_cache():
+    cache = get_cache()
+    if cache is not None:
+        cache.clear()
+
+# The plans are checked on the default connection, so keep reads there
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DriveQueryPlanTests(TestCase):
+    """
+    Run each read endpoint, EXPLAIN the SQL it actually issued and check the
+    plan uses the expected index instead of a full-table sort.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(20):
+            CompanyDrive.objects.create(
+                company_name=f"Company {i}",
+                point_of_contact="Contact",
+                year_of_passing=2024 + i % 3,
+                job_received_date=date(2024, 1, 1),
+                job_posted_date=date(2024, 1, 2),
+                job_posted_by="Placement Cell",
+                student_data_shared_date=date(2024, 1, 5) if i % 2 else None,
+                interview_date=date(2024, 1, 10) if i % 2 else None,
+            )
+
+    def setUp(self):
+        if connection.vendor not in ("sqlite", "mysql"):
+            self.skipTest("Query plan checks only run on SQLite and MySQL")
+        # Cached responses would hide the queries under test
+        clear_drive_cache()
+
+    def drive_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        table = CompanyDrive._meta.db_table
+        queries = [q["sql"] for q in ctx.captured_queries if table in q["sql"]]
+        return response, queries
+
+    def explain(self, sql, params=()):
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+        return "\n".join(" ".join(str(col) for col in row) for row in rows)
+
+    def assertIndexBacked(self, sql, index_name, params=()):
+        plan = self.explain(sql, params)
+        self.assertIn(index_name, plan, f"{sql}\n{plan}")
+        sort_marker = "TEMP B-TREE" if connection.vendor == "sqlite" else "filesort"
+        self.assertNotIn(sort_marker, plan, f"{sql}\n{plan}")
+
+    def assertEndpointIndexBacked(self, url, index_name):
+        response, queries = self.drive_queries(url)
+        self.assertTrue(queries, f"{url} issued no drive queries")
+        for sql in queries:
+            if "ORDER BY" in sql:
+                self.assertIndexBacked(sql, index_name)
+        return response
+
+    def test_status_endpoints_use_status_created_index(self):
+        for url in (
+            "/api/drives/in-progress/",
+            "/api/drives/pending/",
+            "/api/drives/completed/",
+        ):
+            with self.subTest(url=url):
+                self.assertEndpointIndexBacked(url, "drive_status_created_idx")
+
+    def test_drive_list_uses_created_index(self):
+        self.assertEndpointIndexBacked("/api/drives/", "drive_created_id_idx")
+
+    def test_drive_list_pages_use_created_index(self):
+        first = self.assertEndpointIndexBacked(
+            "/api/drives/?limit=5", "drive_created_id_idx"
+        )
+        cursor = first.json()["next_cursor"]
+        self.assertEndpointIndexBacked(
+            f"/api/drives/?limit=5&cursor={cursor}", "drive_created_id_idx"
+        )
+
+    def test_year_and_interview_date_lookups_are_indexed(self):
+        for queryset, index_name in (
+            (
+                CompanyDrive.objects.filter(year_of_passing=2024, status="PENDING"),
+                "drive_year_status_idx",
+            ),
+            (
+                CompanyDrive.objects.filter(interview_date__gte=date(2024, 1, 1)),
+                "drive_interview_date_idx",
+            ),
+        ):
+            sql, params = queryset.query.sql_with_params()
+            with self.subTest(index=index_name):
+                self.assertIndexBacked(sql, index_name, params)
+
+    def test_autocomplete_uses_lower_company_index(self):
+        response, queries = self.drive_queries(
+            "/api/drives/search/?mode=autocomplete&q=comp"
+        )
+        self.assertEqual(len(response.json()["suggestions"]), 20)
+        self.assertIn("drive_company_lower_idx", self.explain(queries[0]))
+
+
+def make_drive(company_name, using="default"):
+    return CompanyDrive.objects.using(using).create(
+        company_name=company_name,
+        point_of_contact="Contact",
+        year_of_passing=2024,
+        job_received_date=date(2024, 1, 1),
+        job_posted_date=date(2024, 1, 2),
+        job_posted_by="Placement Cell",
+    )
+
+
+@skipUnless(replica_alias(), "needs the replica of jobMonitoringApp.test_settings")
+class ReplicaRoutingTests(TestCase):
+    """
+    Run with jobMonitoringApp.test_settings, whose primary and replica are
+    separate SQLite databases: a drive only present in one of them shows
+    where a request read from.
+    """
+
+    databases = {"default", replica_alias()} - {None}
+
+    @classmethod
+    def setUpTestData(cls):
+        make_drive("Primary Co")
+        cls.replica_drive = make_drive("Replica Co", using="replica")
+
+    def setUp(self):
+        clear_drive_cache()
+        pin_cache().delete(PIN_KEY)
+
+    def listed_companies(self, url="/api/drives/", key="drives"):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [drive["company_name"] for drive in response.json()[key]]
+
+    def test_drive_reads_go_to_replica(self):
+        with CaptureQueriesContext(connections["replica"]) as ctx:
+            self.assertEqual(self.listed_companies(), ["Replica Co"])
+            self.assertEqual(
+                self.listed_companies("/api/drives/pending/", "pending_drives"),
+                ["Replica Co"],
+            )
+        self.assertTrue(ctx.captured_queries)
+        # Both databases numbered their only drive 1
+        response = self.client.get(f"/api/drives/{self.replica_drive.pk}/")
+        self.assertEqual(response.json()["drive"]["company_name"], "Replica Co")
+
+    def test_search_reads_go_to_replica(self):
+        def search(**params):
+            return self.client.get("/api/drives/search/", params).json()
+
+        drives = search(q="co")["drives"]
+        self.assertEqual([drive["company_name"] for drive in drives], ["Replica Co"])
+        self.assertEqual(
+            search(q="rep", mode="autocomplete")["suggestions"], ["Replica Co"]
+        )
+        self.assertEqual(search(q="pri", mode="autocomplete")["suggestions"], [])
+
+    def test_writes_and_other_apps_stay_on_primary(self):
+        # The router only answers inside a replica-routed view
+        self.assertIsNone(ReplicaRouter().db_for_read(CompanyDrive))
+        self.assertEqual(router.db_for_write(CompanyDrive), "default")
+        self.assertEqual(router.db_for_read(User), "default")
+
+    def test_committed_change_pins_reads_to_primary(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            make_drive("New Co")
+        self.assertEqual(
+            sorted(self.listed_companies()), ["New Co", "Primary Co"]
+        )
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DriveKeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        drives = [make_drive(f"Company {i}") for i in range(7)]
+        # Three created_at values, so most pages end inside a tie
+        for i, drive in enumerate(drives):
+            CompanyDrive.objects.filter(pk=drive.pk).update(
+                created_at=datetime(2024, 1, 1 + i // 3, tzinfo=timezone.utc)
+            )
+
+    def page(self, **params):
+        response = self.client.get("/api/drives/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def traverse(self, **params):
+        ids, cursor = [], None
+        while True:
+            if cursor:
+                params["cursor"] = cursor
+            body = self.page(limit=2, **params)
+            self.assertLessEqual(len(body["drives"]), 2)
+            ids += [drive["id"] for drive in body["drives"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return ids
+
+    def test_traversal_has_no_duplicates_or_skips(self):
+        ordered = CompanyDrive.objects.values_list("id", flat=True)
+        self.assertEqual(
+            self.traverse(), list(ordered.order_by("-created_at", "-id"))
+        )
+        self.assertEqual(
+            self.traverse(order="desc"), list(ordered.order_by("-created_at", "-id"))
+        )
+        self.assertEqual(
+            self.traverse(order="asc"), list(ordered.order_by("created_at", "id"))
+        )
+
+    def test_count_modes(self):
+        self.assertNotIn("count", self.page(limit=2))
+        self.assertNotIn("count", self.page(limit=2, count="none"))
+        self.assertEqual(self.page(limit=2, count="exact")["count"], 7)
+        body = self.page(limit=2, count="approx")
+        # SQLite has no row estimate and falls back to an exact count
+        self.assertEqual(body["count"], 7)
+        self.assertIs(body["count_is_approximate"], True)
+
+    def test_invalid_requests_are_rejected(self):
+        tampered = base64.urlsafe_b64encode(b"2024-01-01|not-an-id").decode()
+        for params in (
+            {"cursor": "not a cursor"},
+            {"cursor": tampered},
+            {"cursor": base64.urlsafe_b64encode(b"\xff\xfe").decode()},
+            {"limit": "0"},
+            {"limit": "ten"},
+            {"limit": "2", "count": "all"},
+            {"limit": "2", "order": "sideways"},
+        ):
+            with self.subTest(**params):
+                response = self.client.get("/api/drives/", params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["status"], "error")
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DriveExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            make_drive(f"Company {i}")
+        CompanyDrive.objects.filter(company_name__in=["Company 1", "Company 3"]).update(
+            status="COMPLETED", year_of_passing=2025
+        )
+        CompanyDrive.objects.filter(company_name="Company 4").update(
+            year_of_passing=2025
+        )
+
+    def export(self, **params):
+        """The response and its body, read two rows per keyset batch"""
+        small_batches = partial(export_stream, chunk_size=2)
+        with mock.patch("drives.views.export_stream", small_batches):
+            response = self.client.get("/api/drives/export/", params)
+            with CaptureQueriesContext(connection) as ctx:
+                body = b"".join(response.streaming_content).decode()
+        return response, body, len(ctx.captured_queries)
+
+    def test_csv_streams_every_row_in_batches(self):
+        response, body, queries = self.export()
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="drives.csv"'
+        )
+        header, *rows = csv.reader(io.StringIO(body))
+        self.assertEqual(header, [key for key, _ in EXPORT_FIELDS])
+        self.assertEqual(
+            [row[header.index("company_name")] for row in rows],
+            [f"Company {i}" for i in range(5)],
+        )
+        # 2 + 2 + 1 rows
+        self.assertEqual(queries, 3)
+
+    def test_ndjson_streams_every_row_in_batches(self):
+        response, body, queries = self.export(format="ndjson")
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        drives = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(
+            [drive["company_name"] for drive in drives],
+            [f"Company {i}" for i in range(5)],
+        )
+        self.assertEqual(set(drives[0]), {key for key, _ in EXPORT_FIELDS})
+        self.assertEqual(queries, 3)
+
+    def test_filters(self):
+        for params, expected in (
+            ({"status": "COMPLETED"}, ["Company 1", "Company 3"]),
+            ({"year_of_passing": "2025"}, ["Company 1", "Company 3", "Company 4"]),
+            ({"status": "PENDING", "year_of_passing": "2025"}, ["Company 4"]),
+        ):
+            with self.subTest(**params):
+                _, body, _ = self.export(format="ndjson", **params)
+                self.assertEqual(
+                    [json.loads(line)["company_name"] for line in body.splitlines()],
+                    expected,
+                )
+
+    def test_invalid_requests_are_rejected(self):
+        for params in (
+            {"format": "xml"},
+            {"status": "UNKNOWN"},
+            {"year_of_passing": "soon"},
+        ):
+            with self.subTest(**params):
+                response = self.client.get("/api/drives/export/", params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()["status"], "error")
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DriveFieldSelectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.drive = make_drive("Acme")
+
+    def get(self, url, **params):
+        """The JSON body and the SELECT lists of the queries that read drives"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        selects = [
+            query["sql"].split(" FROM ")[0]
+            for query in ctx.captured_queries
+            if CompanyDrive._meta.db_table in query["sql"]
+            and "MAX(" not in query["sql"].upper()
+        ]
+        return response.json(), selects
+
+    def test_subset_payload_and_columns(self):
+        for url, key, params in (
+            ("/api/drives/", "drives", {}),
+            ("/api/drives/", "drives", {"limit": "1"}),
+            ("/api/drives/pending/", "pending_drives", {}),
+        ):
+            with self.subTest(url=url, **params):
+                body, selects = self.get(url, fields="company_name,status", **params)
+                self.assertEqual(
+                    body[key], [{"company_name": "Acme", "status": "PENDING"}]
+                )
+                (select,) = selects
+                self.assertIn('"company_name"', select)
+                self.assertIn('"status"', select)
+                for column in ("point_of_contact", "job_posted_by", "interview_date"):
+                    self.assertNotIn(f'"{column}"', select)
+
+    def test_detail_fields_join_only_when_asked(self):
+        url = f"/api/drives/{self.drive.pk}/"
+        # The version validator reads its own columns first
+        body, (_, select) = self.get(url, fields="id,company_name")
+        self.assertEqual(body["drive"], {"id": self.drive.pk, "company_name": "Acme"})
+        self.assertNotIn('"auth_user"', select)
+        self.assertNotIn('"status"', select)
+
+        body, (_, select) = self.get(url, fields="company_name,created_by")
+        self.assertEqual(body["drive"], {"company_name": "Acme", "created_by": None})
+        self.assertIn('"auth_user"."username"', select)
+
+    def test_unknown_fields_are_rejected(self):
+        for url, params in (
+            ("/api/drives/", {}),
+            ("/api/drives/", {"limit": "1"}),
+            ("/api/drives/completed/", {}),
+            (f"/api/drives/{self.drive.pk}/", {}),
+        ):
+            for fields in ("company_name,password", ","):
+                with self.subTest(url=url, fields=fields, **params):
+                    response = self.client.get(url, {"fields": fields, **params})
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json()["status"], "error")
+        response = self.client.get("/api/drives/?fields=company_name,password")
+        self.assertIn("Unknown field(s): password", response.json()["message"])
+
+
+def drive_payload(**overrides):
+    return {
+        "company_name": "Acme",
+        "point_of_contact": "Contact",
+        "year_of_passing": 2024,
+        "job_received_date": "2024-01-01",
+        "job_posted_date": "2024-01-02",
+        "job_posted_by": "Placement Cell",
+        **overrides,
+    }
+
+
+class DriveBulkTests(TestCase):
+    def setUp(self):
+        self.drive = make_drive("Existing Co")
+
+    def post(self, payload):
+        return self.client.post(
+            "/api/drives/bulk/", json.dumps(payload), content_type="application/json"
+        )
+
+    def test_creates_and_updates_in_one_request(self):
+        response = self.post(
+            {
+                "create": [drive_payload(company_name="New Co")],
+                "update": [
+                    {
+                        "id": self.drive.pk,
+                        "student_data_shared_date": "2024-01-05",
+                        "interview_date": "2024-01-10",
+                    }
+                ],
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["created"][0]["status"], "PENDING")
+        self.assertEqual(
+            body["updated"],
+            [{"index": 0, "id": self.drive.pk, "status": "IN_PROGRESS"}],
+        )
+        self.assertTrue(CompanyDrive.objects.filter(company_name="New Co").exists())
+        self.drive.refresh_from_db()
+        self.assertEqual(self.drive.status, "IN_PROGRESS")
+        self.assertEqual(self.drive.interview_date, date(2024, 1, 10))
+        self.assertEqual(self.drive.version, 2)
+
+    def test_invalid_row_rejects_the_whole_batch(self):
+        response = self.post(
+            {
+                "create": [
+                    drive_payload(company_name="New Co"),
+                    drive_payload(year_of_passing="soon"),
+                ],
+                "update": [
+                    {"id": self.drive.pk, "no_of_selects": 4},
+                    {"id": self.drive.pk + 100, "no_of_selects": 4},
+                ],
+            }
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"],
+            [
+                {
+                    "operation": "create",
+                    "index": 1,
+                    "message": "year_of_passing must be an integer",
+                    "errors": {"year_of_passing": "must be an integer"},
+                },
+                {"operation": "update", "index": 1, "message": "Drive not found"},
+            ],
+        )
+        self.assertEqual(CompanyDrive.objects.count(), 1)
+        self.drive.refresh_from_db()
+        self.assertIsNone(self.drive.no_of_selects)
+        self.assertEqual(self.drive.version, 1)
+
+    def test_duplicate_update_ids_are_rejected(self):
+        row = {"id": self.drive.pk, "no_of_selects": 4}
+        response = self.post({"update": [row, row]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"][0]["message"], "Duplicate drive id")
+
+    def test_row_limit(self):
+        response = self.post({"create": [drive_payload()] * (MAX_BULK_ROWS + 1)})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CompanyDrive.objects.count(), 1)
+
+
+class ImportDrivesTests(TestCase):
+    def import_rows(self, *rows, upsert=True):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+        self.addCleanup(os.remove, f.name)
+        args = ["--upsert"] if upsert else []
+        call_command("import_drives", f.name, *args, stdout=io.StringIO())
+
+    def test_upsert_updates_matching_drives(self):
+        self.import_rows(drive_payload(), drive_payload(company_name="Other Co"))
+        acme = CompanyDrive.objects.get(company_name="Acme")
+
+        self.import_rows(
+            drive_payload(
+                student_data_shared_date="2024-01-05",
+                interview_date="2024-01-10",
+                results_declaration_status="DECLARED",
+                no_of_selects=3,
+            ),
+            drive_payload(company_name="Third Co"),
+        )
+        self.assertEqual(CompanyDrive.objects.count(), 3)
+        acme.refresh_from_db()
+        self.assertEqual(acme.status, "COMPLETED")
+        self.assertEqual(acme.no_of_selects, 3)
+        self.assertEqual(acme.version, 2)
+        totals = DriveStatusCounts.objects.get(
+            year_of_passing=DriveStatusCounts.ALL_YEARS
+        )
+        self.assertEqual((totals.pending, totals.completed), (2, 1))
+        self.assertEqual(totals.no_of_selects, 3)
+
+    def test_without_upsert_duplicates_are_inserted(self):
+        self.import_rows(drive_payload(), upsert=False)
+        self.import_rows(drive_payload(), upsert=False)
+        self.assertEqual(CompanyDrive.objects.count(), 2)
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DrivePatchTests(TestCase):
+    def setUp(self):
+        self.drive = make_drive("Acme")
+        self.url = f"/api/drives/{self.drive.pk}/"
+
+    def patch(self, payload, **headers):
+        return self.client.patch(
+            self.url, json.dumps(payload), content_type="application/json", **headers
+        )
+
+    def test_patch_writes_given_fields_and_bumps_version(self):
+        response = self.patch({"no_of_selects": 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], 'W/"2"')
+        self.drive.refresh_from_db()
+        self.assertEqual(self.drive.no_of_selects, 4)
+        self.assertEqual(self.drive.company_name, "Acme")
+        self.assertEqual(self.drive.version, 2)
+
+    def test_detail_etag_round_trips_through_if_match(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(etag, 'W/"1"')
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+        response = self.patch({"no_of_selects": 4}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        stale = self.patch({"no_of_selects": 5}, HTTP_IF_MATCH=etag)
+        self.assertEqual(stale.status_code, 412)
+        self.assertEqual(stale.json()["current_version"], 2)
+        self.assertEqual(stale["ETag"], 'W/"2"')
+        self.drive.refresh_from_db()
+        self.assertEqual(self.drive.no_of_selects, 4)
+
+    def test_version_in_body(self):
+        response = self.patch({"no_of_selects": 4, "version": 1})
+        self.assertEqual(response.status_code, 200)
+        response = self.patch({"no_of_selects": 5, "version": 1})
+        self.assertEqual(response.status_code, 412)
+
+    def test_malformed_precondition(self):
+        response = self.patch({"no_of_selects": 4}, HTTP_IF_MATCH='"abc"')
+        self.assertEqual(response.status_code, 400)
+
+    def test_concurrent_saves_store_distinct_versions(self):
+        first = CompanyDrive.objects.get(pk=self.drive.pk)
+        second = CompanyDrive.objects.get(pk=self.drive.pk)
+        first.no_of_selects = 1
+        first.save()
+        second.job_posted_by = "Someone else"
+        second.save()
+        self.assertEqual((first.version, second.version), (2, 3))
+        self.drive.refresh_from_db()
+        self.assertEqual(self.drive.version, 3)
+        # A precondition on the first save's version no longer holds
+        response = self.patch({"no_of_selects": 5}, HTTP_IF_MATCH='W/"2"')
+        self.assertEqual(response.status_code, 412)
+
+
+DRIVE_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "drives": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-drives",
+    },
+}
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DriveConditionalGetTests(TestCase):
+    def setUp(self):
+        for name in ("First Co", "Second Co", "Third Co"):
+            make_drive(name)
+        clear_drive_cache()
+
+    def get(self, url, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **headers)
+        return response, [query["sql"] for query in ctx.captured_queries]
+
+    def test_pages_are_validated_by_their_body(self):
+        response, queries = self.get("/api/drives/?limit=2")
+        self.assertEqual(response.status_code, 200)
+        # Only the page itself, no table-wide MAX/COUNT
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("MAX(", queries[0].upper())
+
+        etag = response["ETag"]
+        response, _ = self.get("/api/drives/?limit=2", etag)
+        self.assertEqual(response.status_code, 304)
+
+        CompanyDrive.objects.filter(company_name="Third Co").update(
+            company_name="Renamed Co"
+        )
+        response, _ = self.get("/api/drives/?limit=2", etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_full_list_is_validated_before_the_view(self):
+        etag = self.client.get("/api/drives/")["ETag"]
+        response, queries = self.get("/api/drives/", etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("MAX(", queries[0].upper())
+
+    @override_settings(CACHES=DRIVE_CACHES, DRIVES_CACHE_ALIAS="drives")
+    def test_cached_lists_are_validated_by_the_generation(self):
+        etags = {}
+        for url in ("/api/drives/", "/api/drives/?limit=2", "/api/drives/pending/"):
+            with self.subTest(url=url):
+                response, queries = self.get(url)
+                self.assertEqual(response["X-Cache"], "MISS")
+                self.assertEqual(len(queries), 1)
+                etags[url] = response["ETag"]
+
+                response, queries = self.get(url)
+                self.assertEqual(response["X-Cache"], "HIT")
+                self.assertEqual((response["ETag"], queries), (etags[url], []))
+                response, queries = self.get(url, etags[url])
+                self.assertEqual((response.status_code, queries), (304, []))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_drive("Fourth Co")
+        for url, etag in etags.items():
+            self.assertEqual(self.get(url, etag)[0].status_code, 200)
+
+
+@override_settings(
+    CACHES=DRIVE_CACHES, DRIVES_CACHE_ALIAS="drives", DRIVES_REPLICA_ALIAS=None
+)
+class DriveResponseCacheTests(TestCase):
+    def setUp(self):
+        make_drive("First Co")
+        clear_drive_cache()
+
+    def x_cache(self, url):
+        response = self.client.get(url)
+        return response.status_code, response["X-Cache"]
+
+    def test_hits_and_misses_are_counted(self):
+        before = cache_stats()
+        self.assertEqual(self.x_cache("/api/drives/pending/"), (200, "MISS"))
+        self.assertEqual(self.x_cache("/api/drives/pending/"), (200, "HIT"))
+        # Keyed by the sorted query string
+        self.assertEqual(self.x_cache("/api/drives/?limit=2&order=asc"), (200, "MISS"))
+        self.assertEqual(self.x_cache("/api/drives/?order=asc&limit=2"), (200, "HIT"))
+        self.assertEqual(self.x_cache("/api/drives/?limit=1"), (200, "MISS"))
+        # Errors are not stored
+        self.assertEqual(self.x_cache("/api/drives/?limit=0"), (400, "MISS"))
+        self.assertEqual(self.x_cache("/api/drives/?limit=0"), (400, "MISS"))
+
+        after = cache_stats()
+        self.assertEqual(after["hits"] - before["hits"], 2)
+        self.assertEqual(after["misses"] - before["misses"], 5)
+
+    def test_generation_is_bumped_on_commit_only(self):
+        self.assertEqual(self.x_cache("/api/drives/"), (200, "MISS"))
+        generation = current_generation()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    make_drive("Rolled Back Co")
+                    raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertEqual(current_generation(), generation)
+        self.assertEqual(self.x_cache("/api/drives/"), (200, "HIT"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_drive("Second Co")
+        self.assertEqual(current_generation(), generation + 1)
+        response = self.client.get("/api/drives/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["count"], 2)
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DriveStatusCountsTests(TestCase):
+    def counts(self):
+        return {
+            row.year_of_passing: (
+                row.pending,
+                row.in_progress,
+                row.completed,
+                row.no_of_selects,
+            )
+            for row in DriveStatusCounts.objects.all()
+            if row.total or row.no_of_selects
+        }
+
+    def assertCountsMatchRebuild(self):
+        maintained = self.counts()
+        DriveStatusCounts.rebuild()
+        self.assertEqual(maintained, self.counts())
+        return maintained
+
+    def complete(self, drive, selects):
+        drive.student_data_shared_date = date(2024, 1, 5)
+        drive.interview_date = date(2024, 1, 10)
+        drive.results_declaration_status = "DECLARED"
+        drive.no_of_selects = selects
+
+    def test_saves_and_deletes_adjust_the_counters(self):
+        first, second = make_drive("First Co"), make_drive("Second Co")
+        self.complete(first, 3)
+        first.save()
+        second.delete()
+        self.assertEqual(
+            self.assertCountsMatchRebuild(),
+            {DriveStatusCounts.ALL_YEARS: (0, 0, 1, 3), 2024: (0, 0, 1, 3)},
+        )
+
+    def test_stale_instances_do_not_double_count(self):
+        drive = make_drive("Acme")
+        first = CompanyDrive.objects.get(pk=drive.pk)
+        second = CompanyDrive.objects.get(pk=drive.pk)
+        self.complete(first, 3)
+        first.save()
+        # Loaded before the first save, so its snapshot still says PENDING
+        self.complete(second, 5)
+        second.save()
+        self.assertEqual(
+            self.assertCountsMatchRebuild()[DriveStatusCounts.ALL_YEARS],
+            (0, 0, 1, 5),
+        )
+
+    def test_stale_delete_counts_the_stored_row(self):
+        drive = make_drive("Acme")
+        stale = CompanyDrive.objects.get(pk=drive.pk)
+        self.complete(drive, 7)
+        drive.save()
+        # Its snapshot still says PENDING without selects
+        stale.delete()
+        self.assertEqual(self.assertCountsMatchRebuild(), {})
+
+    def test_deferred_queryset_delete(self):
+        drive = make_drive("Acme")
+        self.complete(drive, 7)
+        drive.save()
+        make_drive("Other Co")
+        CompanyDrive.objects.filter(company_name="Acme").only("id").delete()
+        self.assertEqual(
+            self.assertCountsMatchRebuild(),
+            {DriveStatusCounts.ALL_YEARS: (1, 0, 0, 0), 2024: (1, 0, 0, 0)},
+        )
+
+    def test_partial_save_counts_the_stored_columns(self):
+        drive = make_drive("Acme")
+        stale = CompanyDrive.objects.get(pk=drive.pk)
+        drive.year_of_passing = 2025
+        drive.save()
+        stale.job_posted_by = "Someone else"
+        stale.save(update_fields=["job_posted_by"])
+        self.assertEqual(
+            self.assertCountsMatchRebuild(),
+            {DriveStatusCounts.ALL_YEARS: (1, 0, 0, 0), 2025: (1, 0, 0, 0)},
+        )
+
+    def test_bulk_changes_adjust_the_counters(self):
+        drive = make_drive("Acme")
+        response = self.client.post(
+            "/api/drives/bulk/",
+            json.dumps(
+                {
+                    "create": [drive_payload(year_of_passing=2025)],
+                    "update": [
+                        {
+                            "id": drive.pk,
+                            "student_data_shared_date": "2024-01-05",
+                            "interview_date": "2024-01-10",
+                        }
+                    ],
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.assertCountsMatchRebuild(),
+            {
+                DriveStatusCounts.ALL_YEARS: (1, 1, 0, 0),
+                2024: (0, 1, 0, 0),
+                2025: (1, 0, 0, 0),
+            },
+        )
+
+    def test_stats_endpoint(self):
+        make_drive("Acme")
+        drive = make_drive("Other Co")
+        self.complete(drive, 4)
+        drive.save()
+        stats = self.client.get("/api/drives/stats/").json()["stats"]
+        self.assertEqual(
+            stats,
+            {
+                "year_of_passing": None,
+                "pending": 1,
+                "in_progress": 0,
+                "completed": 1,
+                "total": 2,
+                "no_of_selects": 4,
+            },
+        )
+        by_year = self.client.get("/api/drives/stats/?by_year=1").json()["stats"]
+        self.assertEqual([row["year_of_passing"] for row in by_year], [2024])
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DrivePayloadValidationTests(TestCase):
+    def send(self, method, url, payload):
+        return getattr(self.client, method)(
+            url, json.dumps(payload), content_type="application/json"
+        )
+
+    def test_create_reports_every_missing_field(self):
+        response = self.send("post", "/api/drives/", {"company_name": "Acme"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"],
+            {
+                "point_of_contact": "is required",
+                "year_of_passing": "is required",
+                "job_received_date": "is required",
+                "job_posted_date": "is required",
+                "job_posted_by": "is required",
+            },
+        )
+        self.assertFalse(CompanyDrive.objects.exists())
+
+    def test_create_reports_every_invalid_field(self):
+        response = self.send(
+            "post",
+            "/api/drives/",
+            drive_payload(
+                company_name="x" * 101,
+                point_of_contact=7,
+                year_of_passing=True,
+                job_received_date="20240101",
+                job_posted_date="2024-02-30",
+                results_declaration_status="MAYBE",
+                no_of_selects=-1,
+            ),
+        )
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(
+            errors,
+            {
+                "company_name": "must be at most 100 characters",
+                "point_of_contact": "must be a string",
+                "year_of_passing": "must be an integer",
+                "job_received_date": "must be a date in YYYY-MM-DD format",
+                "job_posted_date": "must be a date in YYYY-MM-DD format",
+                "results_declaration_status": (
+                    "must be one of: NOT_STARTED, IN_PROCESS, PENDING, DECLARED"
+                ),
+                "no_of_selects": "must be at least 0",
+            },
+        )
+        self.assertFalse(CompanyDrive.objects.exists())
+
+    def test_create_converts_values(self):
+        response = self.send(
+            "post",
+            "/api/drives/",
+            drive_payload(year_of_passing="2025", interview_date=""),
+        )
+        self.assertEqual(response.status_code, 200)
+        drive = CompanyDrive.objects.get()
+        self.assertEqual(drive.year_of_passing, 2025)
+        self.assertEqual(drive.job_received_date, date(2024, 1, 1))
+        self.assertIsNone(drive.interview_date)
+
+    def test_payload_must_be_an_object(self):
+        response = self.send("post", "/api/drives/", [drive_payload()])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], {"payload": "must be an object"})
+
+    def test_update_clears_only_nullable_fields(self):
+        drive = make_drive("Acme")
+        drive.interview_date = date(2024, 1, 10)
+        drive.save()
+        response = self.send(
+            "put",
+            f"/api/drives/{drive.pk}/",
+            {"interview_date": None, "company_name": ""},
+        )
+        self.assertEqual(response.status_code, 200)
+        drive.refresh_from_db()
+        self.assertIsNone(drive.interview_date)
+        self.assertEqual(drive.company_name, "Acme")
+
+    def test_invalid_update_changes_nothing(self):
+        drive = make_drive("Acme")
+        response = self.send(
+            "put",
+            f"/api/drives/{drive.pk}/",
+            {"company_name": "New name", "no_of_selects": "many"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"], {"no_of_selects": "must be an integer"}
+        )
+        drive.refresh_from_db()
+        self.assertEqual((drive.company_name, drive.version), ("Acme", 1))
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class SeedDrivesTests(TestCase):
+    def seed(self, seed=0):
+        call_command("seed_drives", rows=300, seed=seed, stdout=io.StringIO())
+
+    def test_rows_keep_their_generated_values(self):
+        self.seed()
+        drives = list(CompanyDrive.objects.all())
+        self.assertEqual(len(drives), 300)
+        for drive in drives:
+            self.assertEqual(drive.status, drive.derive_status())
+            self.assertLessEqual(drive.created_at, drive.updated_at)
+            # Generated timestamps, not the time of the insert
+            self.assertLess(drive.created_at.date(), date(2026, 5, 1))
+            self.assertGreaterEqual(drive.job_posted_date, drive.job_received_date)
+        self.assertEqual(
+            {drive.status for drive in drives}, {"PENDING", "IN_PROGRESS", "COMPLETED"}
+        )
+        counts = DriveStatusCounts.objects.order_by("year_of_passing").values()
+        seeded = [{**row, "id": None} for row in counts]
+        DriveStatusCounts.rebuild()
+        self.assertEqual(seeded, [{**row, "id": None} for row in counts.all()])
+
+    def test_same_seed_same_rows(self):
+        columns = ["company_name", "status", "created_at", "interview_date"]
+        self.seed()
+        first = list(CompanyDrive.objects.order_by("id").values_list(*columns))
+        CompanyDrive.objects.all().delete()
+        self.seed()
+        second = list(CompanyDrive.objects.order_by("id").values_list(*columns))
+        self.assertEqual(first, second)
+        # The search index is rebuilt after the load
+        response = self.client.get(f"/api/drives/search/?q={first[0][0]}")
+        self.assertTrue(response.json()["drives"])
+
+
+class RecordingChannelLayer:
+    """Stands in for the channel layer, keeping every group message"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def group_send(self, group, message):
+        self.sent.append((group, message))
+
+
+@override_settings(DRIVES_REPLICA_ALIAS=None)
+class DriveLiveEventTests(TestCase):
+    def setUp(self):
+        self.layer = RecordingChannelLayer()
+        patcher = mock.patch("drives.live.get_channel_layer", return_value=self.layer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def published(self):
+        """The change lists sent to the drives group since the last call"""
+        for group, message in self.layer.sent:
+            self.assertEqual(group, DRIVE_CHANGES_GROUP)
+            self.assertEqual(message["type"], "drive.changes")
+        changes = [message["changes"] for _, message in self.layer.sent]
+        self.layer.sent.clear()
+        return changes
+
+    def test_create_update_and_delete_events(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            drive = make_drive("Acme")
+        self.assertEqual(
+            self.published(),
+            [[{"event": "created", "id": drive.pk, "status": "PENDING"}]],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/drives/{drive.pk}/",
+                json.dumps(
+                    {"student_data_shared_date": "2024-01-05", "interview_date": ""}
+                ),
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.published(),
+            [
+                [
+                    {
+                        "event": "updated",
+                        "id": drive.pk,
+                        "status": "PENDING",
+                        "fields": ["student_data_shared_date"],
+                    }
+                ]
+            ],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/drives/{drive.pk}/")
+        self.assertEqual(self.published(), [[{"event": "deleted", "id": drive.pk}]])
+
+    def test_nothing_is_sent_for_unchanged_or_rolled_back_writes(self):
+        drive = make_drive("Acme")
+        with self.captureOnCommitCallbacks(execute=True):
+            drive.save()
+            with transaction.atomic():
+                make_drive("Other Co")
+                transaction.set_rollback(True)
+        self.assertEqual(self.published(), [])
+
+    def test_inserts_without_ids_send_one_reload(self):
+        drive = make_drive("Acme")
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_changes(
+                [
+                    created_event(CompanyDrive()),
+                    created_event(drive),
+                    created_event(CompanyDrive()),
+                ]
+            )
+        self.assertEqual(
+            self.published(),
+            [
+                [
+                    {"event": "created", "id": drive.pk, "status": "PENDING"},
+                    {"event": "reload"},
+                ]
+            ],
+        )
+
+    def test_failed_push_does_not_fail_the_write(self):
+        self.layer.group_send = mock.AsyncMock(side_effect=OSError("unreachable"))
+        with self.assertLogs("drives.live", "ERROR"):
+            with self.captureOnCommitCallbacks(execute=True):
+                drive = make_drive("Acme")
+        self.assertTrue(CompanyDrive.objects.filter(pk=drive.pk).exists())
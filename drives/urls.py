@@ -1,12 +1,28 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+# Served through jobMonitoringApp.asgi, the read endpoints use their async
+# variants (see drives/async_views.py)
+if settings.DRIVES_ASYNC_VIEWS:
+    from . import async_views as read_views
+else:
+    read_views = views
+
 urlpatterns = [
     # CRUD operations
-    path("drives/", views.drive_list, name="drive-list"),
-    path("drives/<int:drive_id>/", views.drive_detail, name="drive_detail"),
+    path("drives/", read_views.drive_list, name="drive-list"),
+    path("drives/<int:drive_id>/", read_views.drive_detail, name="drive_detail"),
+    path("drives/bulk/", views.drive_bulk, name="drive_bulk"),
+    path("drives/export/", views.drive_export, name="drive_export"),
+    path("drives/search/", views.drive_search, name="drive_search"),
+    path("drives/stats/", views.drive_stats, name="drive_stats"),
     # Special endpoints
-    path("drives/in-progress/", views.drives_in_progress, name="drives_in_progress"),
-    path("drives/pending/", views.pending_drives, name="pending_drives"),
-    path("drives/completed/", views.completed_drives, name="completed_drives"),
+    path(
+        "drives/in-progress/",
+        read_views.drives_in_progress,
+        name="drives_in_progress",
+    ),
+    path("drives/pending/", read_views.pending_drives, name="pending_drives"),
+    path("drives/completed/", read_views.completed_drives, name="completed_drives"),
 ]
@@ -1,101 +1,119 @@
 # ===== drives/views.py - Updated with better error handling =====
 
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.db.models import Q
-from .models import CompanyDrive
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .cache import cached_drive_response
+from .conditional import conditional_drive_view, version_etag, version_validators
+from .export import InvalidExportRequest, export_stream
+from .models import CompanyDrive, DriveStatusCounts
+from .payloads import DriveValidationError, apply_drive_changes, build_drive
+from .signals import drives_bulk_changed
+from .search import autocomplete_company_names, search_drives
+from .serializers import (
+    COMPLETED_FIELDS,
+    DETAIL_FIELDS,
+    IN_PROGRESS_FIELDS,
+    LIST_FIELDS,
+    PENDING_FIELDS,
+    DriveJsonResponse,
+    InvalidFieldsRequest,
+    lookups,
+    requested_fields,
+    serialize_drive,
+    serialize_queryset,
+    serialize_row,
+    serialize_rows,
+)
+from .routers import read_from_replica
+from .pagination import (
+    InvalidPageRequest,
+    approximate_count,
+    keyset_page,
+    parse_count_mode,
+    parse_limit,
+    parse_order,
+    wants_pagination,
+)
 import json
-from datetime import datetime
 import logging
+from operator import itemgetter
 
 logger = logging.getLogger(__name__)
 
+MAX_BULK_ROWS = 1000
+BULK_BATCH_SIZE = 500
+MAX_SEARCH_RESULTS = 100
+
+
+def validation_error_response(error):
+    """400 response listing every invalid field of a drive payload"""
+    return JsonResponse(
+        {"status": "error", "message": str(error), "errors": error.errors},
+        status=400,
+    )
 
-def is_staff(user):
-    """Check if the user is authenticated and associated with a PlacementStaff profile"""
-    return user.is_authenticated and hasattr(user, "placementstaff")
-
-
-# Helper function to serialize drive object
-def serialize_drive(drive, detailed=True):
-    """Convert drive model instance to dictionary"""
-    if detailed:
-        # Full details for single drive view
-        return {
-            "id": drive.id,
-            "company_name": drive.company_name,
-            "point_of_contact": drive.point_of_contact,
-            "year_of_passing": drive.year_of_passing,
-            "job_received_date": (
-                drive.job_received_date.isoformat() if drive.job_received_date else None
-            ),
-            "job_posted_date": (
-                drive.job_posted_date.isoformat() if drive.job_posted_date else None
-            ),
-            "job_posted_by": drive.job_posted_by,
-            "student_data_shared_date": (
-                drive.student_data_shared_date.isoformat()
-                if drive.student_data_shared_date
-                else None
-            ),
-            "interview_date": (
-                drive.interview_date.isoformat() if drive.interview_date else None
-            ),
-            "interview_posted_date": (
-                drive.interview_posted_date.isoformat()
-                if drive.interview_posted_date
-                else None
-            ),
-            "results_declaration_status": drive.results_declaration_status,
-            "results_declaration_date": (
-                drive.results_declaration_date.isoformat()
-                if drive.results_declaration_date
-                else None
-            ),
-            "no_of_selects": drive.no_of_selects,
-            "status": drive.status,
-            "created_at": drive.created_at.isoformat(),
-            "updated_at": drive.updated_at.isoformat(),
-            "created_by": drive.created_by.username if drive.created_by else None,
-            "updated_by": drive.updated_by.username if drive.updated_by else None,
-        }
-    else:
-        # Basic details for list view
-        return {
-            "id": drive.id,
-            "company_name": drive.company_name,
-            "point_of_contact": drive.point_of_contact,
-            "year_of_passing": drive.year_of_passing,
-            "interview_date": (
-                drive.interview_date.isoformat() if drive.interview_date else None
-            ),
-            "job_posted_by": drive.job_posted_by,
-            "job_received_date": (
-                drive.job_received_date.isoformat() if drive.job_received_date else None
-            ),
-            "results_declaration_status": drive.results_declaration_status,
-            "status": drive.status,
-        }
+
+def paginated_drive_list(request):
+    """Cursor-paginated variant of the drive list, newest or oldest first"""
+    limit = parse_limit(request.GET.get("limit"))
+    order = parse_order(request.GET.get("order"))
+    count_mode = parse_count_mode(request.GET.get("count"))
+    fields = requested_fields(request.GET, LIST_FIELDS)
+    columns = lookups(fields, "created_at", "id")
+
+    rows, next_cursor = keyset_page(
+        CompanyDrive.objects.values_list(*columns),
+        limit,
+        request.GET.get("cursor"),
+        cursor_key=itemgetter(columns.index("created_at"), columns.index("id")),
+        order=order,
+    )
+    response = {
+        "status": "success",
+        "drives": serialize_rows(rows, fields),
+        "next_cursor": next_cursor,
+    }
+    if count_mode == "exact":
+        response["count"] = CompanyDrive.objects.count()
+    elif count_mode == "approx":
+        response["count"] = approximate_count(CompanyDrive)
+        response["count_is_approximate"] = True
+    return DriveJsonResponse(response)
+
+
+def unpaginated_drives(request):
+    """Rows of drive_list validated up front; cursor pages validate their body"""
+    if wants_pagination(request.GET):
+        return None
+    return CompanyDrive.objects.all()
 
 
 # List all drives or create a new drive
 @csrf_exempt
+@read_from_replica
+@conditional_drive_view(unpaginated_drives)
+@cached_drive_response("drive_list")
 def drive_list(request):
     """API endpoint for listing all drives or creating a new one"""
     if request.method == "GET":
         try:
-            drives = CompanyDrive.objects.all().order_by("-created_at")
-            return JsonResponse(
-                {
-                    "status": "success",
-                    "count": drives.count(),
-                    "drives": [
-                        serialize_drive(drive, detailed=False) for drive in drives
-                    ],
-                }
+            if wants_pagination(request.GET):
+                return paginated_drive_list(request)
+
+            drives = serialize_queryset(
+                CompanyDrive.objects.order_by("-created_at"),
+                requested_fields(request.GET, LIST_FIELDS),
+            )
+            return DriveJsonResponse(
+                {"status": "success", "count": len(drives), "drives": drives}
             )
+        except (InvalidPageRequest, InvalidFieldsRequest) as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error fetching drives: {str(e)}")
             return JsonResponse(
@@ -106,72 +124,12 @@ def drive_list(request):
         try:
             data = json.loads(request.body)
 
-            # Validate required fields
-            required_fields = [
-                "company_name",
-                "point_of_contact",
-                "year_of_passing",
-                "job_received_date",
-                "job_posted_date",
-                "job_posted_by",
-            ]
-            for field in required_fields:
-                if not data.get(field):
-                    return JsonResponse(
-                        {
-                            "status": "error",
-                            "message": f"{field.replace('_', ' ').title()} is required",
-                        },
-                        status=400,
-                    )
-
-            # Create new drive
-            drive = CompanyDrive(
-                company_name=data.get("company_name"),
-                point_of_contact=data.get("point_of_contact"),
-                year_of_passing=int(data.get("year_of_passing")),
-                job_received_date=datetime.strptime(
-                    data.get("job_received_date"), "%Y-%m-%d"
-                ).date(),
-                job_posted_date=datetime.strptime(
-                    data.get("job_posted_date"), "%Y-%m-%d"
-                ).date(),
-                job_posted_by=data.get("job_posted_by"),
-            )
+            drive = build_drive(data)
 
             # Set created_by if user is authenticated
             if hasattr(request, "user") and request.user.is_authenticated:
                 drive.created_by = request.user
 
-            # Optional fields
-            if data.get("student_data_shared_date"):
-                drive.student_data_shared_date = datetime.strptime(
-                    data.get("student_data_shared_date"), "%Y-%m-%d"
-                ).date()
-
-            if data.get("interview_date"):
-                drive.interview_date = datetime.strptime(
-                    data.get("interview_date"), "%Y-%m-%d"
-                ).date()
-
-            if data.get("interview_posted_date"):
-                drive.interview_posted_date = datetime.strptime(
-                    data.get("interview_posted_date"), "%Y-%m-%d"
-                ).date()
-
-            if data.get("results_declaration_status"):
-                drive.results_declaration_status = data.get(
-                    "results_declaration_status"
-                )
-
-            if data.get("results_declaration_date"):
-                drive.results_declaration_date = datetime.strptime(
-                    data.get("results_declaration_date"), "%Y-%m-%d"
-                ).date()
-
-            if data.get("no_of_selects") is not None:
-                drive.no_of_selects = int(data.get("no_of_selects"))
-
             drive.save()
 
             return JsonResponse(
@@ -182,6 +140,8 @@ def drive_list(request):
                 }
             )
 
+        except DriveValidationError as e:
+            return validation_error_response(e)
         except ValueError as e:
             return JsonResponse(
                 {"status": "error", "message": f"Invalid data format: {str(e)}"},
@@ -198,89 +158,133 @@ def drive_list(request):
     )
 
 
+def expected_version(request, data):
+    """
+    Version precondition of a PATCH: the If-Match header or a "version" key.
+
+    If-Match carries the ETag drive_detail sent, ``W/"3"`` for version 3
+    (``"3"`` is accepted too); ``*`` or no precondition at all returns None.
+    """
+    header = request.headers.get("If-Match")
+    if header is not None and header.strip() != "*":
+        value = header.strip().removeprefix("W/").strip('"')
+    else:
+        value = data.pop("version", None)
+        if value is None:
+            return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError("If-Match must be a drive ETag and version a number")
+
+
+def patch_drive(request, drive):
+    """
+    Write only the columns present in the payload (plus status, updated_at,
+    updated_by and version), optionally guarded by a version precondition.
+    """
+    try:
+        data = json.loads(request.body)
+        if not isinstance(data, dict):
+            raise ValueError("Payload must be an object")
+        version = expected_version(request, data)
+        update_fields = apply_drive_changes(drive, data) | {"status", "updated_at"}
+    except DriveValidationError as e:
+        return validation_error_response(e)
+    except (TypeError, ValueError, AttributeError) as e:
+        return JsonResponse(
+            {"status": "error", "message": f"Invalid data format: {str(e)}"},
+            status=400,
+        )
+
+    if request.user.is_authenticated:
+        drive.updated_by = request.user
+        update_fields.add("updated_by")
+
+    try:
+        if version is None:
+            drive.save(update_fields=update_fields)
+        elif version != drive.version or not drive.save_if_version(
+            version, update_fields
+        ):
+            current = (
+                CompanyDrive.objects.filter(id=drive.id)
+                .values_list("version", flat=True)
+                .first()
+            )
+            if current is None:
+                return JsonResponse(
+                    {"status": "error", "message": "Drive not found"}, status=404
+                )
+            response = JsonResponse(
+                {
+                    "status": "error",
+                    "message": "Drive was modified by someone else",
+                    "current_version": current,
+                },
+                status=412,
+            )
+            response["ETag"] = version_etag(current)
+            return response
+    except Exception as e:
+        logger.error(f"Error patching drive: {str(e)}")
+        return JsonResponse(
+            {"status": "error", "message": "Failed to update drive"}, status=500
+        )
+
+    response = JsonResponse(
+        {
+            "status": "success",
+            "message": "Drive updated successfully",
+            "drive": serialize_drive(drive),
+        }
+    )
+    response["ETag"] = version_etag(drive.version)
+    return response
+
+
 # Retrieve, update or delete a specific drive
 @csrf_exempt
+@read_from_replica
+@conditional_drive_view(
+    lambda request, drive_id: CompanyDrive.objects.filter(id=drive_id),
+    validators=version_validators,
+)
 def drive_detail(request, drive_id):
     """API endpoint for retrieving, updating or deleting a specific drive"""
+    if request.method == "GET":
+        try:
+            fields = requested_fields(request.GET, DETAIL_FIELDS)
+        except InvalidFieldsRequest as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
+        row = (
+            CompanyDrive.objects.filter(id=drive_id)
+            .values_list(*lookups(fields))
+            .first()
+        )
+        if row is None:
+            return JsonResponse(
+                {"status": "error", "message": "Drive not found"}, status=404
+            )
+        return DriveJsonResponse(
+            {"status": "success", "drive": serialize_row(row, fields)}
+        )
+
     try:
-        drive = get_object_or_404(CompanyDrive, id=drive_id)
+        drive = get_object_or_404(
+            CompanyDrive.objects.select_related("created_by", "updated_by"),
+            id=drive_id,
+        )
     except:
         return JsonResponse(
             {"status": "error", "message": "Drive not found"}, status=404
         )
 
-    if request.method == "GET":
-        return JsonResponse({"status": "success", "drive": serialize_drive(drive)})
-
-    elif request.method == "PUT":
+    if request.method == "PUT":
         try:
             data = json.loads(request.body)
 
-            # Update fields
-            if "company_name" in data:
-                drive.company_name = data.get("company_name")
-
-            if "point_of_contact" in data:
-                drive.point_of_contact = data.get("point_of_contact")
-
-            if "year_of_passing" in data:
-                drive.year_of_passing = int(data.get("year_of_passing"))
-
-            if "job_received_date" in data and data.get("job_received_date"):
-                drive.job_received_date = datetime.strptime(
-                    data.get("job_received_date"), "%Y-%m-%d"
-                ).date()
-
-            if "job_posted_date" in data and data.get("job_posted_date"):
-                drive.job_posted_date = datetime.strptime(
-                    data.get("job_posted_date"), "%Y-%m-%d"
-                ).date()
-
-            if "job_posted_by" in data:
-                drive.job_posted_by = data.get("job_posted_by")
-
-            if "student_data_shared_date" in data:
-                if data.get("student_data_shared_date"):
-                    drive.student_data_shared_date = datetime.strptime(
-                        data.get("student_data_shared_date"), "%Y-%m-%d"
-                    ).date()
-                else:
-                    drive.student_data_shared_date = None
-
-            if "interview_date" in data:
-                if data.get("interview_date"):
-                    drive.interview_date = datetime.strptime(
-                        data.get("interview_date"), "%Y-%m-%d"
-                    ).date()
-                else:
-                    drive.interview_date = None
-
-            if "interview_posted_date" in data:
-                if data.get("interview_posted_date"):
-                    drive.interview_posted_date = datetime.strptime(
-                        data.get("interview_posted_date"), "%Y-%m-%d"
-                    ).date()
-                else:
-                    drive.interview_posted_date = None
-
-            if "results_declaration_status" in data:
-                drive.results_declaration_status = data.get(
-                    "results_declaration_status"
-                )
-
-            if "results_declaration_date" in data:
-                if data.get("results_declaration_date"):
-                    drive.results_declaration_date = datetime.strptime(
-                        data.get("results_declaration_date"), "%Y-%m-%d"
-                    ).date()
-                else:
-                    drive.results_declaration_date = None
-
-            if "no_of_selects" in data:
-                if data.get("no_of_selects") is not None:
-                    drive.no_of_selects = int(data.get("no_of_selects"))
-                else:
-                    drive.no_of_selects = None
+            apply_drive_changes(drive, data)
 
             # Set updated_by if user is authenticated
             if hasattr(request, "user") and request.user.is_authenticated:
@@ -288,14 +292,18 @@ def drive_detail(request, drive_id):
 
             drive.save()
 
-            return JsonResponse(
+            response = JsonResponse(
                 {
                     "status": "success",
                     "message": "Drive updated successfully",
                     "drive": serialize_drive(drive),
                 }
             )
+            response["ETag"] = version_etag(drive.version)
+            return response
 
+        except DriveValidationError as e:
+            return validation_error_response(e)
         except ValueError as e:
             return JsonResponse(
                 {"status": "error", "message": f"Invalid data format: {str(e)}"},
@@ -307,6 +315,9 @@ def drive_detail(request, drive_id):
                 {"status": "error", "message": "Failed to update drive"}, status=500
             )
 
+    elif request.method == "PATCH":
+        return patch_drive(request, drive)
+
     elif request.method == "DELETE":
         try:
             company_name = drive.company_name
@@ -328,39 +339,306 @@ def drive_detail(request, drive_id):
     )
 
 
-# List drives in progress
-def drives_in_progress(request):
-    """API endpoint for listing drives in progress"""
+def bulk_create_drives(rows, user, errors):
+    """Validate create rows, returning the unsaved drives in payload order"""
+    drives = []
+    for index, row in enumerate(rows):
+        try:
+            drive = build_drive(row)
+        except DriveValidationError as e:
+            errors.append(
+                {
+                    "operation": "create",
+                    "index": index,
+                    "message": str(e),
+                    "errors": e.errors,
+                }
+            )
+            continue
+        drive.created_by = user
+        drive.status = drive.derive_status()
+        drives.append((index, drive))
+    return drives
+
+
+def bulk_update_drives(rows, user, errors):
+    """
+    Validate partial update rows against the stored drives.
+
+    Returns ``(drives, fields)``: the modified drives in payload order and
+    the columns bulk_update has to write.
+    """
+    ids = [row.get("id") for row in rows if isinstance(row.get("id"), int)]
+    # Locked until the bulk write commits, so neither the changes nor the
+    # counter deltas are computed from rows another writer is changing
+    existing = CompanyDrive.objects.select_for_update().in_bulk(ids)
+    fields = {"status", "updated_at", "version"}
+    if user is not None:
+        fields.add("updated_by")
+    now = timezone.now()
+    seen = set()
+    drives = []
+    for index, row in enumerate(rows):
+        drive = existing.get(row.get("id"))
+        if drive is None or drive.id in seen:
+            message = "Drive not found" if drive is None else "Duplicate drive id"
+            errors.append({"operation": "update", "index": index, "message": message})
+            continue
+        try:
+            fields |= apply_drive_changes(drive, row)
+        except DriveValidationError as e:
+            errors.append(
+                {
+                    "operation": "update",
+                    "index": index,
+                    "message": str(e),
+                    "errors": e.errors,
+                }
+            )
+            continue
+        seen.add(drive.id)
+        # bulk_update neither runs save() nor auto_now, so mirror both here
+        drive.status = drive.derive_status()
+        drive.updated_at = now
+        drive.version = F("version") + 1
+        if user is not None:
+            drive.updated_by = user
+        drives.append((index, drive))
+    return drives, fields
+
+
+# Create and update drives in bulk
+@csrf_exempt
+def drive_bulk(request):
+    """
+    API endpoint applying arrays of drive creates and partial updates.
+
+    The payload is ``{"create": [...], "update": [{"id": ..., ...}]}``. Rows
+    are all validated first; if any row fails nothing is written and the
+    per-row errors are returned. Otherwise every row is written with one
+    bulk_create and one bulk_update, in the transaction that loaded and
+    locked the drives being updated. Created ids
+    are null on backends that cannot return them from a bulk insert (MySQL).
+    """
+    if request.method != "POST":
+        return JsonResponse(
+            {"status": "error", "message": "Method not allowed"}, status=405
+        )
+
+    try:
+        data = json.loads(request.body)
+        creates = data.get("create", [])
+        updates = data.get("update", [])
+        if not isinstance(creates, list) or not isinstance(updates, list):
+            raise ValueError("create and update must be arrays")
+        if not all(isinstance(row, dict) for row in creates + updates):
+            raise ValueError("every row must be an object")
+    except (ValueError, AttributeError) as e:
+        return JsonResponse(
+            {"status": "error", "message": f"Invalid data format: {str(e)}"},
+            status=400,
+        )
+
+    if len(creates) + len(updates) > MAX_BULK_ROWS:
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": f"At most {MAX_BULK_ROWS} rows can be sent at once",
+            },
+            status=400,
+        )
+
+    user = request.user if request.user.is_authenticated else None
+    errors = []
+    try:
+        with transaction.atomic():
+            new_drives = bulk_create_drives(creates, user, errors)
+            changed_drives, update_fields = bulk_update_drives(updates, user, errors)
+            if errors:
+                return JsonResponse({"status": "error", "errors": errors}, status=400)
+
+            CompanyDrive.objects.bulk_create(
+                [drive for _, drive in new_drives], batch_size=BULK_BATCH_SIZE
+            )
+            if changed_drives:
+                CompanyDrive.objects.bulk_update(
+                    [drive for _, drive in changed_drives],
+                    sorted(update_fields),
+                    batch_size=BULK_BATCH_SIZE,
+                )
+            drives_bulk_changed.send(
+                sender=CompanyDrive,
+                created=[drive for _, drive in new_drives],
+                updated=[drive for _, drive in changed_drives],
+            )
+    except Exception as e:
+        logger.error(f"Error applying bulk drive changes: {str(e)}")
+        return JsonResponse(
+            {"status": "error", "message": "Failed to apply bulk changes"}, status=500
+        )
+
+    return JsonResponse(
+        {
+            "status": "success",
+            "created": [
+                {"index": index, "id": drive.pk, "status": drive.status}
+                for index, drive in new_drives
+            ],
+            "updated": [
+                {"index": index, "id": drive.pk, "status": drive.status}
+                for index, drive in changed_drives
+            ],
+        }
+    )
+
+
+def serialize_counts(counts):
+    return {
+        "year_of_passing": (
+            None
+            if counts.year_of_passing == DriveStatusCounts.ALL_YEARS
+            else counts.year_of_passing
+        ),
+        "pending": counts.pending,
+        "in_progress": counts.in_progress,
+        "completed": counts.completed,
+        "total": counts.total,
+        "no_of_selects": counts.no_of_selects,
+    }
+
+
+# Dashboard counters
+@read_from_replica
+def drive_stats(request):
+    """
+    API endpoint for the dashboard tiles, read from DriveStatusCounts.
+
+    Without parameters it returns the totals over every cohort,
+    ``year_of_passing=Y`` returns one cohort and ``by_year=1`` every cohort.
+    """
     if request.method == "GET":
+        counts = DriveStatusCounts.objects.all()
+        if request.GET.get("by_year"):
+            rows = counts.exclude(
+                year_of_passing=DriveStatusCounts.ALL_YEARS
+            ).order_by("-year_of_passing")
+            return JsonResponse(
+                {"status": "success", "stats": [serialize_counts(c) for c in rows]}
+            )
+
+        year = request.GET.get("year_of_passing", DriveStatusCounts.ALL_YEARS)
         try:
-            drives = CompanyDrive.objects.filter(status="IN_PROGRESS").order_by(
-                "-created_at"
+            year = int(year)
+        except ValueError:
+            return JsonResponse(
+                {"status": "error", "message": "year_of_passing must be an integer"},
+                status=400,
             )
+        row = counts.filter(year_of_passing=year).first()
+        if row is None:
+            row = DriveStatusCounts(year_of_passing=year)
+        return JsonResponse({"status": "success", "stats": serialize_counts(row)})
+
+    return JsonResponse(
+        {"status": "error", "message": "Method not allowed"}, status=405
+    )
 
-            result = []
-            for drive in drives:
-                result.append(
+
+# Full-text search and company name autocomplete
+@read_from_replica
+def drive_search(request):
+    """
+    API endpoint searching drives by company, contact and poster.
+
+    ``mode=autocomplete`` returns company names starting with ``q`` instead.
+    """
+    if request.method == "GET":
+        query = request.GET.get("q", "")
+        try:
+            limit = min(int(request.GET.get("limit", 20)), MAX_SEARCH_RESULTS)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return JsonResponse(
+                {"status": "error", "message": "limit must be a positive integer"},
+                status=400,
+            )
+
+        try:
+            if request.GET.get("mode") == "autocomplete":
+                return JsonResponse(
                     {
-                        "id": drive.id,
-                        "company_name": drive.company_name,
-                        "point_of_contact": drive.point_of_contact,
-                        "interview_date": (
-                            drive.interview_date.isoformat()
-                            if drive.interview_date
-                            else None
-                        ),
-                        "job_posted_by": drive.job_posted_by,
-                        "results_declaration_status": drive.results_declaration_status,
+                        "status": "success",
+                        "suggestions": autocomplete_company_names(query, limit),
                     }
                 )
 
+            drives = search_drives(CompanyDrive.objects.all(), query).order_by(
+                "-created_at"
+            )[:limit]
+            result = serialize_queryset(drives, LIST_FIELDS)
+            return DriveJsonResponse(
+                {"status": "success", "count": len(result), "drives": result}
+            )
+        except Exception as e:
+            logger.error(f"Error searching drives: {str(e)}")
             return JsonResponse(
+                {"status": "error", "message": "Failed to search drives"},
+                status=500,
+            )
+
+    return JsonResponse(
+        {"status": "error", "message": "Method not allowed"}, status=405
+    )
+
+
+# Stream all drives as CSV or NDJSON
+@read_from_replica
+def drive_export(request):
+    """API endpoint streaming drives as CSV or NDJSON without buffering them"""
+    if request.method == "GET":
+        try:
+            chunks, content_type, extension = export_stream(request.GET)
+        except InvalidExportRequest as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="drives.{extension}"'
+        )
+        return response
+
+    return JsonResponse(
+        {"status": "error", "message": "Method not allowed"}, status=405
+    )
+
+
+# List drives in progress
+@read_from_replica
+@conditional_drive_view(
+    lambda request: CompanyDrive.objects.filter(status="IN_PROGRESS")
+)
+@cached_drive_response("drives_in_progress")
+def drives_in_progress(request):
+    """API endpoint for listing drives in progress"""
+    if request.method == "GET":
+        try:
+            drives = CompanyDrive.objects.filter(status="IN_PROGRESS").order_by(
+                "-created_at"
+            )
+            result = serialize_queryset(
+                drives, requested_fields(request.GET, IN_PROGRESS_FIELDS)
+            )
+
+            return DriveJsonResponse(
                 {
                     "status": "success",
                     "count": len(result),
                     "drives_in_progress": result,
                 }
             )
+        except InvalidFieldsRequest as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error fetching in-progress drives: {str(e)}")
             return JsonResponse(
@@ -374,6 +652,9 @@ def drives_in_progress(request):
 
 
 # List pending drives
+@read_from_replica
+@conditional_drive_view(lambda request: CompanyDrive.objects.filter(status="PENDING"))
+@cached_drive_response("pending_drives")
 def pending_drives(request):
     """API endpoint for listing pending drives"""
     if request.method == "GET":
@@ -381,28 +662,15 @@ def pending_drives(request):
             drives = CompanyDrive.objects.filter(status="PENDING").order_by(
                 "-created_at"
             )
+            result = serialize_queryset(
+                drives, requested_fields(request.GET, PENDING_FIELDS)
+            )
 
-            result = []
-            for drive in drives:
-                result.append(
-                    {
-                        "id": drive.id,
-                        "company_name": drive.company_name,
-                        "point_of_contact": drive.point_of_contact,
-                        "year_of_passing": drive.year_of_passing,
-                        "job_received_date": (
-                            drive.job_received_date.isoformat()
-                            if drive.job_received_date
-                            else None
-                        ),
-                        "job_posted_by": drive.job_posted_by,
-                        "results_declaration_status": drive.results_declaration_status,
-                    }
-                )
-
-            return JsonResponse(
+            return DriveJsonResponse(
                 {"status": "success", "count": len(result), "pending_drives": result}
             )
+        except InvalidFieldsRequest as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error fetching pending drives: {str(e)}")
             return JsonResponse(
@@ -416,6 +684,11 @@ def pending_drives(request):
 
 
 # List completed drives
+@read_from_replica
+@conditional_drive_view(
+    lambda request: CompanyDrive.objects.filter(status="COMPLETED")
+)
+@cached_drive_response("completed_drives")
 def completed_drives(request):
     """API endpoint for listing completed drives"""
     if request.method == "GET":
@@ -423,31 +696,15 @@ def completed_drives(request):
             drives = CompanyDrive.objects.filter(status="COMPLETED").order_by(
                 "-created_at"
             )
+            result = serialize_queryset(
+                drives, requested_fields(request.GET, COMPLETED_FIELDS)
+            )
 
-            result = []
-            for drive in drives:
-                result.append(
-                    {
-                        "id": drive.id,
-                        "company_name": drive.company_name,
-                        "point_of_contact": drive.point_of_contact,
-                        "interview_date": (
-                            drive.interview_date.isoformat()
-                            if drive.interview_date
-                            else None
-                        ),
-                        "results_declaration_date": (
-                            drive.results_declaration_date.isoformat()
-                            if drive.results_declaration_date
-                            else None
-                        ),
-                        "no_of_selects": drive.no_of_selects,
-                    }
-                )
-
-            return JsonResponse(
+            return DriveJsonResponse(
                 {"status": "success", "count": len(result), "completed_drives": result}
             )
+        except InvalidFieldsRequest as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=400)
         except Exception as e:
             logger.error(f"Error fetching completed drives: {str(e)}")
             return JsonResponse(
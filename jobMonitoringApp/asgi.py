@@ -3,6 +3,20 @@ ASGI config for jobMonitoringApp project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Served this way, the drive read endpoints switch to the async views in
+drives/async_views.py, which wait on the database from a bounded thread pool
+instead of blocking the worker. Run it under gunicorn with uvicorn workers:
+
+    gunicorn jobMonitoringApp.asgi:application -k uvicorn.workers.UvicornWorker
+
+or set SERVER_INTERFACE=asgi for the Docker image, whose gunicorn
+configuration (jobMonitoringApp/gunicorn_config.py) then does the same.
+DRIVES_ASYNC_DB_THREADS sizes the pool of each worker. WebSocket connections
+to /ws/drives/ from WEBSOCKET_ALLOWED_ORIGINS receive drive change events
+(see drives/consumers.py); serving them requires channels, and with more
+than one worker a shared channel layer (see CHANNEL_LAYERS in the settings).
+Without channels installed, the application serves HTTP only.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +26,26 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobMonitoringApp.settings')
+os.environ.setdefault("DRIVES_ASYNC_VIEWS", "1")
+
+django_application = get_asgi_application()
+
+try:
+    from channels.routing import ProtocolTypeRouter, URLRouter
+    from channels.security.websocket import OriginValidator
+except ImportError:  # WebSockets are only served through channels
+    application = django_application
+else:
+    # Imported once Django is set up, as the consumers load models
+    from django.conf import settings
+
+    from drives.routing import websocket_urlpatterns
 
-application = get_asgi_application()
+    application = ProtocolTypeRouter(
+        {
+            "http": django_application,
+            "websocket": OriginValidator(
+                URLRouter(websocket_urlpatterns), settings.WEBSOCKET_ALLOWED_ORIGINS
+            ),
+        }
+    )
@@ -0,0 +1,14 @@
+"""
+MySQL backend with the process-local pool and health checks of
+jobMonitoringApp.db.pool. Select it with
+ENGINE = "jobMonitoringApp.db.mysql".
+"""
+
+from django.db.backends.mysql import base
+
+from ..pool import PooledConnectionMixin
+
+
+class DatabaseWrapper(PooledConnectionMixin, base.DatabaseWrapper):
+    def ping(self, connection):
+        connection.ping()
@@ -0,0 +1,128 @@
+"""
+Process-local connection pool and health checks for database backends.
+
+Mixed into a backend's DatabaseWrapper (see jobMonitoringApp/db/mysql), it
+reads two keys of the DATABASES entry:
+
+POOL_SIZE
+    Idle connections kept per alias and worker process (0 disables the
+    pool). Closing a connection hands it back to the pool instead of
+    tearing it down, and the next connect() of any thread of the process
+    takes it after a ping, skipping the TCP and authentication handshake.
+CONN_HEALTH_CHECKS
+    Ping a persistent connection before its first query of each request,
+    reconnecting if the server dropped it meanwhile. Django 4.1+ does this
+    itself; the mixin only fills in for older versions.
+"""
+
+import queue
+import threading
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+NATIVE_HEALTH_CHECKS = hasattr(BaseDatabaseWrapper, "close_if_health_check_failed")
+
+_pools = {}
+_pools_lock = threading.Lock()
+_stats = {}
+
+
+def get_pool(alias, size):
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = queue.LifoQueue(maxsize=size)
+            _stats[alias] = {"created": 0, "reused": 0, "discarded": 0}
+        return _pools[alias]
+
+
+def record(alias, outcome):
+    with _pools_lock:
+        _stats[alias][outcome] += 1
+
+
+def pool_stats():
+    """Connection counters and idle connections per pooled alias"""
+    with _pools_lock:
+        return {
+            alias: {**_stats[alias], "idle": pool.qsize()}
+            for alias, pool in _pools.items()
+        }
+
+
+class PooledConnectionMixin:
+    """Expects the backend's ``Database`` driver module for its errors"""
+
+    @property
+    def pool(self):
+        size = self.settings_dict.get("POOL_SIZE") or 0
+        return get_pool(self.alias, size) if size > 0 else None
+
+    def ping(self, connection):
+        """Raise if ``connection`` no longer reaches the server"""
+        raise NotImplementedError
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        while True:
+            try:
+                connection = pool.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self.ping(connection)
+            except self.Database.Error:
+                record(self.alias, "discarded")
+                self.discard(connection)
+                continue
+            record(self.alias, "reused")
+            return connection
+        record(self.alias, "created")
+        return super().get_new_connection(conn_params)
+
+    def _close(self):
+        pool = self.pool
+        # A connection closed inside atomic() stays referenced until the
+        # block exits, and one that raised may be broken: neither is shared
+        if (
+            pool is None
+            or self.connection is None
+            or self.in_atomic_block
+            or self.errors_occurred
+        ):
+            return super()._close()
+        try:
+            # Return the connection without the transaction it may hold
+            self.connection.rollback()
+            pool.put_nowait(self.connection)
+        except (self.Database.Error, queue.Full):
+            super()._close()
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except self.Database.Error:
+            pass
+
+    def connect(self):
+        super().connect()
+        self.health_check_pending = False
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # Called as every request starts and finishes
+        self.health_check_pending = True
+
+    def ensure_connection(self):
+        if (
+            not NATIVE_HEALTH_CHECKS
+            and self.settings_dict.get("CONN_HEALTH_CHECKS")
+            and getattr(self, "health_check_pending", False)
+            and self.connection is not None
+            and not self.in_atomic_block
+        ):
+            self.health_check_pending = False
+            if not self.is_usable():
+                self.close()
+        super().ensure_connection()
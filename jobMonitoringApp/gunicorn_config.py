@@ -0,0 +1,91 @@
+"""
+Gunicorn configuration of the Docker image:
+
+    gunicorn -c python:jobMonitoringApp.gunicorn_config
+
+SERVER_INTERFACE=asgi serves jobMonitoringApp.asgi with uvicorn workers
+instead of jobMonitoringApp.wsgi with threaded sync workers. Workers follow
+the CPUs available to the container, WEB_CONCURRENCY overrides them; each
+sync worker runs GUNICORN_THREADS threads, 4 by default.
+
+The app is preloaded and warmed up (see jobMonitoringApp/warmup.py) in the
+master before it forks, so a new worker starts with the URLconfs and model
+caches in place and only opens its database connections. Those go to the
+connection pool, which defaults to one connection per worker thread
+(DATABASE_POOL_SIZE overrides it). Workers are recycled after
+GUNICORN_MAX_REQUESTS requests, each after a different number so they don't
+all restart at once.
+
+Every worker is a separate process, so state kept in local memory is per
+worker. Deployments with more than one worker should set:
+
+- DRIVES_CACHE_LOCATION, without which the drive response cache is off;
+- SESSION_CACHE_LOCATION, without which sessions are read from the
+  database on every request;
+- LOGIN_RATE_LIMIT_CACHE_LOCATION, without which every worker keeps its own
+  sign-in buckets, letting a client make up to one full allowance of
+  attempts per worker;
+- CHANNEL_LAYER_REDIS_URL, without which WebSocket clients miss the changes
+  made by other workers.
+
+Staff contexts stay cached per worker for up to STAFF_CONTEXT_TIMEOUT
+seconds after a change.
+
+Command line options take precedence over these values.
+"""
+
+import os
+
+ASGI = os.getenv("SERVER_INTERFACE") == "asgi"
+CPUS = (
+    len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+) or 1
+
+wsgi_app = (
+    "jobMonitoringApp.asgi:application" if ASGI else "jobMonitoringApp.wsgi:application"
+)
+bind = f"0.0.0.0:{os.getenv('PORT', 8080)}"
+
+if ASGI:
+    # One event loop per CPU; DRIVES_ASYNC_DB_THREADS sizes their database
+    # threads
+    worker_class = "uvicorn.workers.UvicornWorker"
+    workers = int(os.getenv("WEB_CONCURRENCY", CPUS))
+    database_threads = int(os.getenv("DRIVES_ASYNC_DB_THREADS", 10))
+else:
+    # Threads keep a worker busy while its requests wait on MySQL. Their
+    # number follows how long requests wait, not the CPUs, which the workers
+    # already scale with; it also sizes each worker's pool, so workers x
+    # threads is the MySQL connection count of the container.
+    workers = int(os.getenv("WEB_CONCURRENCY", CPUS * 2 + 1))
+    threads = int(os.getenv("GUNICORN_THREADS", 4))
+    database_threads = threads
+
+# Read by the settings, which the app imports after this file
+os.environ.setdefault("DATABASE_POOL_SIZE", str(database_threads))
+
+preload_app = True
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    """Warm the preloaded app once, before any worker is forked"""
+    if not server.cfg.preload_app:
+        return
+    from jobMonitoringApp.warmup import close_connections, warm_up
+
+    urls, models = warm_up()
+    # Forked workers must not share the master's database sockets
+    close_connections()
+    server.log.info("Warmed up %d URL names and %d models", urls, models)
+
+
+def post_worker_init(worker):
+    """Fill the worker's connection pools before it accepts requests"""
+    from jobMonitoringApp.warmup import warm_up
+
+    warm_up()
@@ -0,0 +1,322 @@
+"""
+Per-request instrumentation and the Prometheus endpoint.
+
+RequestMetricsMiddleware times every request and reports where the time went
+in a ``Server-Timing`` header:
+
+    Server-Timing: db;dur=4.1;desc="3 queries", serialize;dur=2.3,
+                   encode;dur=0.9, view;dur=9.6
+
+``db`` is measured by an execute wrapper installed on every database
+connection, ``serialize`` and ``encode`` by the ``timed`` blocks in
+drives/serializers.py (minus any query time they contain), and ``view`` is
+the whole response time. The state of the current request lives in a
+context variable, so the async views' database threads report into it too.
+
+Each request is also folded into per-URL-name histograms of response time
+and query count, served at /api/metrics in the Prometheus text format along
+with the drive cache, sign-in rate limiter and connection pool counters.
+Like those counters, the histograms belong to one worker process; with
+several workers each scrape sees the worker that answered it. Scrapers send
+``Authorization: Bearer <settings.METRICS_TOKEN>``; signed-in superusers
+may read the endpoint too.
+"""
+
+import hmac
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+from accounts.ratelimit import rate_limit_stats
+from drives.cache import cache_stats
+
+from .db.pool import pool_stats
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+PHASES = ("serialize", "encode")
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = ("queries", "db", "phases")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.phases = {}
+
+    def server_timing(self, duration):
+        parts = [f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"']
+        parts += [
+            f"{phase};dur={seconds * 1000:.1f}"
+            for phase, seconds in self.phases.items()
+        ]
+        parts.append(f"view;dur={duration * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper adding each query to the current request's timings"""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += perf_counter() - start
+        timings.queries += 1
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+
+
+class timed:
+    """
+    Add the time spent in the block to ``phase`` of the current request,
+    leaving out the queries it runs (lazy querysets often execute inside).
+    """
+
+    __slots__ = ("phase", "timings", "start", "db")
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.timings = _current.get()
+        if self.timings is not None:
+            self.db = self.timings.db
+            self.start = perf_counter()
+
+    def __exit__(self, *exc_info):
+        timings = self.timings
+        if timings is not None:
+            elapsed = perf_counter() - self.start - (timings.db - self.db)
+            timings.phases[self.phase] = timings.phases.get(self.phase, 0) + elapsed
+
+
+class RouteStats:
+    __slots__ = ("durations", "queries", "seconds", "query_count", "phases")
+
+    def __init__(self):
+        # Per-bucket counts, the last one for values above every bound
+        self.durations = [0] * (len(DURATION_BUCKETS) + 1)
+        self.queries = [0] * (len(QUERY_BUCKETS) + 1)
+        self.seconds = 0.0
+        self.query_count = 0
+        self.phases = {"db": 0.0, **{phase: 0.0 for phase in PHASES}}
+
+
+_routes = {}
+_routes_lock = threading.Lock()
+
+
+def observe(route, duration, timings):
+    duration_bucket = bisect_left(DURATION_BUCKETS, duration)
+    query_bucket = bisect_left(QUERY_BUCKETS, timings.queries)
+    with _routes_lock:
+        stats = _routes.get(route)
+        if stats is None:
+            stats = _routes[route] = RouteStats()
+        stats.durations[duration_bucket] += 1
+        stats.queries[query_bucket] += 1
+        stats.seconds += duration
+        stats.query_count += timings.queries
+        stats.phases["db"] += timings.db
+        for phase, seconds in timings.phases.items():
+            stats.phases[phase] = stats.phases.get(phase, 0.0) + seconds
+
+
+def reset_metrics():
+    with _routes_lock:
+        _routes.clear()
+
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or match.route
+
+
+class RequestMetricsMiddleware:
+    """
+    Sync and async capable: it comes first, and a sync-only middleware there
+    would have Django 3.2 run every ASGI request's middleware chain on the
+    one thread asgiref keeps for thread-sensitive code, one at a time.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # Connections opened before the middleware was loaded
+        for connection in connections.all():
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, perf_counter() - start, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, perf_counter() - start, timings)
+
+    def finish(self, request, response, duration, timings):
+        observe(route_name(request), duration, timings)
+        response["Server-Timing"] = timings.server_timing(duration)
+        return response
+
+
+def label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def histogram_lines(name, route, bounds, counts, total):
+    lines = []
+    cumulative = 0
+    for bound, count in zip((*bounds, "+Inf"), counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_sum{{route="{route}"}} {total}')
+    lines.append(f'{name}_count{{route="{route}"}} {cumulative}')
+    return lines
+
+
+def request_metric_lines():
+    with _routes_lock:
+        routes = {
+            route: (
+                list(stats.durations),
+                list(stats.queries),
+                stats.seconds,
+                stats.query_count,
+                dict(stats.phases),
+            )
+            for route, stats in _routes.items()
+        }
+    durations, queries, phases = [], [], []
+    for route, (duration_counts, query_counts, seconds, query_count, totals) in sorted(
+        routes.items()
+    ):
+        route = label(route)
+        durations += histogram_lines(
+            "http_request_duration_seconds",
+            route,
+            DURATION_BUCKETS,
+            duration_counts,
+            seconds,
+        )
+        queries += histogram_lines(
+            "http_request_queries", route, QUERY_BUCKETS, query_counts, query_count
+        )
+        phases += [
+            f'http_request_phase_seconds_total{{route="{route}",phase="{phase}"}} '
+            f"{total}"
+            for phase, total in totals.items()
+        ]
+    return [
+        "# HELP http_request_duration_seconds Response time by URL name",
+        "# TYPE http_request_duration_seconds histogram",
+        *durations,
+        "# HELP http_request_queries Database queries per request by URL name",
+        "# TYPE http_request_queries histogram",
+        *queries,
+        "# HELP http_request_phase_seconds_total Time spent in database queries, "
+        "serialization and JSON encoding by URL name",
+        "# TYPE http_request_phase_seconds_total counter",
+        *phases,
+    ]
+
+
+def component_metric_lines():
+    lines = [
+        "# HELP drives_response_cache_total Drive response cache lookups",
+        "# TYPE drives_response_cache_total counter",
+        *(
+            f'drives_response_cache_total{{outcome="{outcome}"}} {count}'
+            for outcome, count in cache_stats().items()
+        ),
+        "# HELP signin_rate_limit_rejections_total Sign-in attempts rejected",
+        "# TYPE signin_rate_limit_rejections_total counter",
+        *(
+            f'signin_rate_limit_rejections_total{{scope="{label(scope)}"}} {count}'
+            for scope, count in rate_limit_stats().items()
+        ),
+        "# HELP db_pool_connections_total Connections created, reused and "
+        "discarded by the pool",
+        "# TYPE db_pool_connections_total counter",
+    ]
+    pools = pool_stats()
+    for alias, stats in pools.items():
+        lines += [
+            f'db_pool_connections_total{{alias="{label(alias)}",event="{event}"}} '
+            f"{stats[event]}"
+            for event in ("created", "reused", "discarded")
+        ]
+    lines += [
+        "# HELP db_pool_idle_connections Idle connections held by the pool",
+        "# TYPE db_pool_idle_connections gauge",
+        *(
+            f'db_pool_idle_connections{{alias="{label(alias)}"}} {stats["idle"]}'
+            for alias, stats in pools.items()
+        ),
+    ]
+    return lines
+
+
+def scrape_authorized(request):
+    """Bearer METRICS_TOKEN, or a signed-in superuser"""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        expected = f"Bearer {token}".encode()
+        given = request.META.get("HTTP_AUTHORIZATION", "").encode()
+        if hmac.compare_digest(given, expected):
+            return True
+    return request.user.is_superuser
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint"""
+    if request.method != "GET":
+        return HttpResponse(status=405)
+    if not scrape_authorized(request):
+        if request.user.is_authenticated:
+            return HttpResponse(status=403)
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+    body = "\n".join([*request_metric_lines(), *component_metric_lines()]) + "\n"
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,428 @@
+"""
+On-demand request profiling.
+
+ProfilingMiddleware captures a request in one of two ways:
+
+requested
+    A placement staff member adds ``?profile=1`` or an ``X-Profile: 1``
+    header. The response is produced under cProfile and the capture holds
+    the functions with the highest cumulative time.
+slow
+    With PROFILING_SLOW_REQUEST_MS set, every request is watched by a
+    background sampler that records the request thread's stack every
+    PROFILING_SAMPLE_INTERVAL_MS. Requests over the threshold keep the
+    samples as collapsed stacks ("outer;...;inner count", the input format
+    of flame graph tools); the others discard them.
+
+Both kinds also record every SQL statement with its duration, and the
+slowest SELECTs with their EXPLAIN output. Parameters are only kept for
+SELECTs outside the session and auth tables, and requests to
+PROFILING_EXCLUDED_ROUTES, which carry passwords and session keys, are never
+captured. Captures are JSON files readable by the server's user only, kept
+in PROFILING_DIR as a ring buffer of the newest PROFILING_MAX_CAPTURES and
+listed at /api/profiles/ for superusers.
+
+Only the thread that runs the middleware is profiled or sampled. Served
+through WSGI that is also the thread running the view. Served through ASGI
+the middleware awaits the response in the event loop while views run on
+other threads, so captures there hold the request's statements, EXPLAINs
+and duration but neither a profile nor stack samples; the same views profile
+fully on a WSGI worker.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from django.urls import Resolver404, resolve
+
+from accounts.staff import is_staff
+
+from .metrics import route_name
+
+CAPTURE_ID = re.compile(r"^\d+-\d+$")
+# Statements on these tables may carry session keys, session data or
+# password hashes in their parameters
+REDACTED_TABLES = re.compile(r"\b(django_session|auth_\w+)\b")
+# Sign-in and session views, never captured
+EXCLUDED_ROUTES = ("signin", "signout", "auth_status")
+PROFILE_ROWS = 40
+MAX_STACK_DEPTH = 60
+# Capture fields returned by the profile list
+SUMMARY_KEYS = (
+    "id",
+    "captured_at",
+    "trigger",
+    "method",
+    "path",
+    "route",
+    "status_code",
+    "duration_ms",
+)
+
+_statements = ContextVar("profiled_statements", default=None)
+
+
+def get_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def capture_dir():
+    return get_setting("PROFILING_DIR", None) or os.path.join(
+        settings.BASE_DIR, "profiles"
+    )
+
+
+def capture_allowed(request):
+    try:
+        url_name = resolve(request.path_info).url_name
+    except Resolver404:
+        return True
+    return url_name not in get_setting("PROFILING_EXCLUDED_ROUTES", EXCLUDED_ROUTES)
+
+
+def params_kept(sql):
+    """Whether the parameters of ``sql`` may be stored in a capture"""
+    is_select = sql.lstrip().upper().startswith("SELECT")
+    return is_select and REDACTED_TABLES.search(sql) is None
+
+
+def record_statement(execute, sql, params, many, context):
+    """Execute wrapper keeping each statement of a profiled request"""
+    statements = _statements.get()
+    if statements is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        statements.append(
+            (context["connection"].alias, sql, params, many, perf_counter() - start)
+        )
+
+
+def install_statement_recorder(sender=None, connection=None, **kwargs):
+    if record_statement not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_statement)
+
+
+connection_created.connect(install_statement_recorder)
+
+
+def explain(alias, sql, params):
+    connection = connections[alias]
+    prefix = connection.ops.explain_query_prefix()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            return "\n".join(
+                " ".join(str(column) for column in row) for row in cursor.fetchall()
+            )
+    except DatabaseError as e:
+        return f"EXPLAIN failed: {e}"
+
+
+def describe_statements(statements):
+    """Statements as dicts, EXPLAINing the slowest distinct SELECTs"""
+    described = [
+        {
+            "alias": alias,
+            "sql": sql,
+            # None when redacted; EXPLAIN needs them, so those are skipped
+            "params": (
+                [str(param) for param in params or ()]
+                if not many and params_kept(sql)
+                else None
+            ),
+            "duration_ms": duration * 1000,
+        }
+        for alias, sql, params, many, duration in statements
+    ]
+    explained = set()
+    limit = get_setting("PROFILING_EXPLAIN_LIMIT", 20)
+    for item in sorted(described, key=lambda item: -item["duration_ms"]):
+        if len(explained) >= limit:
+            break
+        key = (item["alias"], item["sql"])
+        if key in explained or item["params"] is None:
+            continue
+        explained.add(key)
+        item["explain"] = explain(item["alias"], item["sql"], item["params"])
+    return described
+
+
+class Sampler(threading.Thread):
+    """Samples the stacks of the threads serving watched requests"""
+
+    def __init__(self, interval):
+        super().__init__(name="request-sampler", daemon=True)
+        self.interval = interval
+        self.watched = {}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+    def watch(self, ident):
+        samples = Counter()
+        with self.lock:
+            self.watched[ident] = samples
+        self.wakeup.set()
+        return samples
+
+    def unwatch(self, ident):
+        with self.lock:
+            self.watched.pop(ident, None)
+
+    def run(self):
+        while True:
+            with self.lock:
+                watched = dict(self.watched)
+                if not watched:
+                    self.wakeup.clear()
+            if not watched:
+                self.wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            for ident, samples in watched.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    samples[collapse(frame)] += 1
+            time.sleep(self.interval)
+
+
+def collapse(frame):
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            interval = get_setting("PROFILING_SAMPLE_INTERVAL_MS", 5) / 1000
+            _sampler = Sampler(interval)
+            _sampler.start()
+        return _sampler
+
+
+def cprofile_rows(profiler):
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats("cumulative").print_stats(PROFILE_ROWS)
+    return stream.getvalue()
+
+
+def save_capture(capture):
+    """Write ``capture`` and drop the oldest ones beyond the ring size"""
+    directory = capture_dir()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    path = os.path.join(directory, f"{capture['id']}.json")
+    fd = os.open(path + ".tmp", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(capture, f)
+    os.replace(path + ".tmp", path)
+
+    names = sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+    for name in names[: -get_setting("PROFILING_MAX_CAPTURES", 50)]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:  # removed by another worker
+            pass
+
+
+def load_capture(capture_id):
+    if not CAPTURE_ID.match(capture_id):
+        return None
+    try:
+        with open(os.path.join(capture_dir(), f"{capture_id}.json")) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def list_captures():
+    """Summaries of the stored captures, newest first"""
+    directory = capture_dir()
+    if not os.path.isdir(directory):
+        return []
+    summaries = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        capture = load_capture(name[: -len(".json")])
+        if capture is not None:
+            summary = {key: capture[key] for key in SUMMARY_KEYS}
+            summary["queries"] = len(capture["statements"])
+            summaries.append(summary)
+    return summaries
+
+
+def profile_flagged(request):
+    return request.GET.get("profile") == "1" or request.headers.get("X-Profile") == "1"
+
+
+def profile_requested(request):
+    return profile_flagged(request) and is_staff(request.user)
+
+
+class ProfilingMiddleware:
+    """
+    Must come after AuthenticationMiddleware, which sets request.user. Sync
+    and async capable, so it does not put ASGI requests back on a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        for connection in connections.all():
+            install_statement_recorder(connection=connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        slow_ms = get_setting("PROFILING_SLOW_REQUEST_MS", 0)
+        requested = profile_requested(request)
+        if (requested or slow_ms) and capture_allowed(request):
+            if requested:
+                return self.profile(request)
+            return self.sample(request, slow_ms)
+        return self.get_response(request)
+
+    def profile(self, request):
+        profiler = cProfile.Profile()
+        statements = []
+        token = _statements.set(statements)
+        start = perf_counter()
+        try:
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        finally:
+            _statements.reset(token)
+        duration = perf_counter() - start
+        capture = self.capture(request, response, duration, "requested", statements)
+        capture["profile"] = cprofile_rows(profiler)
+        save_capture(capture)
+        response["X-Profile-Id"] = capture["id"]
+        return response
+
+    def sample(self, request, slow_ms):
+        sampler = get_sampler()
+        ident = threading.get_ident()
+        samples = sampler.watch(ident)
+        statements = []
+        token = _statements.set(statements)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _statements.reset(token)
+            sampler.unwatch(ident)
+        duration = perf_counter() - start
+        if duration * 1000 >= slow_ms:
+            capture = self.capture(request, response, duration, "slow", statements)
+            capture["samples"] = [
+                f"{stack} {count}" for stack, count in samples.most_common()
+            ]
+            save_capture(capture)
+            response["X-Profile-Id"] = capture["id"]
+        return response
+
+    async def __acall__(self, request):
+        slow_ms = get_setting("PROFILING_SLOW_REQUEST_MS", 0)
+        # Loading request.user queries the session, so only flagged requests
+        # pay for the thread hop
+        requested = profile_flagged(request) and await sync_to_async(is_staff)(
+            request.user
+        )
+        if not (requested or slow_ms) or not capture_allowed(request):
+            return await self.get_response(request)
+
+        statements = []
+        # Set across the await: the views' threads run in copies of this
+        # context and append to the same list
+        token = _statements.set(statements)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _statements.reset(token)
+        duration = perf_counter() - start
+        if requested or duration * 1000 >= slow_ms:
+            trigger = "requested" if requested else "slow"
+            # EXPLAIN queries and file writes block
+            await sync_to_async(self.save)(
+                request, response, duration, trigger, statements
+            )
+        return response
+
+    def save(self, request, response, duration, trigger, statements):
+        capture = self.capture(request, response, duration, trigger, statements)
+        save_capture(capture)
+        response["X-Profile-Id"] = capture["id"]
+
+    def capture(self, request, response, duration, trigger, statements):
+        return {
+            "id": f"{time.time_ns()}-{os.getpid()}",
+            "captured_at": time.time(),
+            "trigger": trigger,
+            "method": request.method,
+            "path": request.get_full_path(),
+            "route": route_name(request),
+            "user": getattr(request.user, "username", None),
+            "status_code": response.status_code,
+            "duration_ms": duration * 1000,
+            "statements": describe_statements(statements),
+        }
+
+
+def is_superuser(user):
+    return user.is_superuser
+
+
+@login_required
+@user_passes_test(is_superuser)
+def profile_list(request):
+    """API endpoint listing the stored request profiles, newest first"""
+    return JsonResponse({"status": "success", "profiles": list_captures()})
+
+
+@login_required
+@user_passes_test(is_superuser)
+def profile_detail(request, capture_id):
+    """API endpoint returning one stored request profile"""
+    capture = load_capture(capture_id)
+    if capture is None:
+        return JsonResponse(
+            {"status": "error", "message": "Profile not found"}, status=404
+        )
+    return JsonResponse({"status": "success", "profile": capture})
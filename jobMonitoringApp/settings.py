@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,8 +44,14 @@ INSTALLED_APPS = [
     "corsheaders",
     "drives",  # Drives app
 ]
+# WebSocket push of drive changes (see drives/live.py). Without channels the
+# app still serves HTTP and writes publish nothing.
+if importlib.util.find_spec("channels") is not None:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index("drives"), "channels")
 
 MIDDLEWARE = [
+    # First, so its Server-Timing "view" phase covers the whole response
+    "jobMonitoringApp.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -51,6 +60,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "jobMonitoringApp.profiling.ProfilingMiddleware",
 ]
 CORS_ALLOW_ALL_ORIGINS = True  # only for de
 CSRF_TRUSTED_ORIGINS = [
@@ -122,16 +132,173 @@ from dotenv import load_dotenv
 load_dotenv()
 import os
 # Replace the DATABASES section of your settings.py with this
+#
+# Connections persist for DATABASE_CONN_MAX_AGE seconds instead of being
+# opened for every request, and are pinged before their first query of each
+# request. DATABASE_POOL_SIZE > 0 also keeps that many idle connections per
+# worker process for other threads to reuse (see jobMonitoringApp/db/pool.py).
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        "ENGINE": "jobMonitoringApp.db.mysql",
         "NAME": os.getenv("databasename"),  # Your full database name
         "USER": os.getenv('databaseuser'),  # Replace with your actual MySQL user (created in cPanel)
         "PASSWORD": os.getenv('databasepassword'),  # The password you set
         "HOST": os.getenv('databasehost'),  # Not localhost
         "PORT": os.getenv('databaseport'),  # Default MySQL port
+        "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        "POOL_SIZE": int(os.getenv("DATABASE_POOL_SIZE", 0)),
+    }
+}
+# Read replica for the GET requests of the drive views (see drives/routers.py),
+# enabled by setting DATABASE_REPLICA_HOST. Each committed drive change sends
+# reads back to the primary for DRIVES_REPLICA_PIN_SECONDS, which should exceed
+# the usual replication lag.
+if os.getenv("DATABASE_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("DATABASE_REPLICA_HOST"),
+        "PORT": os.getenv("DATABASE_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["drives.routers.ReplicaRouter"]
+DRIVES_REPLICA_ALIAS = "replica"
+DRIVES_REPLICA_PIN_SECONDS = int(os.getenv("DRIVES_REPLICA_PIN_SECONDS", 5))
+
+# Caches
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+# The drive read endpoints cache their responses in the "drives" alias (see
+# drives/cache.py). A change only invalidates the cache it can reach, so that
+# cache must be shared by every worker process: the response cache is off
+# unless DRIVES_CACHE_LOCATION names a directory all workers use.
+if os.getenv("DRIVES_CACHE_LOCATION"):
+    CACHES["drives"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("DRIVES_CACHE_LOCATION"),
     }
+DRIVES_CACHE_ALIAS = "drives" if "drives" in CACHES else None
+DRIVES_CACHE_TIMEOUT = int(os.getenv("DRIVES_CACHE_TIMEOUT", 300))
+# Session store for SESSION_MODE=cached_db, shared between workers through
+# SESSION_CACHE_LOCATION
+if os.getenv("SESSION_CACHE_LOCATION"):
+    CACHES["sessions"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("SESSION_CACHE_LOCATION"),
+    }
+
+# Async read views, switched on by jobMonitoringApp/asgi.py. Their queries run
+# on a pool of DRIVES_ASYNC_DB_THREADS threads per worker process, which is
+# also the most database connections such a worker opens for them.
+DRIVES_ASYNC_VIEWS = os.getenv("DRIVES_ASYNC_VIEWS") == "1"
+DRIVES_ASYNC_DB_THREADS = int(os.getenv("DRIVES_ASYNC_DB_THREADS", 10))
+
+# WebSocket push of drive changes (see drives/live.py). Events reach the
+# sockets of other processes only through a shared channel layer, enabled by
+# pointing CHANNEL_LAYER_REDIS_URL at a Redis server (needs channels_redis).
+# The in-memory fallback only reaches sockets held by the process that made
+# the change: a single ASGI worker works, but writes served by WSGI workers,
+# which hold no sockets, reach no one.
+ASGI_APPLICATION = "jobMonitoringApp.asgi.application"
+if os.getenv("CHANNEL_LAYER_REDIS_URL"):
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [os.getenv("CHANNEL_LAYER_REDIS_URL")]},
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+    }
+# Origins allowed to open the drive WebSocket. Browsers send cookies with
+# WebSocket handshakes from any site and CORS does not apply to them, so this
+# is an explicit list even when CORS_ALLOW_ALL_ORIGINS is on. Comma-separated
+# in WEBSOCKET_ALLOWED_ORIGINS.
+WEBSOCKET_ALLOWED_ORIGINS = (
+    os.getenv("WEBSOCKET_ALLOWED_ORIGINS").split(",")
+    if os.getenv("WEBSOCKET_ALLOWED_ORIGINS")
+    else CORS_ALLOWED_ORIGINS
+)
+
+# Request profiling (see jobMonitoringApp/profiling.py). Placement staff
+# profile a single request with ?profile=1 or an "X-Profile: 1" header, and
+# requests slower than PROFILING_SLOW_REQUEST_MS (0 disables it) are sampled
+# automatically, except the sign-in and session routes. Captures are kept in
+# PROFILING_DIR, created readable by the server's user only, newest
+# PROFILING_MAX_CAPTURES only.
+PROFILING_DIR = os.getenv("PROFILING_DIR", str(BASE_DIR / "profiles"))
+PROFILING_MAX_CAPTURES = int(os.getenv("PROFILING_MAX_CAPTURES", 50))
+PROFILING_SLOW_REQUEST_MS = int(os.getenv("PROFILING_SLOW_REQUEST_MS", 0))
+PROFILING_SAMPLE_INTERVAL_MS = 5
+PROFILING_EXPLAIN_LIMIT = 20
+PROFILING_EXCLUDED_ROUTES = ["signin", "signout", "auth_status"]
+
+# Prometheus endpoint /api/metrics (see jobMonitoringApp/metrics.py). Scrapers
+# authenticate with "Authorization: Bearer <METRICS_TOKEN>"; without a token
+# only signed-in superusers can read it.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Staff context of signed-in users (see accounts/staff.py). Invalidation only
+# reaches the process that made a change unless the alias is shared, so the
+# timeout bounds how long other workers can serve a stale rank.
+STAFF_CONTEXT_CACHE_ALIAS = "default"
+STAFF_CONTEXT_TIMEOUT = int(os.getenv("STAFF_CONTEXT_TIMEOUT", 60))
+
+# Sessions
+# SESSION_MODE selects the session engine:
+#   db              one django_session query per request (the default).
+#   cached_db       read sessions from the "sessions" cache, querying the
+#                   django_session table only on a miss. A sign-out only
+#                   evicts the session from the cache it can reach, so this
+#                   mode requires SESSION_CACHE_LOCATION, a directory shared
+#                   by every worker, and is the default when it is set.
+#   signed_cookies  keep the session in a signed cookie with no server-side
+#                   state; sessions cannot be revoked before they expire.
+# Expired rows are removed in batches by "manage.py purge_sessions".
+SESSION_ENGINES = {
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+    "db": "django.contrib.sessions.backends.db",
+}
+SESSION_MODE = os.getenv(
+    "SESSION_MODE", "cached_db" if "sessions" in CACHES else "db"
+)
+if SESSION_MODE not in SESSION_ENGINES:
+    raise ImproperlyConfigured(
+        f"SESSION_MODE must be one of: {', '.join(SESSION_ENGINES)}"
+    )
+if SESSION_MODE == "cached_db" and "sessions" not in CACHES:
+    raise ImproperlyConfigured(
+        "SESSION_MODE=cached_db needs SESSION_CACHE_LOCATION, a cache directory "
+        "shared by every worker"
+    )
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+SESSION_CACHE_ALIAS = "sessions"
+
+# Sign-in rate limiting (see accounts/ratelimit.py): a bucket of "capacity"
+# attempts per client IP and per username, refilled at one attempt every
+# "refill_seconds". The buckets are kept per worker process unless
+# LOGIN_RATE_LIMIT_CACHE_LOCATION names a directory all workers share.
+# LOGIN_RATE_LIMIT_PROXY_COUNT is the number of reverse proxies in front of
+# the app, whose X-Forwarded-For entries give the client IP. It defaults to
+# the one proxy of the Render deployment; set it to 0 when clients connect
+# directly, as with runserver.
+if os.getenv("LOGIN_RATE_LIMIT_CACHE_LOCATION"):
+    CACHES["ratelimit"] = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("LOGIN_RATE_LIMIT_CACHE_LOCATION"),
+    }
+LOGIN_RATE_LIMIT_CACHE_ALIAS = "ratelimit" if "ratelimit" in CACHES else "default"
+LOGIN_RATE_LIMITS = {
+    "ip": {"capacity": 10, "refill_seconds": 6},
+    "username": {"capacity": 5, "refill_seconds": 30},
 }
+LOGIN_RATE_LIMIT_PROXY_COUNT = int(os.getenv("LOGIN_RATE_LIMIT_PROXY_COUNT", 1))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
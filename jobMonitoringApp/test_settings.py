@@ -0,0 +1,21 @@
+"""
+Settings for running the test suite without MySQL:
+
+    python manage.py test --settings=jobMonitoringApp.test_settings
+
+Two SQLite databases stand in for the primary and its read replica. They are
+not mirrored, so tests can tell which one a query went to.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "test_primary.sqlite3",
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "test_replica.sqlite3",
+    },
+}
@@ -0,0 +1,413 @@
+import asyncio
+import importlib
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+from datetime import date
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import path
+
+from accounts.models import PlacementStaff, StaffRank
+from drives import async_views
+from drives.cache import get_cache
+from drives.models import CompanyDrive
+from drives.routers import PIN_KEY, pin_cache, replica_alias
+
+from .metrics import RequestTimings, observe, reset_metrics
+from .warmup import warm_up
+
+# Long enough for a loaded machine, short enough to fail fast when the
+# requests are served one at a time
+RENDEZVOUS_TIMEOUT = 5
+
+
+class Rendezvous:
+    """Lets waiters through once ``parties`` of them are waiting together"""
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.waiting = 0
+        self.complete = asyncio.Event()
+
+    async def wait(self):
+        self.waiting += 1
+        if self.waiting == self.parties:
+            self.complete.set()
+        await asyncio.wait_for(self.complete.wait(), RENDEZVOUS_TIMEOUT)
+
+
+rendezvous = None
+
+
+async def ping(request):
+    return HttpResponse("pong")
+
+
+async def meet(request):
+    """Answers only while another request is inside this view too"""
+    await rendezvous.wait()
+    return HttpResponse("met")
+
+
+urlpatterns = [
+    path("ping/", ping, name="ping"),
+    path("meet/", meet, name="meet"),
+    path("api/drives/", async_views.drive_list, name="drive-list"),
+    path(
+        "api/drives/<int:drive_id>/", async_views.drive_detail, name="drive_detail"
+    ),
+]
+
+
+def make_drive(company_name, using="default"):
+    return CompanyDrive.objects.using(using).create(
+        company_name=company_name,
+        point_of_contact="Contact",
+        year_of_passing=2024,
+        job_received_date=date(2024, 1, 1),
+        job_posted_date=date(2024, 1, 2),
+        job_posted_by="Placement Cell",
+    )
+
+
+async def asgi_get(application, url, query_string=b"", headers=()):
+    """``(status, headers, body)`` of a GET served by an ASGI application"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url,
+        "raw_path": url.encode(),
+        "query_string": query_string,
+        "headers": [(b"host", b"testserver"), *headers],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    body_read = False
+    disconnected = asyncio.Event()
+    messages = []
+
+    async def receive():
+        nonlocal body_read
+        if not body_read:
+            body_read = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    disconnected.set()
+    start, *body = messages
+    headers = {
+        name.decode().lower(): value.decode() for name, value in start["headers"]
+    }
+    return start["status"], headers, b"".join(part.get("body", b"") for part in body)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsgiStackTests(SimpleTestCase):
+    def adapted_middleware(self):
+        """Middleware Django wraps in a sync/async adapter for ASGIHandler"""
+        logger = logging.getLogger("django.request")
+        with override_settings(DEBUG=True), self.assertLogs(logger, "DEBUG") as logs:
+            ASGIHandler()
+            # assertLogs fails without any record
+            logger.debug("loaded")
+        return [
+            record.args[0].removeprefix("middleware ")
+            for record in logs.records
+            if "adapted" in record.msg
+        ]
+
+    def test_middleware_runs_in_the_event_loop(self):
+        self.assertEqual(self.adapted_middleware(), [])
+
+    def test_request_through_asgi_handler(self):
+        status, headers, body = asyncio.run(asgi_get(ASGIHandler(), "/ping/"))
+        self.assertEqual((status, body), (200, b"pong"))
+        self.assertRegex(headers["server-timing"], r"view;dur=[\d.]+$")
+
+    def test_requests_are_served_concurrently(self):
+        global rendezvous
+        rendezvous = Rendezvous(2)
+        application = ASGIHandler()
+
+        async def meet_twice():
+            return await asyncio.gather(
+                asgi_get(application, "/meet/"), asgi_get(application, "/meet/")
+            )
+
+        for status, headers, body in asyncio.run(meet_twice()):
+            self.assertEqual((status, body), (200, b"met"))
+            self.assertIn("server-timing", headers)
+
+
+class AsgiEntryPointTests(SimpleTestCase):
+    def test_http_only_without_channels(self):
+        # A None entry makes the import raise ImportError
+        missing = {"channels.routing": None, "channels.security.websocket": None}
+        with mock.patch.dict(sys.modules, missing), mock.patch.dict(os.environ):
+            sys.modules.pop("jobMonitoringApp.asgi", None)
+            asgi = importlib.import_module("jobMonitoringApp.asgi")
+        self.assertIsInstance(asgi.application, ASGIHandler)
+        self.assertIs(asgi.application, asgi.django_application)
+
+
+@override_settings(ROOT_URLCONF=__name__, DRIVES_REPLICA_ALIAS=None)
+class AsgiProfilingTests(TransactionTestCase):
+    def setUp(self):
+        parent = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, parent)
+        self.directory = os.path.join(parent, "profiles")
+        settings = override_settings(PROFILING_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        make_drive("Acme")
+
+    def load_capture(self, headers):
+        path = os.path.join(self.directory, f"{headers['x-profile-id']}.json")
+        with open(path) as f:
+            return json.load(f)
+
+    @override_settings(PROFILING_SLOW_REQUEST_MS=1)
+    def test_slow_async_view_capture_holds_its_statements(self):
+        status, headers, body = asyncio.run(asgi_get(ASGIHandler(), "/api/drives/"))
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["drives"][0]["company_name"], "Acme")
+
+        capture = self.load_capture(headers)
+        self.assertEqual(capture["trigger"], "slow")
+        self.assertEqual(capture["route"], "drive-list")
+        # Run on the async views' database thread
+        self.assertTrue(
+            any(
+                CompanyDrive._meta.db_table in statement["sql"]
+                for statement in capture["statements"]
+            )
+        )
+
+    def test_staff_request_is_profiled(self):
+        user = User.objects.create_user("staff@example.com", password="secret")
+        PlacementStaff.objects.create(
+            user=user,
+            rank=StaffRank.objects.create(name="Coordinator", level=1),
+            department="CSE",
+            contact_number="123",
+        )
+        self.client.force_login(user)
+        cookie = f"sessionid={self.client.cookies['sessionid'].value}".encode()
+
+        for session, profiled in ((b"", False), (cookie, True)):
+            status, headers, body = asyncio.run(
+                asgi_get(
+                    ASGIHandler(),
+                    "/api/drives/",
+                    query_string=b"profile=1",
+                    headers=[(b"cookie", session)],
+                )
+            )
+            self.assertEqual(status, 200)
+            self.assertEqual("x-profile-id" in headers, profiled)
+        capture = self.load_capture(headers)
+        self.assertEqual(capture["trigger"], "requested")
+        self.assertEqual(capture["user"], user.username)
+
+
+@skipUnless(replica_alias(), "needs the replica of jobMonitoringApp.test_settings")
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncViewRoutingTests(TransactionTestCase):
+    """
+    The async views run the sync ones on their database threads, so a drive
+    only present in one of the separate test databases shows where they read.
+    """
+
+    databases = {"default", replica_alias()} - {None}
+    # Both drives get id 1
+    reset_sequences = True
+
+    def setUp(self):
+        make_drive("Primary Co")
+        self.replica_drive = make_drive("Replica Co", using="replica")
+        cache = get_cache()
+        if cache is not None:
+            cache.clear()
+        pin_cache().delete(PIN_KEY)
+
+    def get(self, url):
+        status, headers, body = asyncio.run(asgi_get(ASGIHandler(), url))
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["content-type"], "application/json")
+        return json.loads(body)
+
+    def listed_companies(self):
+        return [drive["company_name"] for drive in self.get("/api/drives/")["drives"]]
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.listed_companies(), ["Replica Co"])
+        drive = self.get(f"/api/drives/{self.replica_drive.pk}/")["drive"]
+        self.assertEqual(drive["company_name"], "Replica Co")
+
+    def test_reads_stay_on_primary_without_replica(self):
+        with override_settings(DRIVES_REPLICA_ALIAS=None):
+            self.assertEqual(self.listed_companies(), ["Primary Co"])
+            drive = self.get(f"/api/drives/{self.replica_drive.pk}/")["drive"]
+        self.assertEqual(drive["company_name"], "Primary Co")
+
+
+# A sample line of the Prometheus text format: name, optional labels, value
+SAMPLE = re.compile(r'^[a-z_]+(\{([a-z_]+="[^"]*",?)+\})? [-+.\deInf]+$')
+
+
+@override_settings(METRICS_TOKEN="scrape-secret", DRIVES_REPLICA_ALIAS=None)
+class MetricsTests(TestCase):
+    def setUp(self):
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+
+    def scrape(self, **headers):
+        return self.client.get(
+            "/api/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret", **headers
+        )
+
+    def samples(self):
+        response = self.scrape()
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode().splitlines()
+
+    def test_server_timing_header(self):
+        make_drive("Acme")
+        response = self.client.get("/api/drives/")
+        self.assertEqual(response.status_code, 200)
+        # The Last-Modified aggregate and the list itself
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="2 queries", serialize;dur=[\d.]+, '
+            r"encode;dur=[\d.]+, view;dur=[\d.]+$",
+        )
+
+    def test_exposition_format(self):
+        make_drive("Acme")
+        self.client.get("/api/drives/")
+        response = self.scrape()
+        self.assertEqual(
+            response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8"
+        )
+        body = response.content.decode()
+        self.assertTrue(body.endswith("\n"))
+        lines = body.splitlines()
+        for line in lines:
+            if line.startswith("#"):
+                self.assertRegex(line, r"^# (HELP [a-z_]+ .+|TYPE [a-z_]+ \w+)$")
+            else:
+                self.assertRegex(line, SAMPLE)
+        for name in ("http_request_duration_seconds", "http_request_queries"):
+            self.assertIn(f"# TYPE {name} histogram", lines)
+        self.assertIn('http_request_queries_count{route="drive-list"} 1', lines)
+        self.assertIn('http_request_queries_sum{route="drive-list"} 2', lines)
+
+    def test_histogram_buckets(self):
+        for duration, queries in ((0.003, 0), (0.005, 1), (0.02, 3), (20, 200)):
+            timings = RequestTimings()
+            timings.queries = queries
+            observe("probe", duration, timings)
+        lines = self.samples()
+
+        def buckets(name):
+            prefix = f'{name}_bucket{{route="probe",le="'
+            return {
+                line[len(prefix) :].split('"')[0]: int(line.rsplit(" ", 1)[1])
+                for line in lines
+                if line.startswith(prefix)
+            }
+
+        # Cumulative, with each bound inclusive
+        self.assertEqual(
+            buckets("http_request_duration_seconds"),
+            {
+                "0.005": 2,
+                "0.01": 2,
+                "0.025": 3,
+                "0.05": 3,
+                "0.1": 3,
+                "0.25": 3,
+                "0.5": 3,
+                "1.0": 3,
+                "2.5": 3,
+                "5.0": 3,
+                "10.0": 3,
+                "+Inf": 4,
+            },
+        )
+        self.assertEqual(
+            buckets("http_request_queries"),
+            {
+                "0": 1,
+                "1": 2,
+                "2": 2,
+                "5": 3,
+                "10": 3,
+                "20": 3,
+                "50": 3,
+                "100": 3,
+                "+Inf": 4,
+            },
+        )
+        self.assertIn('http_request_duration_seconds_count{route="probe"} 4', lines)
+        self.assertIn('http_request_queries_sum{route="probe"} 204', lines)
+
+    def test_scrapes_need_the_token_or_a_superuser(self):
+        response = self.client.get("/api/metrics")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Bearer")
+        wrong = self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer guess")
+        self.assertEqual(wrong.status_code, 401)
+        with override_settings(METRICS_TOKEN=""):
+            empty = self.client.get("/api/metrics", HTTP_AUTHORIZATION="Bearer ")
+            self.assertEqual(empty.status_code, 401)
+
+        user = User.objects.create_user("staff@example.com", password="secret")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get("/api/metrics").status_code, 403)
+        user.is_superuser = True
+        user.save()
+        self.assertEqual(self.client.get("/api/metrics").status_code, 200)
+
+
+class WarmUpTests(SimpleTestCase):
+    def test_only_pooled_aliases_are_connected(self):
+        pooled = mock.Mock(pool=mock.Mock())
+        # POOL_SIZE 0, and a backend without the pool mixin
+        unpooled = mock.Mock(pool=None)
+        plain = mock.Mock(spec=["ensure_connection", "close"])
+        handler = mock.Mock(all=mock.Mock(return_value=[pooled, unpooled, plain]))
+
+        with mock.patch("jobMonitoringApp.warmup.connections", handler):
+            urls, models = warm_up()
+
+        self.assertGreater(urls, 0)
+        self.assertGreater(models, 0)
+        pooled.ensure_connection.assert_called_once_with()
+        # Closing hands the connection to the pool
+        pooled.close.assert_called_once_with()
+        for connection in (unpooled, plain):
+            connection.ensure_connection.assert_not_called()
+            connection.close.assert_not_called()
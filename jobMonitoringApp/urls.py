@@ -17,8 +17,14 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path,include
 
+from .metrics import metrics_view
+from .profiling import profile_detail, profile_list
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("accounts.urls")),
     path("api/", include("drives.urls")),
+    path("api/metrics", metrics_view, name="metrics"),
+    path("api/profiles/", profile_list, name="profile_list"),
+    path("api/profiles/<str:capture_id>/", profile_detail, name="profile_detail"),
 ]
@@ -0,0 +1,63 @@
+"""
+Work done once per process so the first requests don't pay for it.
+
+Django defers a lot until it is first needed: importing the URLconfs and
+compiling their patterns happens on the first resolve(), the model field
+caches and relation trees on the first query, and the database handshake on
+the first cursor. ``warm_up`` does all three up front. The gunicorn
+configuration (jobMonitoringApp/gunicorn_config.py) runs it in the master
+before forking, so every worker inherits the warmed caches, then again in
+each worker to fill its connection pools.
+"""
+
+from django.apps import apps
+from django.db import connections
+from django.urls import get_resolver
+
+
+def resolve_urls():
+    """Import every URLconf and compile its patterns"""
+    resolver = get_resolver()
+    # Populating the reverse lookup walks every pattern and compiles its regex
+    resolver.reverse_dict
+    return len(resolver.reverse_dict)
+
+
+def prime_models():
+    """Build the field caches of every model and compile a query of each"""
+    models = apps.get_models()
+    for model in models:
+        model._meta.get_fields()
+        str(model._default_manager.all().query)
+    return len(models)
+
+
+def open_connections():
+    """
+    Connect every pooled database alias and hand the connection to its pool,
+    where the first request thread of the worker picks it up. Aliases without
+    a pool (POOL_SIZE 0, or a backend without the pool) are skipped: their
+    connection would belong to the calling thread, which serves no requests.
+    """
+    for connection in connections.all():
+        if getattr(connection, "pool", None) is None:
+            continue
+        connection.ensure_connection()
+        connection.close()
+
+
+def close_connections():
+    """Close every connection of this process, pooled ones included"""
+    for connection in connections.all():
+        connection.close()
+        pool = getattr(connection, "pool", None)
+        while pool is not None and not pool.empty():
+            connection.discard(pool.get_nowait())
+
+
+def warm_up():
+    """Returns the number of URL names and models warmed"""
+    urls = resolve_urls()
+    models = prime_models()
+    open_connections()
+    return urls, models